@@ -0,0 +1,83 @@
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+from lib.dataset_generation import load_gpickle
+from lib.io import READERS, WRITERS, networkx_to_csr, csr_to_tensor
+
+# Throughput of the lib/io readers and writers, reported in MB/s of text on disk.
+# Each graph is converted once to CSR, written in every format and read back.
+
+DEFAULT_GRAPHS = "./graphs/gnm_random_graph_scalability/GNM_2000_*.gpickle"
+
+
+def time_call(function, *args, repeats=3):
+    """
+    Returns the best wall time in seconds over `repeats` calls, along with the last result.
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_graph(path, directory, repeats):
+    """
+    Measures write, read and read-to-tensor throughput of every format for one graph.
+
+    Returns:
+        list of dict: One row per format.
+    """
+    indptr, indices = networkx_to_csr(load_gpickle(path)["data"])
+    rows = []
+    for fmt, writer in WRITERS.items():
+        output_path = os.path.join(directory, f"graph.{fmt}")
+        write_time, _ = time_call(writer, output_path, indptr, indices, repeats=repeats)
+        megabytes = os.path.getsize(output_path) / 1e6
+
+        read_time, (read_indptr, read_indices) = time_call(READERS[fmt], output_path, repeats=repeats)
+        tensor_time, _ = time_call(
+            lambda: csr_to_tensor(*READERS[fmt](output_path)), repeats=repeats
+        )
+        assert (read_indptr == indptr).all() and (read_indices == indices).all()
+
+        rows.append(
+            {
+                "graph": os.path.basename(path)[:-8],
+                "format": fmt,
+                "size_mb": megabytes,
+                "write_mb_s": megabytes / write_time,
+                "read_mb_s": megabytes / read_time,
+                "read_to_tensor_mb_s": megabytes / tensor_time,
+            }
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure lib/io reader and writer throughput.")
+    parser.add_argument("graphs", nargs="?", default=DEFAULT_GRAPHS, help="Glob of .gpickle graphs to convert.")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed repetitions per measurement.")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(args.graphs))
+    if not paths:
+        raise SystemExit(f"No graphs match {args.graphs}")
+
+    print(f"{'graph':<24}{'format':<12}{'MB':>8}{'write MB/s':>12}{'read MB/s':>12}{'tensor MB/s':>13}")
+    with tempfile.TemporaryDirectory() as directory:
+        for path in paths:
+            for row in benchmark_graph(path, directory, args.repeats):
+                print(
+                    f"{row['graph']:<24}{row['format']:<12}{row['size_mb']:>8.2f}"
+                    f"{row['write_mb_s']:>12.1f}{row['read_mb_s']:>12.1f}{row['read_to_tensor_mb_s']:>13.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
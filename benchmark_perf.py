@@ -0,0 +1,114 @@
+import argparse
+import logging
+import time
+
+import torch
+
+from lib.perf_suite import (
+    BENCHMARKS,
+    DEFAULT_BASELINE_DIRECTORY,
+    DEFAULT_GRID,
+    QUICK_GRID,
+    baseline_path,
+    compare,
+    machine_fingerprint,
+    read_results,
+    run_suite,
+    suite_cases,
+    write_results,
+)
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(filename='benchmark_perf.log', level=logging.INFO, style="{")
+
+# Performance regression suite of the pCQO-MIS hot paths on synthetic graphs.
+# `run` stores a baseline for this machine, `compare` reruns the suite and flags significant changes.
+
+
+def add_run_arguments(parser):
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), help="Benchmarks to run. Defaults to all.")
+    parser.add_argument("--quick", action="store_true", help="Run the small grid only.")
+    parser.add_argument("--samples", type=int, help="Timing samples per case. Defaults to 11, or the baseline's.")
+    parser.add_argument(
+        "--min-sample-time", type=float, help="Minimum seconds per timing sample. Defaults to 0.05, or the baseline's."
+    )
+    parser.add_argument("--threads", type=int, help="Torch intra-op threads. Defaults to torch's choice.")
+    parser.add_argument("--directory", default=DEFAULT_BASELINE_DIRECTORY, help="Directory of the baseline files.")
+
+
+def run(args, cases=None, samples=11, min_sample_time=0.05):
+    """
+    Runs the suite and returns its results document. Command line settings override the defaults.
+    """
+    if cases is None:
+        cases = suite_cases(QUICK_GRID if args.quick else DEFAULT_GRID, args.benchmarks)
+
+    start = time.perf_counter()
+    results = run_suite(
+        cases, samples=args.samples or samples, min_sample_time=args.min_sample_time or min_sample_time
+    )
+    print(f"Ran {len(cases)} cases in {time.perf_counter() - start:.1f} s on machine {results['fingerprint']}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Performance regression suite with per-machine baselines.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the suite and store the results as this machine's baseline.")
+    add_run_arguments(run_parser)
+    run_parser.add_argument("--output", help="Results file to write. Defaults to the baseline of this machine.")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare a run against the baseline of this machine.")
+    add_run_arguments(compare_parser)
+    compare_parser.add_argument("--baseline", help="Baseline file. Defaults to the baseline of this machine.")
+    compare_parser.add_argument("--current", help="Results file to compare instead of running the suite.")
+    compare_parser.add_argument("--alpha", type=float, default=0.01, help="Significance level of the test.")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="Minimum relative change of the median.")
+    args = parser.parse_args()
+
+    # Before fingerprinting, which records the thread count
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    if args.command == "run":
+        results = run(args)
+        output = args.output or baseline_path(results["fingerprint"], args.directory)
+        write_results(results, output)
+        print(f"Results written to {output}")
+        return
+
+    path = args.baseline or baseline_path(machine_fingerprint()[0], args.directory)
+    try:
+        baseline = read_results(path)
+    except FileNotFoundError:
+        raise SystemExit(f"No baseline at {path}, create one with `python benchmark_perf.py run`")
+
+    if args.current:
+        current = read_results(args.current)
+    else:
+        # Rerun exactly the cases of the baseline, with its sampling settings unless overridden
+        cases = [
+            {key: result[key] for key in ("name", "benchmark", "n", "density", "batch_size")}
+            for result in baseline["results"].values()
+            if not args.benchmarks or result["benchmark"] in args.benchmarks
+        ]
+        current = run(args, cases, baseline["samples"], baseline["min_sample_time"])
+
+    comparisons = compare(baseline, current, alpha=args.alpha, threshold=args.threshold)
+    print(f"{'case':<56}{'baseline ms':>13}{'current ms':>12}{'ratio':>8}{'p':>10}  status")
+    for comparison in comparisons:
+        p_value = comparison["p_slower"] if comparison["ratio"] >= 1 else comparison["p_faster"]
+        print(
+            f"{comparison['name']:<56}{comparison['baseline_median'] * 1e3:>13.3f}"
+            f"{comparison['current_median'] * 1e3:>12.3f}{comparison['ratio']:>8.3f}{p_value:>10.2g}  {comparison['status']}"
+        )
+
+    regressions = [comparison["name"] for comparison in comparisons if comparison["status"] == "regression"]
+    if regressions:
+        raise SystemExit(f"{len(regressions)} significant regressions: {', '.join(regressions)}")
+    print("No significant regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Puts the repository root on sys.path, so the tests import lib/, solvers/ and models/ as the scripts do
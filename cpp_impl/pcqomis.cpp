@@ -2,6 +2,8 @@
 #include <iostream>
 #include <fstream>
 #include <filesystem>
+#include <regex>
+#include <sstream>
 
 
 // SATLIB settings
@@ -24,6 +26,84 @@
 // #define BATCH_SIZE 256
 // #define STD 2.25
 
+// Defaults for every parameter not set in the parameters file given as the second argument
+#ifndef LEARNING_RATE
+#define LEARNING_RATE 0.001
+#endif
+#ifndef MOMENTUM
+#define MOMENTUM 0.9
+#endif
+#ifndef NUM_ITERATIONS
+#define NUM_ITERATIONS 10000
+#endif
+#ifndef NUM_ITERATIONS_PER_BATCH
+#define NUM_ITERATIONS_PER_BATCH 350
+#endif
+#ifndef GAMMA
+#define GAMMA 775
+#endif
+#ifndef GAMMA_PRIME
+#define GAMMA_PRIME 1
+#endif
+#ifndef BATCH_SIZE
+#define BATCH_SIZE 256
+#endif
+#ifndef STD
+#define STD 2.25
+#endif
+
+struct Parameters
+{
+    float learning_rate = LEARNING_RATE;
+    float momentum = MOMENTUM;
+    long number_of_steps = NUM_ITERATIONS;
+    long steps_per_batch = NUM_ITERATIONS_PER_BATCH;
+    float gamma = GAMMA;
+    float gamma_prime = GAMMA_PRIME;
+    long batch_size = BATCH_SIZE;
+    float std = STD;
+};
+
+// Reads the flat JSON object written by tune.py; keys are the pCQOMIS_MGD parameter names
+Parameters read_parameters(const std::string &file_path)
+{
+    std::ifstream file(file_path);
+
+    if (!file.is_open())
+    {
+        throw std::runtime_error("Could not open parameters file");
+    }
+
+    std::stringstream buffer;
+    buffer << file.rdbuf();
+    std::string text = buffer.str();
+
+    Parameters parameters;
+    std::regex entry("\"(\\w+)\"\\s*:\\s*([-+0-9.eE]+)");
+    for (auto match = std::sregex_iterator(text.begin(), text.end(), entry); match != std::sregex_iterator(); ++match)
+    {
+        std::string key = (*match)[1];
+        double value = std::stod((*match)[2]);
+        if (key == "learning_rate")
+            parameters.learning_rate = value;
+        else if (key == "momentum")
+            parameters.momentum = value;
+        else if (key == "number_of_steps")
+            parameters.number_of_steps = value;
+        else if (key == "steps_per_batch")
+            parameters.steps_per_batch = value;
+        else if (key == "gamma")
+            parameters.gamma = value;
+        else if (key == "gamma_prime")
+            parameters.gamma_prime = value;
+        else if (key == "batch_size")
+            parameters.batch_size = value;
+        else if (key == "value_initializer_std")
+            parameters.std = value;
+    }
+    return parameters;
+}
+
 torch::TensorOptions default_tensor_options = torch::TensorOptions().dtype(torch::kFloat16);
 torch::TensorOptions default_tensor_options_gpu = default_tensor_options.device(torch::kCUDA);
 
@@ -39,13 +119,13 @@ public:
     }
     torch::Tensor sample(torch::Tensor matrix)
     {
-        torch::Tensor sample = torch::normal_out(matrix, mean_vector, STD, std::nullopt);
+        torch::Tensor sample = torch::normal_out(matrix, mean_vector, std, std::nullopt);
         return sample;
     }
     torch::Tensor sample_previous(torch::Tensor matrix)
     {
         mean_vector = matrix.clone();
-        torch::Tensor sample = torch::normal_out(matrix, mean_vector, STD, std::nullopt);
+        torch::Tensor sample = torch::normal_out(matrix, mean_vector, std, std::nullopt);
         return sample;
     }
 };
@@ -58,11 +138,11 @@ public:
     float learning_rate;
     float momentum;
     torch::Tensor velocity;
-    Optimizer(float learning_rate, float momentum, float gamma, float gamma_prime, int graph_order)
+    Optimizer(float learning_rate, float momentum, float gamma, float gamma_prime, long batch_size, int graph_order)
     {
         this->learning_rate = learning_rate;
         this->momentum = momentum;
-        this->velocity = torch::zeros({BATCH_SIZE, graph_order}, default_tensor_options_gpu);
+        this->velocity = torch::zeros({batch_size, graph_order}, default_tensor_options_gpu);
         this->gamma = gamma;
         this->gamma_prime = gamma_prime;
     }
@@ -161,8 +241,9 @@ void benchmark_generate_complement_graph(const torch::Tensor &graph)
 
 int main(int argc, const char *argv[])
 {
-    // Read in the first arugment as the file path
+    // Read in the first arugment as the file path, and the optional second one as a parameters file
     std::string directory_path = argv[1];
+    Parameters parameters = argc > 2 ? read_parameters(argv[2]) : Parameters();
     int sum_max = 0;
     int count = 0;
 
@@ -195,18 +276,20 @@ int main(int argc, const char *argv[])
             mean_vector[i] = 1.0 - (degrees[i] / (max_degree));
         }
 
-        mean_vector = mean_vector.unsqueeze(0).expand({BATCH_SIZE, -1}).to(torch::kCUDA);
+        mean_vector = mean_vector.unsqueeze(0).expand({parameters.batch_size, -1}).to(torch::kCUDA);
 
         //std::cout << "Mean vector: " << mean_vector.sizes() << std::endl;
 
-        InitializationSampler sampler = InitializationSampler(mean_vector, STD);
+        InitializationSampler sampler = InitializationSampler(mean_vector, parameters.std);
 
         // Create initilzation matrix and sample from a normal distribution with mean_vector and std 0.01
-        torch::Tensor X = sampler.sample(torch::zeros({BATCH_SIZE, number_of_nodes}, default_tensor_options_gpu));
+        torch::Tensor X = sampler.sample(torch::zeros({parameters.batch_size, number_of_nodes}, default_tensor_options_gpu));
 
         // //std::cout << "Initialization matrix: " << X << std::endl;
 
-        Optimizer optimizer = Optimizer(LEARNING_RATE, MOMENTUM, GAMMA, GAMMA_PRIME, number_of_nodes);
+        Optimizer optimizer = Optimizer(
+            parameters.learning_rate, parameters.momentum, parameters.gamma, parameters.gamma_prime,
+            parameters.batch_size, number_of_nodes);
 
         int max = 0;
         //std::cout << "Starting optimization" << std::endl;
@@ -214,7 +297,7 @@ int main(int argc, const char *argv[])
         torch::Tensor ones_vector = torch::ones({number_of_nodes}, default_tensor_options_gpu);
         torch::Tensor update = number_of_nodes * adjacency_matrix - adjacency_matrix_comp;
 
-        for (int iteration = 0; iteration < NUM_ITERATIONS; iteration++)
+        for (int iteration = 0; iteration < parameters.number_of_steps; iteration++)
         {
             torch::Tensor gradient = optimizer.compute_gradient(adjacency_matrix, adjacency_matrix_comp, X);
             X = optimizer.velocity_update(X, gradient);
@@ -222,7 +305,7 @@ int main(int argc, const char *argv[])
             // Clamp the initialization matrix to be between 0 and 1
             X = X.clamp(0, 1);
 
-            if ((iteration + 1) % NUM_ITERATIONS_PER_BATCH == 0)
+            if ((iteration + 1) % parameters.steps_per_batch == 0)
             {
                 torch::Tensor masks = X.gt(0.5).to(torch::kFloat16);
                 // Iterate over the batch dimension of the masks tensor
@@ -244,11 +327,11 @@ int main(int argc, const char *argv[])
                     // }
                 }
 
-                if (iteration + 1 == NUM_ITERATIONS_PER_BATCH || ((iteration + 1) / NUM_ITERATIONS_PER_BATCH) % 10 == 0)
+                if (iteration + 1 == parameters.steps_per_batch || ((iteration + 1) / parameters.steps_per_batch) % 10 == 0)
                 {
                     auto end = std::chrono::high_resolution_clock::now();
                     std::chrono::duration<double> elapsed_seconds = end - start;
-                    std::cout << (iteration + 1) / NUM_ITERATIONS_PER_BATCH << std::endl;
+                    std::cout << (iteration + 1) / parameters.steps_per_batch << std::endl;
                     std::cout << max << std::endl;
                     std::cout << elapsed_seconds.count() << std::endl;
                 }
@@ -1,17 +1,83 @@
 import time
 
+from lib.memory import memory_phase
+from lib.timing import NANOSECONDS, empty_timings, synchronize, elapsed_seconds
+
 
 class Solver:
+    # Cores a job running this solver reserves when the benchmark spec does not set "threads"
+    default_threads = 1
+    # Whether the solver reads its graph from a METIS file (see lib.graph_cache.metis_file) and accepts
+    # the file's precomputed "metis_fingerprint" parameter
+    reads_metis_file = False
+
     def __init__(self):
-        pass
+        # Memory peaks of the solver's own phases, by phase name (see lib.memory.memory_phase)
+        self.memory_usage = {}
+        # Setup, solve, time-to-best and total times of the last solve (see lib.timing.TIMING_KEYS)
+        self.timings = empty_timings()
+        # Device whose queued work the timer waits for before reading the clock (see lib.timing.synchronize)
+        self.timing_device = None
 
     def solve():
         print("Solver not implemented!")
         pass
 
     def _start_timer(self):
-        self.start_time = time.time()
+        """
+        Starts the timer of a solve, in its setup phase. `start_time` and `stop_time` are
+        time.perf_counter readings, only meaningful relative to each other.
+        """
+        self.timings = empty_timings()
+        synchronize(getattr(self, "timing_device", None))
+        self._start_ns = time.perf_counter_ns()
+        self._solve_start_ns = None
+        self.start_time = self._start_ns / NANOSECONDS
+
+    def _elapsed(self, synchronize_device=True):
+        """
+        Returns the seconds since `_start_timer`, after waiting for the timing device unless
+        `synchronize_device` is False.
+        """
+        if synchronize_device:
+            synchronize(getattr(self, "timing_device", None))
+        return elapsed_seconds(self._start_ns)
+
+    def _end_setup(self):
+        """
+        Ends the setup phase of the timer; the solve phase runs from here to `_stop_timer`.
+        """
+        synchronize(getattr(self, "timing_device", None))
+        self._solve_start_ns = time.perf_counter_ns()
+        self.timings["setup_time"] = elapsed_seconds(self._start_ns, self._solve_start_ns)
+
+    def _record_best(self, elapsed=None):
+        """
+        Records that the best solution so far was found `elapsed` seconds after `_start_timer` (now by default).
+        """
+        self.timings["time_to_best"] = self._elapsed() if elapsed is None else elapsed
 
     def _stop_timer(self):
-        self.stop_time = time.time()
-        self.solution_time = self.stop_time - self.start_time
+        """
+        Reads the timer, setting `solution_time` and the total and solve times. May be called several times,
+        e.g. at checkpoints; the last call gives the final timings.
+        """
+        synchronize(getattr(self, "timing_device", None))
+        stop_ns = time.perf_counter_ns()
+        self.stop_time = stop_ns / NANOSECONDS
+        self.solution_time = elapsed_seconds(self._start_ns, stop_ns)
+        self.timings["total_time"] = self.solution_time
+        if self._solve_start_ns is None:
+            # Solvers without a separate setup phase spend all of their time solving
+            self.timings["setup_time"] = 0.0
+            self.timings["solve_time"] = self.solution_time
+        else:
+            self.timings["solve_time"] = elapsed_seconds(self._solve_start_ns, stop_ns)
+
+    def _memory_phase(self, phase):
+        """
+        Context measuring the memory peaks of a phase of the solver into `self.memory_usage[phase]`.
+        """
+        if not hasattr(self, "memory_usage"):
+            self.memory_usage = {}
+        return memory_phase(phase, self.memory_usage)
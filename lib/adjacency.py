@@ -0,0 +1,151 @@
+import numpy as np
+import torch
+
+LAYOUTS = ("dense", "csr")
+
+
+def graph_edge_index(G):
+    """
+    Extracts the edge list of a networkx graph as an index array, numbering nodes in iteration order.
+
+    Args:
+        G (networkx.Graph): The graph.
+
+    Returns:
+        tuple: (number_of_nodes, edges) where edges is an int64 numpy array of shape (m, 2).
+    """
+    number_of_nodes = G.number_of_nodes()
+    if all(isinstance(node, int) for node in G.nodes) and list(G.nodes) == list(range(number_of_nodes)):
+        endpoints = (node for edge in G.edges for node in edge[:2])
+    else:
+        node_index = {node: i for i, node in enumerate(G.nodes)}
+        endpoints = (node_index[node] for edge in G.edges for node in edge[:2])
+    edges = np.fromiter(endpoints, dtype=np.int64, count=2 * G.number_of_edges())
+    return number_of_nodes, edges.reshape(-1, 2)
+
+
+def build_adjacency(number_of_nodes, edges, dtype=torch.float16, layout="dense", device="cpu", complement=False):
+    """
+    Builds an adjacency matrix straight from an edge index array, in a single allocation of the target
+    dtype, layout and device.
+
+    Self-loops in `edges` are kept on the diagonal of the adjacency matrix (as `nx.adjacency_matrix`
+    does) and excluded from the complement (as `nx.complement` does).
+
+    Args:
+        number_of_nodes (int): Number of nodes n.
+        edges (numpy.ndarray or torch.Tensor): Integer array of shape (m, 2) with zero-based endpoints.
+        dtype (torch.dtype, optional): Value type, e.g. torch.float16, torch.float32 or torch.bfloat16.
+            Defaults to torch.float16.
+        layout (str, optional): "dense" or "csr". Defaults to "dense".
+        device (str or torch.device, optional): Target device. Defaults to "cpu".
+        complement (bool, optional): Build the adjacency matrix of the complement graph instead.
+            Only supported for the dense layout. Defaults to False.
+
+    Returns:
+        torch.Tensor: The (n, n) adjacency matrix.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}', expected one of {LAYOUTS}")
+
+    edges = torch.as_tensor(edges, dtype=torch.int64).reshape(-1, 2).to(device)
+    rows = torch.cat((edges[:, 0], edges[:, 1]))
+    cols = torch.cat((edges[:, 1], edges[:, 0]))
+
+    if layout == "csr":
+        if complement:
+            raise ValueError("The complement adjacency matrix is only available in the dense layout")
+        keys = torch.unique(rows * number_of_nodes + cols)
+        crow = torch.zeros(number_of_nodes + 1, dtype=torch.int64, device=device)
+        crow[1:] = torch.cumsum(torch.bincount(keys // number_of_nodes, minlength=number_of_nodes), 0)
+        values = torch.ones(len(keys), dtype=dtype, device=device)
+        return torch.sparse_csr_tensor(
+            crow, keys % number_of_nodes, values, size=(number_of_nodes, number_of_nodes), check_invariants=False
+        )
+
+    if complement:
+        adjacency = torch.ones((number_of_nodes, number_of_nodes), dtype=dtype, device=device)
+        adjacency[rows, cols] = 0
+        adjacency.fill_diagonal_(0)
+    else:
+        adjacency = torch.zeros((number_of_nodes, number_of_nodes), dtype=dtype, device=device)
+        adjacency[rows, cols] = 1
+    return adjacency
+
+
+def adjacency_from_graph(G, dtype=torch.float16, layout="dense", device="cpu", complement=False):
+    """
+    Builds the adjacency matrix (or its complement) of a networkx graph without scipy or dense copies.
+
+    See `build_adjacency` for the meaning of the arguments.
+
+    Returns:
+        torch.Tensor: The (n, n) adjacency matrix.
+    """
+    number_of_nodes, edges = graph_edge_index(G)
+    return build_adjacency(number_of_nodes, edges, dtype=dtype, layout=layout, device=device, complement=complement)
+
+
+def degree_scaling_vector(adjacency):
+    """
+    Returns the symmetric normalization vector s = diag(D)^(-1/2) of an adjacency matrix.
+
+    Degrees are the row sums of A, so a self-loop counts once, where `G.degree` in networkx (and the
+    former dense normalization built from it) counts it twice. Degree-0 nodes get a scaling of 0,
+    matching the all-zero rows and columns they have in D^(-1/2) A D^(-1/2), where inverting D gave
+    inf and NaN entries.
+
+    Args:
+        adjacency (torch.Tensor): Dense or sparse (n, n) adjacency matrix.
+
+    Returns:
+        torch.Tensor: The (n,) scaling vector, in the dtype of `adjacency`.
+    """
+    # Half precision degrees are exact only up to 2048, so they are summed in at least float32
+    dtype = torch.promote_types(adjacency.dtype, torch.float32)
+    if adjacency.layout == torch.strided:
+        degrees = adjacency.sum(dim=1, dtype=dtype)
+    else:
+        degrees = torch.sparse.sum(adjacency.to_sparse_coo().to(dtype), dim=1).to_dense()
+    scaling = torch.where(degrees > 0, degrees.clamp(min=1).rsqrt(), torch.zeros_like(degrees))
+    return scaling.to(adjacency.dtype)
+
+
+class AdjacencyOperator:
+    """
+    Linear operator applying A, its normalization D^(-1/2) A D^(-1/2), or their sum to a vector or matrix.
+
+    The normalization is applied as row and column scaling around the product with A,
+    s * (A @ (s * X)), so no normalized n x n matrix is ever materialized. `operator @ X` behaves like
+    a matrix product for X of shape (n,) or (n, k), including inside `torch.func.vmap` when the
+    adjacency matrix is dense.
+
+    Parameters:
+        adjacency (torch.Tensor): Dense or sparse (n, n) adjacency matrix.
+        scaling (torch.Tensor, optional): Degree scaling vector (see `degree_scaling_vector`). Required
+            unless mode is "raw".
+        mode (str, optional): "raw" (A), "normalize" (D^(-1/2) A D^(-1/2)) or "combine" (the sum of both).
+            Defaults to "raw".
+    """
+
+    MODES = ("raw", "normalize", "combine")
+
+    def __init__(self, adjacency, scaling=None, mode="raw"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown mode '{mode}', expected one of {self.MODES}")
+        if mode != "raw" and scaling is None:
+            raise ValueError(f"Mode '{mode}' requires a degree scaling vector")
+        self.adjacency = adjacency
+        self.scaling = scaling
+        self.mode = mode
+
+    def _scale(self, X):
+        return self.scaling.reshape(-1, *([1] * (X.dim() - 1))) * X
+
+    def __matmul__(self, X):
+        if self.mode == "raw":
+            return self.adjacency @ X
+        normalized = self._scale(self.adjacency @ self._scale(X))
+        if self.mode == "normalize":
+            return normalized
+        return self.adjacency @ X + normalized
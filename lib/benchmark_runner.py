@@ -0,0 +1,296 @@
+import os
+import sys
+import logging
+from copy import deepcopy
+
+import numpy
+import tqdm
+
+from lib.benchmark_spec import build_jobs, list_spec_graphs
+from lib.dataset_generation import load_gpickle
+from lib.graph_generators import generate_graph
+from lib.io import csr_to_networkx
+from lib.memory import memory_phase
+from lib.registry import resolve_solver_class
+from lib.result_store import ResultStore, write_summary
+from lib.scheduler import SerialScheduler
+
+logger = logging.getLogger(__name__)
+
+# The most recently loaded graph, so consecutive jobs on the same graph load it only once
+_loaded_graph = {"path": None, "graph": None, "metis_fingerprint": None}
+
+
+def load_job_graph(graph):
+    """
+    Loads (or, for generated datasets, generates) the networkx graph of a job, reusing the previous
+    one when the path is unchanged.
+    """
+    if _loaded_graph["path"] != graph["path"]:
+        _loaded_graph["graph"] = None
+        _loaded_graph["metis_fingerprint"] = None
+        if "generator" in graph:
+            generator = graph["generator"]
+            indptr, indices = generate_graph(generator["name"], generator["params"], generator["seed"])
+            _loaded_graph["graph"] = csr_to_networkx(indptr, indices)
+        else:
+            _loaded_graph["graph"] = load_gpickle(graph["path"])["data"]
+        _loaded_graph["path"] = graph["path"]
+    return _loaded_graph["graph"]
+
+
+def load_job_metis_fingerprint(graph):
+    """
+    Returns the METIS file fingerprint of a job's graph (see `lib.graph_cache.metis_fingerprint`),
+    computed once per loaded graph, which jobs share without modifying it.
+    """
+    G = load_job_graph(graph)
+    if _loaded_graph["metis_fingerprint"] is None:
+        from lib.graph_cache import metis_fingerprint
+
+        _loaded_graph["metis_fingerprint"] = metis_fingerprint(G)
+    return _loaded_graph["metis_fingerprint"]
+
+
+def solution_rows(method, job, solution, solution_time, checkpoint_solutions=(), trajectory=()):
+    """
+    Builds the solution rows of one solver configuration: one per checkpoint if any were recorded,
+    otherwise one for the final solution.
+
+    Every row names its solver configuration ("solver") and seed, so runs over several seeds can be
+    aggregated (see `lib.statistics`). An incumbent trajectory of (time, size) pairs, recorded by
+    solvers that report improving solutions, is kept in the final row's data.
+    """
+    if len(checkpoint_solutions) > 0:
+        return [
+            {
+                "solution_method": f"{method} at step {checkpoint['number_of_steps']}",
+                "solver": method,
+                "seed": job["seed"],
+                "dataset_name": job["graph"]["name"],
+                "data": deepcopy(checkpoint),
+                "time_taken": deepcopy(checkpoint["time"]),
+            }
+            for checkpoint in checkpoint_solutions
+        ]
+
+    data = deepcopy(solution)
+    if len(trajectory) > 0:
+        data["trajectory"] = [list(point) for point in trajectory]
+    return [
+        {
+            "solution_method": method,
+            "solver": method,
+            "seed": job["seed"],
+            "dataset_name": job["graph"]["name"],
+            "data": data,
+            "time_taken": deepcopy(solution_time),
+        }
+    ]
+
+
+def solve_hint(G, hint_solver, job):
+    """
+    Solves a job's graph with the solver entry of its "hint_solver" parameter, whose mask becomes the
+    "hint_solution" of the job's solver (e.g. a pCQO-MIS run hinting CP-SAT).
+
+    The hint solver gets the job's seed and threads unless its own parameters set them.
+
+    Args:
+        G (networkx.Graph): The job's graph.
+        hint_solver (dict): Solver entry with "class" and optional "params".
+        job (dict): Job built by `lib.benchmark_spec.build_jobs`.
+
+    Returns:
+        tuple: (graph_mask, size, solution_time) of the hint, the mask as a 0/1 numpy array over the nodes.
+    """
+    params = deepcopy(hint_solver.get("params", {}))
+    if job["seed"] is not None:
+        params.setdefault("seed", job["seed"])
+    if "threads" in job["solver"]["params"]:
+        params.setdefault("threads", job["solver"]["params"]["threads"])
+
+    instance = resolve_solver_class(hint_solver["class"])(G, params)
+    instance.solve()
+    mask = instance.solution["graph_mask"]
+    if mask is None:
+        raise ValueError(f"Hint solver {hint_solver['class']} returned no solution mask")
+    if hasattr(mask, "cpu"):
+        mask = mask.cpu().numpy()
+    mask = numpy.asarray(mask, dtype=numpy.int64).reshape(-1)
+    if len(mask) != G.number_of_nodes():
+        raise ValueError(
+            f"Hint solver {hint_solver['class']} returned a mask of {len(mask)} entries for {G.number_of_nodes()} nodes"
+        )
+    return mask, int(instance.solution["size"]), instance.solution_time
+
+
+def run_job(job):
+    """
+    Solves one (graph, solver configuration, seed) job.
+
+    Args:
+        job (dict): Job built by `lib.benchmark_spec.build_jobs`.
+
+    Returns:
+        list of dict: Solution rows with "solution_method", "solver", "seed", "dataset_name", "data",
+            "time_taken", the graph's "number_of_nodes" and "number_of_edges", and the "memory" peaks of
+            the job by phase: "setup" (loading the graph and constructing the solver), "solve", and the
+            solver's own phases (see `lib.memory.memory_phase`). The data of every row includes the
+            solver's setup_time, solve_time, time_to_best and total_time (see `lib.timing`), unless the
+            solution reports these keys itself. Solvers recording checkpoints produce
+            one row per checkpoint, and vectorized configurations produce rows for every grid point
+            they solved. Jobs with a "hint_solver" parameter first solve the graph with it (see
+            `solve_hint`), in a "hint" phase within the setup, and report its "hint_size" and "hint_time" in the data.
+    """
+    solver = job["solver"]
+    solver_class = resolve_solver_class(solver["class"])
+    params = deepcopy(solver["params"])
+
+    memory = {}
+    hint = None
+    with memory_phase("setup", memory):
+        G = load_job_graph(job["graph"])
+        if "hint_solver" in params:
+            with memory_phase("hint", memory):
+                hint = solve_hint(G, params.pop("hint_solver"), job)
+            params["hint_solution"] = hint[0]
+        if solver_class.reads_metis_file:
+            params.setdefault("metis_fingerprint", load_job_metis_fingerprint(job["graph"]))
+        solver_instance = solver_class(G, params)
+    with memory_phase("solve", memory):
+        solver_instance.solve()
+    memory.update(getattr(solver_instance, "memory_usage", {}))
+    if hint is not None:
+        solver_instance.solution["hint_size"] = hint[1]
+        solver_instance.solution["hint_time"] = hint[2]
+
+    if "configuration_names" in solver:
+        rows = []
+        for name, config_solution in zip(solver["configuration_names"], solver_instance.config_solutions):
+            rows.extend(
+                solution_rows(
+                    name, job, config_solution["solution"], solver_instance.solution_time,
+                    config_solution["solutions"],
+                )
+            )
+    else:
+        rows = solution_rows(
+            solver["name"], job, solver_instance.solution, solver_instance.solution_time,
+            getattr(solver_instance, "solutions", ()),
+            list(zip(getattr(solver_instance, "times", []), getattr(solver_instance, "paths", []))),
+        )
+        logger.info("CSV: %s, %s, %s", job["graph"]["name"], solver_instance.solution["size"], solver_instance.solution_time)
+
+    timings = getattr(solver_instance, "timings", {})
+    for row in rows:
+        for key, value in timings.items():
+            row["data"].setdefault(key, value)
+        row["number_of_nodes"] = G.number_of_nodes()
+        row["number_of_edges"] = G.number_of_edges()
+        row["memory"] = memory
+    return rows
+
+
+#### BENCHMARKING CODE ####
+def store_path(spec):
+    """
+    Returns the path of the result store of a benchmark spec.
+    """
+    return os.path.join(spec["output_directory"], "results.jsonl")
+
+
+def summarize(spec, store=None):
+    """
+    Writes the summary table of every stored result of the spec's jobs to `summary.csv`.
+
+    Args:
+        spec (dict): Specification loaded by `lib.benchmark_spec.load_spec`.
+        store (ResultStore, optional): Open store of the spec. Defaults to opening `store_path(spec)`.
+
+    Returns:
+        str: Path of the summary file.
+    """
+    store = store or ResultStore(store_path(spec))
+    rows = store.rows(build_jobs(spec))
+    path = os.path.join(spec["output_directory"], "summary.csv")
+    write_summary(rows, list_spec_graphs(spec), path, spec["summary_columns"])
+
+    if len(spec["seeds"]) > 1:
+        write_seed_statistics(rows, spec)
+    if any("memory" in row for row in rows):
+        write_memory_statistics(rows, spec)
+    return path
+
+
+def write_seed_statistics(rows, spec):
+    """
+    Writes the statistics of runs repeated over the spec's seeds next to the summary:
+    statistics.csv (mean, median and bootstrap CI per graph and solution method), time_to_target.csv
+    and performance_profile.csv (Dolan-More profiles of the time to reach the spec's target_fraction of
+    the best known size).
+    """
+    from lib.statistics import seed_statistics, time_to_target, performance_profile
+
+    statistics_columns = [column for column in spec["summary_columns"] if column in ("size", "time")] or ["size", "time"]
+    seed_statistics(rows, statistics_columns).to_csv(os.path.join(spec["output_directory"], "statistics.csv"))
+
+    time_to_target_table = time_to_target(rows, spec["target_fraction"])
+    time_to_target_table.to_csv(os.path.join(spec["output_directory"], "time_to_target.csv"))
+    performance_profile(time_to_target_table).to_csv(os.path.join(spec["output_directory"], "performance_profile.csv"))
+
+
+def write_memory_statistics(rows, spec):
+    """
+    Writes the memory peaks of every run to memory.csv and, where a solver ran on graphs of several
+    sizes, the fit of its memory against the number of nodes and the largest feasible instance to
+    memory_scaling.csv (see `lib.statistics.memory_scaling`).
+    """
+    from lib.statistics import memory_table, memory_scaling
+
+    memory = memory_table(rows)
+    memory.to_csv(os.path.join(spec["output_directory"], "memory.csv"))
+    scaling = memory_scaling(memory, spec.get("memory_budget_bytes"))
+    if len(scaling):
+        scaling.to_csv(os.path.join(spec["output_directory"], "memory_scaling.csv"))
+
+
+def run_benchmark(spec, scheduler=None):
+    """
+    Runs every job of a benchmark spec that is not already in its result store, then writes the summary.
+
+    Each result is appended to `results.jsonl` in the output directory as soon as its job finishes,
+    so an interrupted benchmark resumes where it stopped when run again.
+
+    Args:
+        spec (dict): Specification loaded by `lib.benchmark_spec.load_spec`.
+        scheduler (optional): Object with a `run(jobs, run_job, on_result)` method. Defaults to
+            a `SerialScheduler`.
+
+    Returns:
+        list of dict: All solution rows of the spec's jobs, including those of earlier runs.
+    """
+    scheduler = scheduler or SerialScheduler()
+    store = ResultStore(store_path(spec))
+    jobs = build_jobs(spec)
+    pending_jobs = [job for job in jobs if job not in store]
+    if len(pending_jobs) < len(jobs):
+        logger.info("Resuming: %s of %s jobs already completed", len(jobs) - len(pending_jobs), len(jobs))
+
+    progress = tqdm.tqdm(total=len(pending_jobs), desc=" Running benchmark jobs")
+
+    def on_result(job, result):
+        store.append(job, result)
+        progress.update(1)
+        logger.info("Completed %s / %s", progress.n, len(pending_jobs))
+
+    scheduler.run(pending_jobs, run_job, on_result)
+    progress.close()
+    logger.info("Benchmark makespan: %.3f s", scheduler.makespan)
+
+    # Only report the derived matrix cache if a solver actually used it
+    if "lib.graph_cache" in sys.modules:
+        logger.info("Derived matrix cache statistics: %s", sys.modules["lib.graph_cache"].get_default_cache().stats())
+
+    logger.info("Summary written to %s", summarize(spec, store))
+    return store.rows(jobs)
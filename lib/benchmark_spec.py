@@ -0,0 +1,212 @@
+import os
+import json
+import itertools
+from copy import deepcopy
+
+from lib.dataset_generation import list_gpickle_files
+from lib.graph_generators import generated_graph_name
+from lib.registry import resolve_solver_class
+
+
+DEFAULT_SUMMARY_COLUMNS = ["size", "time"]
+
+
+def load_spec(path):
+    """
+    Loads a benchmark specification from a JSON or YAML file.
+
+    YAML specs require the optional `pyyaml` package.
+
+    Args:
+        path (str): Path to a .json, .yaml or .yml file.
+
+    Returns:
+        dict: The specification.
+    """
+    with open(path, "r") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as error:
+                raise ImportError("YAML benchmark specs require pyyaml (pip install pyyaml)") from error
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+
+    spec.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    spec.setdefault("output_directory", os.path.join("results", spec["name"]))
+    spec.setdefault("seeds", [None])
+    spec.setdefault("summary_columns", DEFAULT_SUMMARY_COLUMNS)
+    spec.setdefault("target_fraction", 1.0)
+    return spec
+
+
+def grid_points(grid):
+    """
+    Expands a parameter grid into the product of its values.
+
+    Grid keys naming several comma-separated parameters (e.g. "gamma,gamma_prime") take lists of
+    tuples and vary those parameters together.
+
+    Returns:
+        list of dict: The parameter assignment of every grid point.
+    """
+    keys = [key.split(",") for key in grid]
+    points = []
+    for point in itertools.product(*grid.values()):
+        assignment = {}
+        for names, values in zip(keys, point):
+            assignment.update(zip(names, values if len(names) > 1 else [values]))
+        points.append(assignment)
+    return points
+
+
+def expand_solver_grid(solver):
+    """
+    Expands a solver entry with a parameter "grid" into one configuration per grid point
+    (see `grid_points`).
+
+    With "vectorize": true, the whole grid becomes a single configuration whose parameters are lists
+    with one entry per grid point, solved at once by solvers accepting list-valued hyperparameters
+    (see `pCQOMIS_MGD`). Its "configuration_names" name each grid point.
+
+    Args:
+        solver (dict): Solver entry with "name", "class", "params" and optional "grid" and "vectorize".
+
+    Returns:
+        list of dict: Solver configurations with "name", "class" and "params".
+    """
+    grid = solver.get("grid", {})
+    base = {"name": solver["name"], "class": solver["class"], "params": solver.get("params", {})}
+    if not grid:
+        return [deepcopy(base)]
+
+    configurations = []
+    for assignment in grid_points(grid):
+        configuration = deepcopy(base)
+        configuration["params"].update(assignment)
+        configuration["name"] = f"{base['name']} {', '.join(f'{name}={value}' for name, value in assignment.items())}"
+        configurations.append(configuration)
+
+    if solver.get("vectorize", False):
+        vectorized = deepcopy(base)
+        for name in grid_points(grid)[0]:
+            vectorized["params"][name] = [configuration["params"][name] for configuration in configurations]
+        vectorized["configuration_names"] = [configuration["name"] for configuration in configurations]
+        return [vectorized]
+    return configurations
+
+
+def solver_threads(solver):
+    """
+    Returns the number of cores a job of this solver entry reserves: the entry's "threads" key,
+    or the `default_threads` of its solver class.
+    """
+    if solver.get("threads") is not None:
+        return int(solver["threads"])
+    return resolve_solver_class(solver["class"]).default_threads
+
+
+def list_generated_graphs(dataset):
+    """
+    Lists the graphs of a virtual dataset, generated when their first job runs instead of read from disk.
+
+    The dataset names a "generator" of `lib.graph_generators.GENERATORS` and its fixed "params", with
+    an optional parameter "grid" (see `grid_points`) and the "seeds" of the graphs (defaults to [0]).
+
+    Returns:
+        list of dict: Graph descriptors with "name", "dataset", "path" (a "generator:" URI identifying
+            the graph) and "generator" ({"name", "params", "seed"}, see `generate_graph`).
+    """
+    graphs = []
+    for assignment in grid_points(dataset.get("grid", {})):
+        params = dict(dataset.get("params", {}), **assignment)
+        for seed in dataset.get("seeds", [0]):
+            query = "&".join(f"{key}={value}" for key, value in sorted(dict(params, seed=seed).items()))
+            graphs.append(
+                {
+                    "name": generated_graph_name(dataset["generator"], params, seed),
+                    "dataset": dataset.get("name"),
+                    "path": f"generator:{dataset['generator']}?{query}",
+                    "generator": {"name": dataset["generator"], "params": params, "seed": seed},
+                }
+            )
+    return graphs
+
+
+def list_spec_graphs(spec):
+    """
+    Lists the graphs of every dataset in the spec.
+
+    Datasets either list "directories" of .gpickle files or name a graph "generator" (see
+    `list_generated_graphs`). Graphs listed by several datasets are kept once. Graphs are named
+    after their file or generator parameters; names shared by graphs of different directories
+    (or generated datasets) are qualified with the directory (or dataset) name.
+
+    Returns:
+        list of dict: Graph descriptors with "name", "dataset" and "path".
+    """
+    graphs = []
+    for dataset in spec["datasets"]:
+        if "generator" in dataset:
+            graphs.extend(list_generated_graphs(dataset))
+            continue
+        paths = list_gpickle_files(
+            dataset["directories"],
+            choose_n=dataset.get("choose_n"),
+            order=dataset.get("order", "name"),
+            seed=dataset.get("seed"),
+        )
+        graphs.extend(
+            {"name": os.path.basename(path)[:-8], "dataset": dataset.get("name"), "path": path}
+            for path in paths
+        )
+
+    # A graph listed by several datasets is run once, under its first dataset
+    unique_graphs = {}
+    for graph in graphs:
+        unique_graphs.setdefault(graph["path"], graph)
+    graphs = list(unique_graphs.values())
+
+    name_counts = {}
+    for graph in graphs:
+        name_counts[graph["name"]] = name_counts.get(graph["name"], 0) + 1
+    for graph in graphs:
+        if name_counts[graph["name"]] > 1:
+            if "generator" in graph:
+                graph["name"] = f"{graph['dataset']}/{graph['name']}"
+            else:
+                graph["name"] = f"{os.path.basename(os.path.dirname(graph['path']))}/{graph['name']}"
+    return graphs
+
+
+def build_jobs(spec):
+    """
+    Expands a spec into independent (graph, solver configuration, seed) jobs.
+
+    Jobs are ordered graph by graph so that consecutive jobs share the loaded graph. Each job
+    declares the number of cores it needs as "threads", which is also passed to the solver as
+    its "threads" parameter unless the parameters already set one.
+
+    Returns:
+        list of dict: Jobs with "id", "graph", "solver", "seed" and "threads".
+    """
+    configurations = []
+    for solver in spec["solvers"]:
+        if solver.get("enabled", True):
+            threads = solver_threads(solver)
+            for configuration in expand_solver_grid(solver):
+                configuration["params"].setdefault("threads", threads)
+                configuration["threads"] = configuration["params"]["threads"]
+                configurations.append(configuration)
+
+    jobs = []
+    for graph in list_spec_graphs(spec):
+        for configuration in configurations:
+            for seed in spec["seeds"]:
+                job_solver = deepcopy(configuration)
+                if seed is not None:
+                    job_solver["params"]["seed"] = seed
+                threads = job_solver.pop("threads")
+                jobs.append({"id": len(jobs), "graph": graph, "solver": job_solver, "seed": seed, "threads": threads})
+    return jobs
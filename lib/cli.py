@@ -0,0 +1,195 @@
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import subprocess
+
+from lib.registry import solver_names, resolve_solver_class
+
+logger = logging.getLogger(__name__)
+
+# Graph formats by file extension. Only the reader of the format in use is imported.
+GRAPH_FORMATS = {
+    ".gpickle": "gpickle",
+    ".metis": "metis",
+    ".graph": "metis",
+    ".col": "dimacs",
+    ".clq": "dimacs",
+    ".dimacs": "dimacs",
+    ".txt": "edge_list",
+    ".edges": "edge_list",
+    ".edgelist": "edge_list",
+}
+
+# Directory containing lib/ and solvers/, put on the path of the cold-start interpreters
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_START_SCRIPT = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "from lib.registry import resolve_solver_class\n"
+    "resolve_solver_class({name!r})\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def load_graph(path):
+    """
+    Loads a graph file as a networkx graph with nodes 0..n-1, picking the reader by extension (see
+    GRAPH_FORMATS).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in GRAPH_FORMATS:
+        raise ValueError(f"Unknown graph extension '{extension}', expected one of {sorted(GRAPH_FORMATS)}")
+    if GRAPH_FORMATS[extension] == "gpickle":
+        from lib.dataset_generation import load_gpickle
+
+        return load_gpickle(path)["data"]
+
+    from lib.io import READERS, csr_to_networkx
+
+    return csr_to_networkx(*READERS[GRAPH_FORMATS[extension]](path))
+
+
+def parse_params(value):
+    """
+    Parses solver parameters given as a JSON object or as the path of a JSON file.
+    """
+    if value is None:
+        return {}
+    if os.path.exists(value):
+        with open(value, "r") as f:
+            return json.load(f)
+    return json.loads(value)
+
+
+def solve(args):
+    """
+    Solves one graph with one solver, importing nothing but that solver and the graph's reader.
+    """
+    params = parse_params(args.params)
+    if args.seed is not None:
+        params["seed"] = args.seed
+    if args.threads is not None:
+        params["threads"] = args.threads
+
+    try:
+        solver_class = resolve_solver_class(args.solver)
+    except ImportError as error:
+        raise SystemExit(str(error))
+    G = load_graph(args.graph)
+    solver = solver_class(G, params)
+    solver.solve()
+
+    size = solver.solution["size"]
+    print(f"{args.solver} on {args.graph}: MIS of size {size} in {solver.solution_time:.3f} s")
+    timings = ", ".join(
+        f"{key} {value:.3f} s" if value is not None else f"{key} n/a" for key, value in solver.timings.items()
+    )
+    print(f"Timings: {timings}")
+    if args.output:
+        from lib.result_store import to_json
+
+        with open(args.output, "w") as f:
+            json.dump(
+                to_json(
+                    {
+                        "graph": args.graph,
+                        "solver": args.solver,
+                        "params": params,
+                        "solution_time": solver.solution_time,
+                        "timings": solver.timings,
+                        "solution": solver.solution,
+                    }
+                ),
+                f,
+            )
+        print(f"Solution written to {args.output}")
+
+
+def cold_start_times(names, repeats=3):
+    """
+    Measures the startup cost of every solver in fresh interpreters: the time to import its class
+    through the registry, and the wall time of the whole process including interpreter startup.
+
+    Returns:
+        list of dict: One row per solver with "solver", "import_time" and "process_time" (best over
+            `repeats` runs, in seconds), or "error" when the solver cannot be imported.
+    """
+    python_path = os.pathsep.join(filter(None, [REPOSITORY_ROOT, os.environ.get("PYTHONPATH")]))
+    environment = dict(os.environ, PYTHONPATH=python_path)
+    rows = []
+    for name in names:
+        row = {"solver": name, "import_time": float("inf"), "process_time": float("inf")}
+        for _ in range(repeats):
+            start = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, "-c", COLD_START_SCRIPT.format(name=name)],
+                capture_output=True, text=True, cwd=REPOSITORY_ROOT, env=environment,
+            )
+            process_time = time.perf_counter() - start
+            if completed.returncode != 0:
+                row = {"solver": name, "error": completed.stderr.strip().splitlines()[-1]}
+                break
+            row["import_time"] = min(row["import_time"], float(completed.stdout))
+            row["process_time"] = min(row["process_time"], process_time)
+        rows.append(row)
+    return rows
+
+
+def cold_start(args):
+    """
+    Prints the cold-start times of the requested solvers (all registered solvers by default).
+    """
+    print(f"{'Solver':<18} {'Import (s)':>10} {'Process (s)':>11}")
+    for row in cold_start_times(args.solvers or solver_names(), args.repeats):
+        if "error" in row:
+            print(f"{row['solver']:<18} unavailable: {row['error']}")
+        else:
+            print(f"{row['solver']:<18} {row['import_time']:>10.3f} {row['process_time']:>11.3f}")
+
+
+def list_solvers(args):
+    """
+    Prints the registered solver names.
+    """
+    print("\n".join(solver_names()))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="pcqo-mis", description="Solve MIS instances with the solvers of this repository."
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log solver progress to stderr.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve_parser = commands.add_parser("solve", help="Solve one graph with one solver.")
+    solve_parser.add_argument("graph", help=f"Graph file, one of the formats {sorted(GRAPH_FORMATS)}.")
+    solve_parser.add_argument("--solver", required=True, choices=solver_names(), help="Solver class name.")
+    solve_parser.add_argument("--params", help="Solver parameters as a JSON object or the path of a JSON file.")
+    solve_parser.add_argument("--seed", type=int, help="Seed passed as the solver's seed parameter.")
+    solve_parser.add_argument("--threads", type=int, help="Threads passed as the solver's threads parameter.")
+    solve_parser.add_argument("--output", help="Write the solution as JSON to this path.")
+    solve_parser.set_defaults(handler=solve)
+
+    cold_start_parser = commands.add_parser(
+        "cold-start", help="Measure the import time of each solver in a fresh interpreter."
+    )
+    cold_start_parser.add_argument("solvers", nargs="*", help="Solvers to measure. Defaults to all registered solvers.")
+    cold_start_parser.add_argument("--repeats", type=int, default=3, help="Runs per solver; the best is reported.")
+    cold_start_parser.set_defaults(handler=cold_start)
+
+    list_parser = commands.add_parser("solvers", help="List the registered solvers.")
+    list_parser.set_defaults(handler=list_solvers)
+    return parser
+
+
+def main(argv=None):
+    """
+    Entry point of the `pcqo-mis` command line.
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr)
+    args.handler(args)
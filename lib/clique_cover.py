@@ -0,0 +1,138 @@
+import numpy as np
+import scipy.sparse
+
+from lib.io import networkx_to_csr, csr_to_edges
+
+# Formulations of the independence constraints of the MIS models: one constraint per edge, or one
+# per clique of an edge clique cover
+FORMULATIONS = ("edge", "clique")
+
+# Graphs with at most this many adjacency matrix entries and a density of at least DENSE_COVER_DENSITY
+# are covered on a dense boolean adjacency matrix, where candidate sets are rows ANDed together
+DENSE_COVER_MAX_ENTRIES = 1 << 26
+DENSE_COVER_DENSITY = 1 / 64
+
+
+def greedy_clique_cover(indptr, indices):
+    """
+    Computes an edge clique cover of a graph: a list of cliques such that every edge lies in at least
+    one of them.
+
+    Nodes are visited by decreasing degree. While a node u has an uncovered edge (u, v), the clique
+    {u, v} is grown greedily into a maximal clique, preferring the common neighbours whose edge to u is
+    still uncovered, and all of its edges are marked covered. The work per clique is vectorized: candidate
+    sets are rows of a boolean adjacency matrix ANDed together on small dense graphs (see
+    DENSE_COVER_MAX_ENTRIES), and sorted neighbour arrays intersected with numpy otherwise.
+
+    Args:
+        indptr (numpy.ndarray): CSR row pointer of length n + 1 (see lib/io.py).
+        indices (numpy.ndarray): CSR column indices, with sorted neighbour lists.
+
+    Returns:
+        tuple of numpy.ndarray: (clique_indptr, clique_nodes), clique i being
+            clique_nodes[clique_indptr[i]:clique_indptr[i + 1]].
+    """
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    number_of_nodes = len(indptr) - 1
+    order = np.argsort(-np.diff(indptr), kind="stable")
+    if number_of_nodes**2 <= DENSE_COVER_MAX_ENTRIES and len(indices) >= DENSE_COVER_DENSITY * number_of_nodes**2:
+        cliques = _dense_clique_cover(indptr, indices, order)
+    else:
+        cliques = _sparse_clique_cover(indptr, indices, order)
+
+    clique_indptr = np.zeros(len(cliques) + 1, dtype=np.int64)
+    np.cumsum([len(clique) for clique in cliques], out=clique_indptr[1:])
+    clique_nodes = np.concatenate(cliques) if cliques else np.zeros(0, dtype=np.int64)
+    return clique_indptr, clique_nodes
+
+
+def _dense_clique_cover(indptr, indices, order):
+    number_of_nodes = len(indptr) - 1
+    adjacency = np.zeros((number_of_nodes, number_of_nodes), dtype=bool)
+    adjacency[np.repeat(np.arange(number_of_nodes), np.diff(indptr)), indices] = True
+    uncovered = adjacency.copy()
+    cliques = []
+
+    for u in order:
+        while uncovered[u].any():
+            v = np.argmax(uncovered[u])
+            clique = [u, v]
+            candidates = adjacency[u] & adjacency[v]
+            while candidates.any():
+                preferred = candidates & uncovered[u]
+                w = np.argmax(preferred) if preferred.any() else np.argmax(candidates)
+                clique.append(w)
+                candidates &= adjacency[w]
+
+            clique = np.array(clique, dtype=np.int64)
+            uncovered[np.ix_(clique, clique)] = False
+            cliques.append(clique)
+    return cliques
+
+
+def _sparse_clique_cover(indptr, indices, order):
+    covered = np.zeros(len(indices), dtype=bool)
+    cliques = []
+
+    for u in order:
+        start, end = indptr[u], indptr[u + 1]
+        neighbors = indices[start:end]
+        while True:
+            uncovered = np.flatnonzero(~covered[start:end])
+            if not len(uncovered):
+                break
+            v = neighbors[uncovered[0]]
+            clique = [u, v]
+            candidates = np.intersect1d(neighbors, indices[indptr[v]:indptr[v + 1]], assume_unique=True)
+            while len(candidates):
+                open_to_u = ~covered[start + np.searchsorted(neighbors, candidates)]
+                w = candidates[np.argmax(open_to_u)]
+                clique.append(w)
+                candidates = np.intersect1d(candidates, indices[indptr[w]:indptr[w + 1]], assume_unique=True)
+
+            clique = np.array(clique, dtype=np.int64)
+            for member in clique:
+                others = clique[clique != member]
+                row = indices[indptr[member]:indptr[member + 1]]
+                covered[indptr[member] + np.searchsorted(row, others)] = True
+            cliques.append(clique)
+    return cliques
+
+
+def independence_constraints(G, formulation="edge"):
+    """
+    Lists the node sets of which an independent set may contain at most one node.
+
+    Nodes are numbered in iteration order and self-loops are ignored.
+
+    Args:
+        G (networkx.Graph): The graph.
+        formulation (str, optional): "edge" for one set per edge, "clique" for the cliques of
+            `greedy_clique_cover`. Defaults to "edge".
+
+    Returns:
+        tuple of numpy.ndarray: (constraint_indptr, constraint_nodes) in the layout of
+            `greedy_clique_cover`.
+    """
+    if formulation not in FORMULATIONS:
+        raise ValueError(f"Unknown formulation '{formulation}', expected one of {FORMULATIONS}")
+    indptr, indices = networkx_to_csr(G)
+    if formulation == "clique":
+        return greedy_clique_cover(indptr, indices)
+    edges = csr_to_edges(indptr, indices)
+    return np.arange(0, 2 * len(edges) + 1, 2, dtype=np.int64), edges.ravel()
+
+
+def constraint_matrix(constraint_indptr, constraint_nodes, number_of_nodes):
+    """
+    Builds the 0/1 incidence matrix of the constraint sets, one row per set, so that the constraints
+    read A x <= 1.
+
+    Returns:
+        scipy.sparse.csr_matrix: Matrix of shape (number of sets, number_of_nodes).
+    """
+    data = np.ones(len(constraint_nodes), dtype=np.float64)
+    return scipy.sparse.csr_matrix(
+        (data, constraint_nodes, constraint_indptr), shape=(len(constraint_indptr) - 1, number_of_nodes)
+    )
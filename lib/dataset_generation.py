@@ -1,30 +1,157 @@
 import os
+import glob
 import pickle
+import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import networkx as nx
 
 
-def assemble_dataset_from_gpickle(graph_directories, choose_n=None):
-    dataset = []
+GRAPH_ORDERS = ("name", "size", "shuffled")
+
+
+def expand_graph_directories(graph_directories):
+    """
+    Expands glob patterns in a list of graph directories.
+
+    Args:
+        graph_directories (list of str): Directories or glob patterns (e.g. "./graphs/satlib/m4*").
+
+    Returns:
+        list of str: Matching directories, in the order given and sorted within each pattern.
+    """
+    directories = []
     for graph_directory in graph_directories:
-        graphs_found = 0
-        for  filename in os.listdir(graph_directory):
-            if choose_n and graphs_found >= choose_n:
+        if glob.has_magic(graph_directory):
+            matches = sorted(path for path in glob.glob(graph_directory) if os.path.isdir(path))
+            directories.extend(matches)
+        else:
+            directories.append(graph_directory)
+    return directories
+
+
+def list_gpickle_files(graph_directories, choose_n=None, order="name", seed=None):
+    """
+    Lists the .gpickle files found in the given directories without loading them.
+
+    Args:
+        graph_directories (list of str): Directories or glob patterns containing .gpickle files.
+        choose_n (int, optional): Maximum number of graphs taken from each directory. Defaults to None (all).
+        order (str, optional): Order of the returned files, one of "name", "size" (file size, smallest first)
+            or "shuffled". Defaults to "name".
+        seed (int, optional): Seed used when order is "shuffled". Defaults to None.
+
+    Returns:
+        list of str: Paths to the selected .gpickle files.
+    """
+    if order not in GRAPH_ORDERS:
+        raise ValueError(f"Unknown graph order '{order}', expected one of {GRAPH_ORDERS}")
+
+    paths = []
+    for graph_directory in expand_graph_directories(graph_directories):
+        filenames = sorted(
+            filename for filename in os.listdir(graph_directory) if filename.endswith(".gpickle")
+        )
+        if choose_n:
+            filenames = filenames[:choose_n]
+        paths.extend(os.path.join(graph_directory, filename) for filename in filenames)
+
+    if order == "size":
+        paths.sort(key=os.path.getsize)
+    elif order == "shuffled":
+        random.Random(seed).shuffle(paths)
+
+    return paths
+
+
+def load_gpickle(path):
+    """
+    Loads a single .gpickle file into a dataset entry.
+
+    Args:
+        path (str): Path to the .gpickle file.
+
+    Returns:
+        dict: Dataset entry with the graph "name" and its integer-relabelled networkx graph as "data".
+    """
+    with open(path, "rb") as f:
+        G = pickle.load(f)
+    return {
+        "name": os.path.basename(path)[:-8],
+        "data": nx.relabel.convert_node_labels_to_integers(G, first_label=0),
+    }
+
+
+def stream_dataset_from_gpickle(
+    graph_directories, choose_n=None, order="name", seed=None, prefetch=2, executor="thread"
+):
+    """
+    Lazily yields graphs from .gpickle files, prefetching the next few in the background.
+
+    At most `prefetch` graphs are being loaded or waiting to be consumed at any time, so reading and
+    unpickling overlap with solving while memory stays bounded to a handful of graphs.
+
+    Args:
+        graph_directories (list of str): Directories or glob patterns containing .gpickle files.
+        choose_n (int, optional): Maximum number of graphs taken from each directory. Defaults to None (all).
+        order (str, optional): "name", "size" or "shuffled". Defaults to "name".
+        seed (int, optional): Seed used when order is "shuffled". Defaults to None.
+        prefetch (int, optional): Number of graphs loaded ahead of the consumer. 0 loads synchronously. Defaults to 2.
+        executor (str, optional): "thread" or "process" pool used for prefetching. Defaults to "thread".
+
+    Yields:
+        dict: Dataset entries with "name" and "data" keys, in the requested order.
+    """
+    paths = list_gpickle_files(graph_directories, choose_n=choose_n, order=order, seed=seed)
+
+    if prefetch <= 0:
+        for path in paths:
+            print("Graph ", path, "is being imported ...")
+            yield load_gpickle(path)
+        return
+
+    if executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=prefetch)
+    elif executor == "process":
+        pool = ProcessPoolExecutor(max_workers=prefetch)
+    else:
+        raise ValueError(f"Unknown executor '{executor}', expected 'thread' or 'process'")
+
+    pending = deque()
+    remaining = iter(paths)
+    try:
+        for path in remaining:
+            pending.append((path, pool.submit(load_gpickle, path)))
+            if len(pending) >= prefetch:
                 break
-            if filename.endswith(".gpickle"):
-                graphs_found+=1
-                print(
-                    "Graph ",
-                    os.path.join(graph_directory, filename),
-                    "is being imported ...",
-                )
-                with open(os.path.join(graph_directory, filename), "rb") as f:
-                    G = pickle.load(f)
-                    dataset.append(
-                        {
-                            "name": filename[:-8],
-                            "data": nx.relabel.convert_node_labels_to_integers(
-                                G, first_label=0
-                            ),
-                        }
-                    )
-    return dataset
+
+        while pending:
+            path, future = pending.popleft()
+            print("Graph ", path, "is being imported ...")
+            graph = future.result()
+            yield graph
+            del graph
+            # Only refill once the consumer is done with the graph, so at most `prefetch` graphs are alive
+            next_path = next(remaining, None)
+            if next_path is not None:
+                pending.append((next_path, pool.submit(load_gpickle, next_path)))
+    finally:
+        for _, future in pending:
+            future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def assemble_dataset_from_gpickle(graph_directories, choose_n=None):
+    """
+    Eagerly loads every graph found in the given directories.
+
+    Prefer `stream_dataset_from_gpickle` for large datasets.
+
+    Args:
+        graph_directories (list of str): Directories or glob patterns containing .gpickle files.
+        choose_n (int, optional): Maximum number of graphs taken from each directory. Defaults to None (all).
+
+    Returns:
+        list of dict: Dataset entries with "name" and "data" keys.
+    """
+    return list(stream_dataset_from_gpickle(graph_directories, choose_n=choose_n, prefetch=0))
@@ -0,0 +1,305 @@
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from lib.io import networkx_to_csr, write_metis
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+# Directory of the METIS files handed to external solvers, shared by all processes of the machine
+DEFAULT_METIS_DIRECTORY = os.path.join(tempfile.gettempdir(), "pcqo_mis_metis")
+
+# Size budget of the METIS directory, beyond which the least recently used files are removed
+DEFAULT_METIS_MAX_BYTES = 4 * 1024**3
+
+
+def csr_fingerprint(indptr, indices):
+    """
+    Computes the fingerprint of a graph given as CSR arrays (see lib/io.py), which hold no self-loops.
+
+    Returns:
+        str: Hex digest identifying the graph.
+    """
+    digest = hashlib.sha256()
+    digest.update(indptr.tobytes())
+    digest.update(indices.tobytes())
+    return digest.hexdigest()
+
+
+def edge_index_fingerprint(number_of_nodes, edges):
+    """
+    Computes the fingerprint of a graph given as an edge index array (see `lib.adjacency.graph_edge_index`),
+    self-loops included, independently of the order and orientation of the edges.
+
+    Returns:
+        str: Hex digest identifying the graph.
+    """
+    edges = np.sort(np.asarray(edges, dtype=np.int64).reshape(-1, 2), axis=1)
+    edges = np.unique(edges, axis=0) if len(edges) else edges
+    digest = hashlib.sha256()
+    digest.update(np.int64(number_of_nodes).tobytes())
+    digest.update(np.ascontiguousarray(edges).tobytes())
+    return digest.hexdigest()
+
+
+def graph_fingerprint(G):
+    """
+    Computes a canonical fingerprint of a graph's structure.
+
+    The fingerprint hashes the edge index the solvers build their matrices from (see
+    `lib.adjacency.build_adjacency`), with nodes numbered in iteration order and self-loops kept, so two
+    graphs share a fingerprint exactly when they produce the same adjacency matrix. It is recomputed on
+    every call, so graphs mutated between solver runs never reuse stale matrices.
+
+    Args:
+        G (networkx.Graph): The graph to fingerprint.
+
+    Returns:
+        str: Hex digest identifying the graph.
+    """
+    from lib.adjacency import graph_edge_index
+
+    return edge_index_fingerprint(*graph_edge_index(G))
+
+
+def metis_fingerprint(G):
+    """
+    Computes the fingerprint naming the METIS file of a graph (see `metis_file`): the `csr_fingerprint`
+    of its self-loop-free CSR arrays, with nodes numbered in iteration order.
+
+    Args:
+        G (networkx.Graph): The graph to fingerprint.
+
+    Returns:
+        str: Hex digest identifying the graph.
+    """
+    return csr_fingerprint(*networkx_to_csr(G))
+
+
+def metis_file(G, directory=DEFAULT_METIS_DIRECTORY, fingerprint=None, max_bytes=DEFAULT_METIS_MAX_BYTES):
+    """
+    Returns the path of a METIS file of the graph, writing it on first use.
+
+    Files are named by graph fingerprint, so every run on the same graph, whatever its seed, time limit
+    or process, reuses one file. Files are written under a temporary name and renamed into place, so
+    concurrent writers never expose a partial file. Nodes are numbered in iteration order, as in
+    `graph_fingerprint`, but the file name is the `metis_fingerprint` of the self-loop-free graph written.
+
+    Every use refreshes the modification time of the file, and writing a new file removes the least
+    recently used others until the directory holds at most `max_bytes` of METIS files. A file evicted
+    while another process is about to read it is lost to that process, so the budget should exceed the
+    files of the graphs solved at the same time.
+
+    Args:
+        G (networkx.Graph): The graph to export.
+        directory (str, optional): Directory of the files. Defaults to DEFAULT_METIS_DIRECTORY.
+        fingerprint (str, optional): The graph's `metis_fingerprint`, computed once by callers solving the
+            same unchanged graph many times; when its file exists, the graph is then neither converted nor
+            hashed. Computed from the graph when None.
+        max_bytes (int, optional): Size budget of the directory, None for unbounded growth. Defaults to
+            DEFAULT_METIS_MAX_BYTES.
+
+    Returns:
+        str: Path of the METIS file.
+    """
+    # Both the fingerprint and the file come from the same CSR arrays, which METIS files share in
+    # dropping self-loops
+    csr = None
+    if fingerprint is None:
+        csr = networkx_to_csr(G)
+        fingerprint = csr_fingerprint(*csr)
+    path = os.path.join(directory, f"{fingerprint}.metis")
+    try:
+        os.utime(path)
+        return path
+    except FileNotFoundError:
+        pass
+
+    if csr is None:
+        csr = networkx_to_csr(G)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=f".{fingerprint}.", suffix=".tmp")
+    os.close(descriptor)
+    try:
+        write_metis(temporary_path, *csr)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+    logger.info("Wrote METIS file %s", path)
+    if max_bytes is not None:
+        evict_metis_files(directory, max_bytes, keep=path)
+    return path
+
+
+def evict_metis_files(directory, max_bytes, keep=None):
+    """
+    Removes the least recently modified METIS files of a directory until the rest fit in `max_bytes`,
+    sparing the file `keep`. Files removed concurrently by other processes are skipped.
+    """
+    files = []
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(".metis") or entry.path == keep:
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime_ns, entry.path, stat.st_size))
+    total = sum(size for _, _, size in files) + (os.path.getsize(keep) if keep is not None else 0)
+
+    for _, path, size in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+            logger.info("Evicted METIS file %s", path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def tensor_bytes(entry):
+    """
+    Returns the number of bytes held by the tensors of a cache entry.
+    """
+    import torch
+
+    return sum(
+        value.element_size() * value.numel()
+        for value in entry.values()
+        if isinstance(value, torch.Tensor)
+    )
+
+
+class DerivedMatrixCache:
+    """
+    Process-wide LRU cache of matrices derived from a graph (adjacency, complement, degree statistics, ...).
+
+    Entries are dictionaries of tensors keyed by a graph fingerprint plus whatever distinguishes the
+    derived data (device, dtype, ...). The in-memory tier is bounded by `max_bytes`; when a
+    `disk_directory` is given, every computed entry is also saved there and reloaded on an
+    in-memory miss. Cached tensors are shared between callers and must not be modified in place.
+
+    Parameters:
+        max_bytes (int, optional): Memory budget of the in-memory tier. Defaults to 2 GiB.
+        disk_directory (str, optional): Directory of the on-disk tier. Defaults to None (disabled).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, disk_directory=None):
+        self.max_bytes = max_bytes
+        self.disk_directory = disk_directory
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_directory is not None:
+            os.makedirs(self.disk_directory, exist_ok=True)
+
+    def _disk_path(self, key):
+        name = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.disk_directory, f"{name}.pt")
+
+    def _insert(self, key, entry):
+        size = tensor_bytes(entry)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (entry, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def get_or_compute(self, key, compute, device=None):
+        """
+        Returns the entry stored under `key`, computing and caching it on a miss.
+
+        Args:
+            key (tuple): Hashable key, normally starting with the graph fingerprint.
+            compute (callable): Zero-argument function returning the entry (dict of tensors).
+            device (torch.device, optional): Device tensors are mapped to when loaded from disk.
+
+        Returns:
+            dict: The cached entry.
+        """
+        import torch
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+            if self.disk_directory is not None and os.path.exists(self._disk_path(key)):
+                entry = torch.load(self._disk_path(key), map_location=device)
+                self.disk_hits += 1
+                self._insert(key, entry)
+                return entry
+
+            self.misses += 1
+            entry = compute()
+            self._insert(key, entry)
+            if self.disk_directory is not None:
+                torch.save({name: value.cpu() for name, value in entry.items()}, self._disk_path(key))
+            return entry
+
+    def clear(self):
+        """
+        Drops every in-memory entry. The on-disk tier is left untouched.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        """
+        Returns hit/miss counters and memory usage of the cache.
+
+        Returns:
+            dict: hits, disk_hits, misses, evictions, entries, bytes and max_bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_default_cache = DerivedMatrixCache()
+
+
+def get_default_cache():
+    """
+    Returns the process-wide cache shared by all solver instances.
+    """
+    return _default_cache
+
+
+def configure_default_cache(max_bytes=DEFAULT_MAX_BYTES, disk_directory=None):
+    """
+    Replaces the process-wide cache with one using the given budget and on-disk tier.
+
+    Returns:
+        DerivedMatrixCache: The new process-wide cache.
+    """
+    global _default_cache
+    _default_cache = DerivedMatrixCache(max_bytes=max_bytes, disk_directory=disk_directory)
+    logger.info("Derived matrix cache configured: %s bytes, disk tier %s", max_bytes, disk_directory)
+    return _default_cache
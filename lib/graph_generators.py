@@ -0,0 +1,285 @@
+import math
+import inspect
+
+import numpy as np
+
+from lib.io import edges_to_csr, csr_to_edges
+
+# Vectorized random graph generators. Every generator draws from numpy.random.default_rng(seed), so a
+# (generator, parameters, seed) triple always yields the same graph, and returns symmetric CSR arrays
+# (see lib/io.py) without building a networkx graph.
+
+# Satisfiability threshold of random 3-SAT, the clause to variable ratio of the SATLIB uf sets
+SATLIB_CLAUSE_RATIO = 4.26
+
+# Rows of random keys drawn at once when sampling value pairs of RB constraints
+RB_CHUNK_ENTRIES = 1 << 22
+
+
+def pair_index_to_edges(pair_indices):
+    """
+    Maps indices k in [0, n(n-1)/2) to the node pairs (u, v), u < v, of the lower triangle in
+    row-major order: k = v(v-1)/2 + u.
+
+    Returns:
+        numpy.ndarray: Integer array of shape (len(pair_indices), 2).
+    """
+    k = np.asarray(pair_indices, dtype=np.int64)
+    v = ((1 + np.sqrt(1 + 8 * k.astype(np.float64))) // 2).astype(np.int64)
+    # Correct the rare off-by-one of the floating point square root
+    v -= v * (v - 1) // 2 > k
+    v += (v + 1) * v // 2 <= k
+    return np.stack((k - v * (v - 1) // 2, v), axis=1)
+
+
+def gnm_random_graph(n, m, seed=None):
+    """
+    Uniform random graph G(n, m): m distinct edges drawn uniformly from the n(n-1)/2 node pairs.
+
+    Args:
+        n (int): Number of nodes.
+        m (int): Number of edges.
+        seed (int, optional): Seed of the numpy generator.
+
+    Returns:
+        tuple of numpy.ndarray: (indptr, indices) of the CSR structure.
+    """
+    pairs = n * (n - 1) // 2
+    if m > pairs:
+        raise ValueError(f"A graph on {n} nodes has at most {pairs} edges, {m} requested")
+    rng = np.random.default_rng(seed)
+    return edges_to_csr(n, pair_index_to_edges(rng.choice(pairs, size=m, replace=False)))
+
+
+def erdos_renyi_graph(n, p, seed=None):
+    """
+    Erdos-Renyi graph G(n, p), every node pair being an edge with probability p.
+
+    The number of edges is drawn from its binomial distribution and the edges uniformly given their
+    number, which is the same distribution without a coin flip per pair.
+
+    Args:
+        n (int): Number of nodes.
+        p (float): Edge probability.
+        seed (int, optional): Seed of the numpy generator.
+
+    Returns:
+        tuple of numpy.ndarray: (indptr, indices) of the CSR structure.
+    """
+    pairs = n * (n - 1) // 2
+    rng = np.random.default_rng(seed)
+    m = rng.binomial(pairs, p)
+    return edges_to_csr(n, pair_index_to_edges(rng.choice(pairs, size=m, replace=False)))
+
+
+def _invalid_edges(edges, n):
+    """
+    Flags the self-loops and the repeated occurrences of multi-edges in an edge array.
+    """
+    keys = np.minimum(edges[:, 0], edges[:, 1]) * n + np.maximum(edges[:, 0], edges[:, 1])
+    _, first = np.unique(keys, return_index=True)
+    repeated = np.ones(len(edges), dtype=bool)
+    repeated[first] = False
+    return repeated | (edges[:, 0] == edges[:, 1])
+
+
+def random_regular_graph(n, d, seed=None, max_rounds=10000):
+    """
+    Uniformly paired random d-regular graph.
+
+    Stubs are paired at random (configuration model), then self-loops and multi-edges are removed by
+    degree-preserving swaps with random edges: (a, b), (c, e) become (a, c), (b, e). All invalid edges
+    are swapped at once in every round. Dense graphs, d > (n - 1) / 2, are built as the complement
+    of a random (n - 1 - d)-regular graph, on which swaps converge quickly.
+
+    Args:
+        n (int): Number of nodes.
+        d (int): Degree of every node; n * d must be even and d < n.
+        seed (int, optional): Seed of the numpy generator.
+        max_rounds (int, optional): Rounds of swaps before giving up. Defaults to 10000.
+
+    Returns:
+        tuple of numpy.ndarray: (indptr, indices) of the CSR structure.
+    """
+    if (n * d) % 2 or d >= n:
+        raise ValueError(f"No simple {d}-regular graph on {n} nodes")
+    if d > (n - 1) / 2:
+        indptr, indices = random_regular_graph(n, n - 1 - d, seed, max_rounds)
+        edges = csr_to_edges(indptr, indices)
+        missing = np.setdiff1d(np.arange(n * (n - 1) // 2), edges[:, 1] * (edges[:, 1] - 1) // 2 + edges[:, 0])
+        return edges_to_csr(n, pair_index_to_edges(missing))
+
+    rng = np.random.default_rng(seed)
+    edges = rng.permutation(np.repeat(np.arange(n, dtype=np.int64), d)).reshape(-1, 2)
+
+    for _ in range(max_rounds):
+        invalid = np.flatnonzero(_invalid_edges(edges, n))
+        if not len(invalid):
+            return edges_to_csr(n, edges)
+
+        # Swap partners must be distinct and valid, so no edge takes part in two swaps
+        partners = rng.integers(0, len(edges), size=len(invalid))
+        _, first = np.unique(partners, return_index=True)
+        keep = np.zeros(len(invalid), dtype=bool)
+        keep[first] = True
+        keep &= ~np.isin(partners, invalid)
+        invalid, partners = invalid[keep], partners[keep]
+
+        b = edges[invalid, 1].copy()
+        c, e = edges[partners, 0].copy(), edges[partners, 1]
+        edges[invalid, 1] = c
+        edges[partners, 0] = b
+        edges[partners, 1] = e
+
+    raise RuntimeError(f"Could not make a simple {d}-regular graph on {n} nodes in {max_rounds} rounds")
+
+
+def rb_graph(n, k, p, r=None, seed=None):
+    """
+    Graph of a random RB-model CSP instance (Xu and Li), as in the RB200-300 and RB800-1200 datasets.
+
+    Each of the n variables is a clique over its k values. Each of the int(r n ln n - 1) constraints
+    joins two random variables and forbids s = int(p k^2) random pairs of their values, which become
+    edges between the two cliques. The MIS has at most n nodes, with equality when the instance is
+    satisfiable. Forbidden pairs drawn twice by different constraints are merged.
+
+    Args:
+        n (int): Number of variables (cliques).
+        k (int): Domain size (clique size).
+        p (float): Tightness, the fraction of forbidden value pairs per constraint.
+        r (float, optional): Constraint density. Defaults to -a / ln(1 - p) with a = ln k / ln n,
+            as in the generator of the RB datasets.
+        seed (int, optional): Seed of the numpy generator.
+
+    Returns:
+        tuple of numpy.ndarray: (indptr, indices) of the CSR structure over n * k nodes.
+    """
+    if r is None:
+        if p >= 1:
+            raise ValueError("The constraint density r must be given for a tightness p >= 1")
+        r = -(math.log(k) / math.log(n)) / math.log(1 - p)
+    rng = np.random.default_rng(seed)
+    constraints = max(int(r * n * math.log(n) - 1), 0)
+    s = int(p * k * k)
+
+    # Clique of every variable
+    u, v = np.triu_indices(k, 1)
+    offsets = np.arange(n, dtype=np.int64)[:, None] * k
+    edge_blocks = [np.stack(((offsets + u).ravel(), (offsets + v).ravel()), axis=1)]
+
+    # Two distinct variables per constraint
+    first = rng.integers(0, n, size=constraints)
+    second = (first + rng.integers(1, n, size=constraints)) % n
+
+    # s distinct value pairs per constraint, as the s smallest of k^2 random keys
+    chunk = max(1, RB_CHUNK_ENTRIES // (k * k))
+    for start in range(0, constraints, chunk):
+        rows = slice(start, start + chunk)
+        count = len(first[rows])
+        if s >= k * k:
+            pairs = np.broadcast_to(np.arange(k * k), (count, k * k))
+        else:
+            pairs = rng.random((count, k * k)).argpartition(s, axis=1)[:, :s]
+        left = first[rows, None] * k + pairs // k
+        right = second[rows, None] * k + pairs % k
+        edge_blocks.append(np.stack((left.ravel(), right.ravel()), axis=1))
+
+    return edges_to_csr(n * k, np.concatenate(edge_blocks))
+
+
+def satlib_graph(n, clauses=None, k=3, seed=None):
+    """
+    Graph of a uniform random k-SAT formula, built like the SATLIB MIS benchmarks.
+
+    Every clause is a clique over its k literals, and every literal is joined to the occurrences of
+    its negation in other clauses. The formula is satisfiable exactly when the MIS has one node per
+    clause.
+
+    Args:
+        n (int): Number of variables.
+        clauses (int, optional): Number of clauses. Defaults to round(4.26 n), the ratio of the SATLIB
+            uf sets.
+        k (int, optional): Literals per clause, over distinct variables. Defaults to 3.
+        seed (int, optional): Seed of the numpy generator.
+
+    Returns:
+        tuple of numpy.ndarray: (indptr, indices) of the CSR structure over k * clauses nodes.
+    """
+    if k > n:
+        raise ValueError(f"Clauses of {k} distinct variables need at least {k} variables, got {n}")
+    clauses = round(SATLIB_CLAUSE_RATIO * n) if clauses is None else clauses
+    rng = np.random.default_rng(seed)
+
+    variables = rng.integers(0, n, size=(clauses, k))
+    while True:
+        ordered = np.sort(variables, axis=1)
+        repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+        if not repeated.any():
+            break
+        variables[repeated] = rng.integers(0, n, size=(repeated.sum(), k))
+    positive = rng.integers(0, 2, size=(clauses, k)).astype(bool)
+
+    # Clique of every clause; node c * k + i is the i-th literal of clause c
+    u, v = np.triu_indices(k, 1)
+    offsets = np.arange(clauses, dtype=np.int64)[:, None] * k
+    clause_edges = np.stack(((offsets + u).ravel(), (offsets + v).ravel()), axis=1)
+
+    # Every positive occurrence of a variable is joined to each of its negative occurrences
+    variables, positive = variables.ravel(), positive.ravel()
+    order = np.lexsort((positive, variables))
+    negative_count = np.bincount(variables[~positive], minlength=n)
+    negative_start = np.searchsorted(variables[order], np.arange(n))
+    positive_nodes = order[positive[order]]
+    repeats = negative_count[variables[positive_nodes]]
+    offsets_in_group = np.arange(repeats.sum()) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    negative_nodes = order[np.repeat(negative_start[variables[positive_nodes]], repeats) + offsets_in_group]
+    conflict_edges = np.stack((np.repeat(positive_nodes, repeats), negative_nodes), axis=1)
+
+    return edges_to_csr(clauses * k, np.concatenate((clause_edges, conflict_edges)))
+
+
+# Generator name -> (function, prefix of the graph names)
+GENERATORS = {
+    "er": (erdos_renyi_graph, "ER"),
+    "gnm": (gnm_random_graph, "GNM"),
+    "rb": (rb_graph, "RB"),
+    "regular": (random_regular_graph, "RR"),
+    "satlib": (satlib_graph, "SAT"),
+}
+
+
+def resolve_generator(name):
+    """
+    Returns the (function, name prefix) pair registered under a generator name.
+    """
+    if name not in GENERATORS:
+        raise ValueError(f"Unknown graph generator '{name}', expected one of {sorted(GENERATORS)}")
+    return GENERATORS[name]
+
+
+def generated_graph_name(name, params, seed):
+    """
+    Names a generated graph after its generator, parameters and seed, following the naming of the
+    generated datasets, e.g. "GNM_1000_249750_0" or "ER_700_0.15_3".
+
+    Parameters appear in the order of the generator's signature.
+    """
+    function, prefix = resolve_generator(name)
+    values = [str(params[parameter]) for parameter in inspect.signature(function).parameters if parameter in params]
+    return "_".join([prefix] + values + [str(seed)])
+
+
+def generate_graph(name, params, seed=None):
+    """
+    Generates a graph.
+
+    Args:
+        name (str): Generator name, a key of GENERATORS.
+        params (dict): Keyword arguments of the generator function.
+        seed (int, optional): Seed of the numpy generator.
+
+    Returns:
+        tuple of numpy.ndarray: (indptr, indices) of the CSR structure.
+    """
+    function, _ = resolve_generator(name)
+    return function(**params, seed=seed)
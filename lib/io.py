@@ -0,0 +1,395 @@
+import mmap
+import numpy as np
+
+# Graphs are exchanged as symmetric CSR arrays: `indptr` (n + 1,) and `indices` (2m,), both int64 and
+# zero-based, with sorted neighbour lists and no self-loops or duplicate edges.
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def edges_to_csr(number_of_nodes, edges):
+    """
+    Builds a symmetric CSR adjacency structure from an undirected edge array.
+
+    Self-loops and duplicate edges (in either direction) are dropped.
+
+    Args:
+        number_of_nodes (int): Number of nodes in the graph.
+        edges (numpy.ndarray): Integer array of shape (m, 2) with zero-based endpoints.
+
+    Returns:
+        tuple of numpy.ndarray: (indptr, indices) of the CSR structure.
+    """
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+
+    rows = np.concatenate((edges[:, 0], edges[:, 1]))
+    cols = np.concatenate((edges[:, 1], edges[:, 0]))
+    keys = np.sort(rows * number_of_nodes + cols)
+    keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))] if len(keys) else keys
+
+    rows, indices = np.divmod(keys, number_of_nodes)
+    indptr = np.zeros(number_of_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=number_of_nodes), out=indptr[1:])
+
+    return indptr, indices
+
+
+def csr_to_edges(indptr, indices):
+    """
+    Recovers the undirected edge array (u < v) from a symmetric CSR structure.
+
+    Args:
+        indptr (numpy.ndarray): CSR row pointer of length n + 1.
+        indices (numpy.ndarray): CSR column indices.
+
+    Returns:
+        numpy.ndarray: Integer array of shape (m, 2).
+    """
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int64), np.diff(indptr))
+    upper = rows < indices
+    return np.stack((rows[upper], indices[upper]), axis=1)
+
+
+def networkx_to_csr(G):
+    """
+    Converts a networkx graph to CSR arrays, numbering nodes in iteration order.
+
+    Args:
+        G (networkx.Graph): The graph to convert.
+
+    Returns:
+        tuple of numpy.ndarray: (indptr, indices) of the CSR structure.
+    """
+    node_index = {node: i for i, node in enumerate(G.nodes)}
+    edges = np.fromiter(
+        (node_index[node] for edge in G.edges for node in edge[:2]),
+        dtype=np.int64,
+        count=2 * G.number_of_edges(),
+    )
+    return edges_to_csr(len(node_index), edges)
+
+
+def csr_to_networkx(indptr, indices):
+    """
+    Converts CSR arrays to a networkx graph with nodes 0..n-1.
+
+    Args:
+        indptr (numpy.ndarray): CSR row pointer of length n + 1.
+        indices (numpy.ndarray): CSR column indices.
+
+    Returns:
+        networkx.Graph: The equivalent graph.
+    """
+    import networkx as nx
+
+    G = nx.Graph()
+    G.add_nodes_from(range(len(indptr) - 1))
+    G.add_edges_from(csr_to_edges(indptr, indices).tolist())
+    return G
+
+
+def csr_to_tensor(indptr, indices, dtype=None, device="cpu", layout="dense"):
+    """
+    Materializes a CSR structure as a torch adjacency tensor without going through networkx or scipy.
+
+    Args:
+        indptr (numpy.ndarray): CSR row pointer of length n + 1.
+        indices (numpy.ndarray): CSR column indices.
+        dtype (torch.dtype, optional): Value type of the tensor. Defaults to torch.float16.
+        device (str or torch.device, optional): Target device. Defaults to "cpu".
+        layout (str, optional): "dense" or "csr". Defaults to "dense".
+
+    Returns:
+        torch.Tensor: The (n, n) adjacency matrix.
+    """
+    import torch
+    from lib.adjacency import build_adjacency
+
+    dtype = torch.float16 if dtype is None else dtype
+    return build_adjacency(len(indptr) - 1, csr_to_edges(indptr, indices), dtype=dtype, layout=layout, device=device)
+
+
+#### PARSING HELPERS ####
+
+
+def _map_file(path):
+    """
+    Memory-maps a file read-only, returning an empty bytes object for empty files.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _split_header(buffer, is_header):
+    """
+    Skips leading comment lines and returns (header_line, body_offset).
+
+    Args:
+        buffer (bytes or mmap.mmap): File contents.
+        is_header (callable): Predicate on a stripped line (bytes) telling whether it is the header.
+    """
+    offset = 0
+    while offset < len(buffer):
+        end = buffer.find(b"\n", offset)
+        end = len(buffer) if end == -1 else end
+        line = buffer[offset:end].strip()
+        offset = end + 1
+        if is_header(line):
+            return line, offset
+    raise ValueError("File does not contain a header line")
+
+
+def _strip_comment_lines(chunk, comment):
+    """
+    Removes whole lines starting with the comment marker from a chunk of text.
+    """
+    if comment not in chunk:
+        return chunk
+    return b"\n".join(
+        line for line in chunk.split(b"\n") if not line.lstrip().startswith(comment)
+    )
+
+
+def _parse_ints(buffer, start, comment, drop=b"", chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Parses every whitespace-separated integer after `start`, in newline-aligned chunks.
+
+    Args:
+        buffer (bytes or mmap.mmap): File contents.
+        start (int): Offset at which parsing starts.
+        comment (bytes): Lines starting with this marker are skipped.
+        drop (bytes, optional): Characters replaced by whitespace before parsing (e.g. b"e" for DIMACS).
+        chunk_bytes (int, optional): Approximate chunk size in bytes.
+
+    Returns:
+        numpy.ndarray: The parsed int64 values.
+    """
+    translation = bytes.maketrans(drop, b" " * len(drop)) if drop else None
+    values = []
+    while start < len(buffer):
+        end = min(start + chunk_bytes, len(buffer))
+        if end < len(buffer):
+            newline = buffer.find(b"\n", end)
+            end = len(buffer) if newline == -1 else newline + 1
+        chunk = _strip_comment_lines(buffer[start:end], comment)
+        if translation is not None:
+            chunk = chunk.translate(translation)
+        # np.fromstring parses a chunk of bare whitespace as [0], so blank chunks are skipped
+        if chunk.strip():
+            values.append(np.fromstring(chunk, dtype=np.int64, sep=" "))
+        start = end
+    if not values:
+        return np.empty(0, dtype=np.int64)
+    return np.concatenate(values)
+
+
+def _count_tokens_per_line(buffer, start, number_of_lines, comment):
+    """
+    Counts the integer tokens on each of the first `number_of_lines` non-comment lines after `start`.
+
+    Returns:
+        tuple: (counts, body_end) where body_end is the offset just after the last counted line.
+    """
+    if number_of_lines == 0:
+        return np.zeros(0, dtype=np.int64), start
+    body = np.frombuffer(buffer, dtype=np.uint8, offset=start) if len(buffer) > start else np.empty(0, np.uint8)
+    is_newline = body == ord("\n")
+    line_ends = np.flatnonzero(is_newline)
+
+    is_digit = (body >= ord("0")) & (body <= ord("9"))
+    token_starts = np.flatnonzero(is_digit & ~np.concatenate(([False], is_digit[:-1])))
+    token_lines = np.searchsorted(line_ends, token_starts)
+
+    line_starts = np.concatenate(([0], line_ends + 1))
+    first_chars = body[np.minimum(line_starts, len(body) - 1)] if len(body) else np.empty(0, np.uint8)
+    is_comment = first_chars == ord(comment)
+    if is_comment.any():
+        kept_lines = np.flatnonzero(~is_comment)
+        line_rank = np.full(len(line_starts), -1, dtype=np.int64)
+        line_rank[kept_lines] = np.arange(len(kept_lines))
+        token_lines = line_rank[token_lines]
+        token_lines = token_lines[token_lines >= 0]
+        last_line = kept_lines[number_of_lines - 1] if len(kept_lines) >= number_of_lines else None
+    else:
+        last_line = number_of_lines - 1
+
+    token_lines = token_lines[token_lines < number_of_lines]
+    counts = np.bincount(token_lines, minlength=number_of_lines)[:number_of_lines]
+    if last_line is None or last_line >= len(line_ends):
+        body_end = len(buffer)
+    else:
+        body_end = start + line_ends[last_line] + 1
+    return counts, body_end
+
+
+#### READERS ####
+
+
+def read_dimacs(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Reads a DIMACS graph (`.col` / `.clq`, "p edge n m" header and "e u v" lines).
+
+    Args:
+        path (str): Path to the DIMACS file.
+        chunk_bytes (int, optional): Approximate chunk size used while parsing.
+
+    Returns:
+        tuple of numpy.ndarray: (indptr, indices) of the CSR structure.
+    """
+    buffer = _map_file(path)
+    header, offset = _split_header(buffer, lambda line: line.startswith(b"p"))
+    number_of_nodes = int(header.split()[2])
+    edges = _parse_ints(buffer, offset, comment=b"c", drop=b"e", chunk_bytes=chunk_bytes)
+    return edges_to_csr(number_of_nodes, edges.reshape(-1, 2) - 1)
+
+
+def read_metis(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Reads an unweighted METIS graph ("n m" header followed by one 1-based neighbour list per node).
+
+    Args:
+        path (str): Path to the METIS file.
+        chunk_bytes (int, optional): Approximate chunk size used while parsing.
+
+    Returns:
+        tuple of numpy.ndarray: (indptr, indices) of the CSR structure.
+    """
+    buffer = _map_file(path)
+    header, offset = _split_header(
+        buffer, lambda line: len(line) > 0 and not line.startswith(b"%")
+    )
+    fields = header.split()
+    number_of_nodes = int(fields[0])
+    if len(fields) > 2 and int(fields[2]) != 0:
+        raise ValueError("Weighted METIS graphs are not supported")
+
+    counts, body_end = _count_tokens_per_line(buffer, offset, number_of_nodes, comment="%")
+    indices = _parse_ints(buffer[:body_end], offset, comment=b"%", chunk_bytes=chunk_bytes) - 1
+    rows = np.repeat(np.arange(number_of_nodes, dtype=np.int64), counts)
+    return edges_to_csr(number_of_nodes, np.stack((rows, indices), axis=1))
+
+
+def read_edge_list(path, number_of_nodes=None, comment="#", chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Reads a plain whitespace-separated, zero-based "u v" edge list.
+
+    Args:
+        path (str): Path to the edge list.
+        number_of_nodes (int, optional): Number of nodes. Defaults to the largest endpoint plus one.
+        comment (str, optional): Lines starting with this marker are skipped. Defaults to "#".
+        chunk_bytes (int, optional): Approximate chunk size used while parsing.
+
+    Returns:
+        tuple of numpy.ndarray: (indptr, indices) of the CSR structure.
+    """
+    buffer = _map_file(path)
+    edges = _parse_ints(buffer, 0, comment=comment.encode(), chunk_bytes=chunk_bytes).reshape(-1, 2)
+    if number_of_nodes is None:
+        number_of_nodes = int(edges.max()) + 1 if len(edges) else 0
+    return edges_to_csr(number_of_nodes, edges)
+
+
+#### WRITERS ####
+
+
+def format_lines(tokens, indptr, prefix=b""):
+    """
+    Formats non-negative integers as text lines without a per-token Python loop.
+
+    Line j holds `tokens[indptr[j]:indptr[j + 1]]` separated by single spaces, preceded by `prefix`.
+    Empty lines are emitted as a bare newline (plus prefix).
+
+    Args:
+        tokens (numpy.ndarray): Flat array of non-negative integers.
+        indptr (numpy.ndarray): Line boundaries into `tokens`, of length number_of_lines + 1.
+        prefix (bytes, optional): Bytes written at the start of every line.
+
+    Returns:
+        bytes: The formatted text.
+    """
+    tokens = np.asarray(tokens, dtype=np.int64)
+    indptr = np.asarray(indptr, dtype=np.int64)
+    number_of_lines = len(indptr) - 1
+    tokens_per_line = np.diff(indptr)
+
+    digits = np.ones(len(tokens), dtype=np.int64)
+    power = 10
+    while len(tokens) and power <= tokens.max():
+        digits += tokens >= power
+        power *= 10
+
+    # Every token is followed by one separator byte; empty lines still need their newline
+    token_bytes = digits + 1
+    token_offsets = np.concatenate(([0], np.cumsum(token_bytes)))
+    line_bytes = len(prefix) + token_offsets[indptr[1:]] - token_offsets[indptr[:-1]]
+    line_bytes[tokens_per_line == 0] += 1
+    line_starts = np.concatenate(([0], np.cumsum(line_bytes)))
+
+    buffer = np.full(line_starts[-1], ord(" "), dtype=np.uint8)
+    if prefix:
+        prefix_array = np.frombuffer(prefix, dtype=np.uint8)
+        buffer[line_starts[:-1, None] + np.arange(len(prefix))] = prefix_array
+    buffer[line_starts[1:] - 1] = ord("\n")
+
+    token_lines = np.repeat(np.arange(number_of_lines), tokens_per_line)
+    token_starts = (
+        line_starts[token_lines] + len(prefix) + token_offsets[:-1] - token_offsets[indptr[token_lines]]
+    )
+
+    remaining = tokens.copy()
+    for place in range(int(digits.max()) if len(tokens) else 0):
+        has_digit = digits > place
+        buffer[(token_starts + digits - 1 - place)[has_digit]] = ord("0") + remaining[has_digit] % 10
+        remaining //= 10
+
+    return buffer.tobytes()
+
+
+def write_dimacs(path, indptr, indices):
+    """
+    Writes a graph in DIMACS edge format with 1-based node ids.
+
+    Args:
+        path (str): Output path.
+        indptr (numpy.ndarray): CSR row pointer of length n + 1.
+        indices (numpy.ndarray): CSR column indices.
+    """
+    edges = csr_to_edges(indptr, indices)
+    with open(path, "wb") as f:
+        f.write(f"p edge {len(indptr) - 1} {len(edges)}\n".encode())
+        f.write(format_lines((edges + 1).ravel(), np.arange(0, 2 * len(edges) + 1, 2), prefix=b"e "))
+
+
+def write_metis(path, indptr, indices):
+    """
+    Writes a graph in unweighted METIS format with 1-based node ids.
+
+    Args:
+        path (str): Output path.
+        indptr (numpy.ndarray): CSR row pointer of length n + 1.
+        indices (numpy.ndarray): CSR column indices.
+    """
+    with open(path, "wb") as f:
+        f.write(f"{len(indptr) - 1} {len(indices) // 2}\n".encode())
+        f.write(format_lines(np.asarray(indices) + 1, indptr))
+
+
+def write_edge_list(path, indptr, indices):
+    """
+    Writes a graph as a plain zero-based "u v" edge list.
+
+    Args:
+        path (str): Output path.
+        indptr (numpy.ndarray): CSR row pointer of length n + 1.
+        indices (numpy.ndarray): CSR column indices.
+    """
+    edges = csr_to_edges(indptr, indices)
+    with open(path, "wb") as f:
+        f.write(format_lines(edges.ravel(), np.arange(0, 2 * len(edges) + 1, 2)))
+
+
+READERS = {"dimacs": read_dimacs, "metis": read_metis, "edge_list": read_edge_list}
+WRITERS = {"dimacs": write_dimacs, "metis": write_metis, "edge_list": write_edge_list}
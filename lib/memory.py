@@ -0,0 +1,163 @@
+import os
+import re
+import sys
+import logging
+import resource
+import subprocess
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+RU_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+# Phases being measured, innermost last. Resetting a peak counter for an inner phase would hide the
+# peak an enclosing phase reached before it, so enclosing phases fold the counters in first.
+_active_phases = []
+
+
+def peak_rss_resettable():
+    """
+    Tells whether the peak RSS of this process can be reset, which Linux allows through
+    /proc/self/clear_refs. Without it, peaks are those of the whole process lifetime.
+    """
+    return os.path.exists("/proc/self/clear_refs") and os.access("/proc/self/clear_refs", os.W_OK)
+
+
+def peak_rss_bytes():
+    """
+    Returns the peak resident set size of this process since its start or the last reset.
+    """
+    if os.path.exists("/proc/self/status"):
+        with open("/proc/self/status") as f:
+            match = re.search(r"VmHWM:\s+(\d+) kB", f.read())
+        if match:
+            return int(match.group(1)) * 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RU_MAXRSS_UNIT
+
+
+def children_peak_rss_bytes():
+    """
+    Returns the largest peak RSS of any terminated and waited-for child process, e.g. ReduMIS.
+    """
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * RU_MAXRSS_UNIT
+
+
+def _cuda_torch():
+    # Only a process that imported torch can have CUDA allocations, so torch is not imported here: solvers
+    # without it (ReduMIS, CP-SAT, Gurobi) start without paying for the import
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        return torch
+    return None
+
+
+def _read_peaks():
+    peaks = {"peak_rss_bytes": peak_rss_bytes()}
+    if tracemalloc.is_tracing():
+        peaks["peak_python_bytes"] = tracemalloc.get_traced_memory()[1]
+    torch = _cuda_torch()
+    if torch is not None:
+        peaks["peak_torch_bytes"] = torch.cuda.max_memory_allocated()
+    return peaks
+
+
+def _fold_peaks(peaks):
+    for phase in _active_phases:
+        for key, value in peaks.items():
+            phase[key] = max(phase.get(key, 0), value)
+
+
+def _reset_peaks():
+    if peak_rss_resettable():
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    torch = _cuda_torch()
+    if torch is not None:
+        torch.cuda.reset_peak_memory_stats()
+
+
+@contextmanager
+def memory_phase(phase, accounting):
+    """
+    Measures the memory peaks of the code run inside the context and stores them in accounting[phase].
+
+    Recorded values, in bytes:
+        - peak_rss_bytes: peak resident set size of this process during the phase (of the whole
+          process lifetime where the peak cannot be reset, see `peak_rss_resettable`).
+        - rss_before_bytes: resident set size when the phase started.
+        - peak_python_bytes: peak of the Python heap, when tracemalloc is tracing (python -X tracemalloc
+          or PYTHONTRACEMALLOC=1; tracing slows allocation-heavy code down).
+        - peak_torch_bytes: peak of the torch CUDA allocator, when torch is imported and CUDA is
+          available. CPU tensors are part of the RSS.
+        - children_peak_rss_bytes: peak RSS of the child processes waited for during the phase, as
+          child rusage reports it. On Linux it includes the RSS of this process when the child was
+          forked, so external programs are better measured with `communicate_with_peak_rss`. The kernel
+          only keeps the largest child peak of the process lifetime, so this is None when no child
+          of the phase exceeded the children of earlier phases.
+
+    Phases may be nested; an enclosing phase still accounts for the peaks of the phases it contains.
+
+    Args:
+        phase (str): Name of the phase, e.g. "setup" or "solve".
+        accounting (dict): Dictionary receiving the measurements under `phase`.
+    """
+    _fold_peaks(_read_peaks())
+    children_before = children_peak_rss_bytes()
+    _reset_peaks()
+    rss_before = peak_rss_bytes() if peak_rss_resettable() else None
+
+    peaks = {}
+    _active_phases.append(peaks)
+    try:
+        yield
+    finally:
+        _fold_peaks(_read_peaks())
+        _active_phases.pop()
+        children_after = children_peak_rss_bytes()
+        accounting[phase] = dict(
+            peaks,
+            rss_before_bytes=rss_before,
+            children_peak_rss_bytes=children_after if children_after > children_before else None,
+        )
+        logger.info("Memory of phase %s: %s", phase, accounting[phase])
+
+
+def process_peak_rss_bytes(pid):
+    """
+    Returns the peak RSS of a running process since its last exec, or None once it has exited or
+    where /proc is unavailable.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            match = re.search(r"VmHWM:\s+(\d+) kB", f.read())
+    except OSError:
+        return None
+    return int(match.group(1)) * 1024 if match else None
+
+
+def communicate_with_peak_rss(process, interval=0.05):
+    """
+    Collects the output of a subprocess.Popen process until it exits, while sampling its peak RSS.
+
+    Child rusage (see `memory_phase`) also counts the memory of the parent the child was forked from,
+    so the peak of an external program is read from its own /proc entry instead, every `interval`
+    seconds. Growth in the last interval before the process exits is missed.
+
+    Returns:
+        tuple: (stdout, stderr, peak_rss_bytes) with the outputs of `Popen.communicate`, the peak
+            being None where /proc is unavailable.
+    """
+    peak = None
+    while True:
+        sample = process_peak_rss_bytes(process.pid)
+        if sample is not None:
+            peak = max(peak or 0, sample)
+        try:
+            stdout, stderr = process.communicate(timeout=interval)
+            return stdout, stderr, peak
+        except subprocess.TimeoutExpired:
+            pass
@@ -0,0 +1,359 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import logging
+import platform
+import tempfile
+import itertools
+
+import numpy
+import torch
+from scipy.stats import mannwhitneyu
+from torch.func import vmap
+
+from lib.adjacency import graph_edge_index, build_adjacency, AdjacencyOperator
+from lib.dataset_generation import load_gpickle
+from lib.graph_generators import erdos_renyi_graph
+from lib.io import csr_to_networkx
+from lib.scheduler import available_cores
+from lib.tuning import maximal_independent_rows
+from solvers.pCQO_MIS import compute_derived_matrices, three_term_grad_function, velocity_update_function
+
+logger = logging.getLogger(__name__)
+
+# Directory of the stored baselines, one JSON file per machine fingerprint
+DEFAULT_BASELINE_DIRECTORY = "perf_baselines"
+
+# Parameter grids of the suite. The quick grid is meant for a smoke check, the default one for baselines.
+DEFAULT_GRID = {"n": [200, 800], "density": [0.05, 0.5], "batch_size": [32, 256]}
+QUICK_GRID = {"n": [200], "density": [0.05, 0.5], "batch_size": [32]}
+
+
+def machine_fingerprint():
+    """
+    Describes the machine and software stack timings depend on.
+
+    Returns:
+        tuple: (fingerprint, description): a short hex digest identifying the machine, and the dict it
+            is computed from (CPU model, usable cores, torch threads and library versions).
+    """
+    processor = platform.processor()
+    if os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    processor = line.split(":", 1)[1].strip()
+                    break
+
+    description = {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "processor": processor,
+        "cores": len(available_cores()),
+        "torch_threads": torch.get_num_threads(),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "numpy": numpy.__version__,
+        "cuda": torch.cuda.get_device_name(0) if torch.cuda.is_available() else None,
+    }
+    fingerprint = hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()[:12]
+    return fingerprint, description
+
+
+def baseline_path(fingerprint, directory=DEFAULT_BASELINE_DIRECTORY):
+    """
+    Returns the path of the baseline file of a machine fingerprint.
+    """
+    return os.path.join(directory, f"{fingerprint}.json")
+
+
+def synthetic_graph(n, density, seed=0):
+    """
+    Returns an Erdos-Renyi graph G(n, density) with integer nodes 0..n-1.
+    """
+    return csr_to_networkx(*erdos_renyi_graph(n, density, seed=seed))
+
+
+def gradient_step_benchmark(G, batch_size, device):
+    """
+    One pCQO-MIS MGD step as the solver takes it: the vmapped three-term gradient through the
+    adjacency operators, the vmapped momentum update and the box constraint, in float16.
+    """
+    derived_matrices = compute_derived_matrices(G, device)
+    adjacency = AdjacencyOperator(derived_matrices["adjacency"])
+    adjacency_comp = AdjacencyOperator(derived_matrices["adjacency_comp"])
+    per_sample_grad_funct = vmap(three_term_grad_function, in_dims=(0, None, None, 0, 0))
+    per_sample_velocity_update_funct = vmap(velocity_update_function, in_dims=(0, 0, 0, 0, 0))
+
+    n = G.number_of_nodes()
+    row_value = lambda value: torch.full((batch_size,), value, dtype=torch.float16, device=device)
+    gamma, gamma_prime, learning_rate, momentum = row_value(n), row_value(1), row_value(1e-4), row_value(0.9)
+    X = torch.rand((batch_size, n), dtype=torch.float16, device=device)
+    velocity = torch.zeros_like(X)
+
+    def step():
+        gradients = per_sample_grad_funct(X, adjacency, adjacency_comp, gamma, gamma_prime)
+        new_X, _ = per_sample_velocity_update_funct(X, gradients, velocity, momentum, learning_rate)
+        return new_X.clamp(min=0, max=1)
+
+    return step
+
+
+def is_check_benchmark(G, batch_size, device):
+    """
+    The batched maximal independent set check of the solver on a batch of binary points.
+    """
+    adjacency = compute_derived_matrices(G, device)["adjacency"]
+    X = (torch.rand((batch_size, G.number_of_nodes()), device=device) < 0.5).to(torch.float16)
+    return lambda: maximal_independent_rows(X, adjacency)
+
+
+def restart_benchmark(G, batch_size, device):
+    """
+    The solver's restart: every row of the batch is redrawn from the degree-based initializer.
+    """
+    mean_vector = compute_derived_matrices(G, device)["mean_vector"]
+    X = torch.empty((batch_size, G.number_of_nodes()), dtype=torch.float16, device=device)
+
+    def restart():
+        for batch in range(batch_size):
+            torch.normal(out=X[batch, :], mean=mean_vector, std=2.25)
+
+    return restart
+
+
+def adjacency_build_benchmark(G, batch_size, device):
+    """
+    The float16 adjacency matrices of a graph and its complement, built from its edge index.
+    """
+    number_of_nodes, edges = graph_edge_index(G)
+
+    def build():
+        build_adjacency(number_of_nodes, edges, dtype=torch.float16, device=device)
+        build_adjacency(number_of_nodes, edges, dtype=torch.float16, device=device, complement=True)
+
+    return build
+
+
+def dataset_load_benchmark(G, batch_size, device, directory):
+    """
+    Loading a graph from a .gpickle file, as the benchmark runner does.
+    """
+    path = os.path.join(directory, f"graph_{G.number_of_nodes()}_{G.number_of_edges()}.gpickle")
+    with open(path, "wb") as f:
+        pickle.dump(G, f, pickle.HIGHEST_PROTOCOL)
+    return lambda: load_gpickle(path)
+
+
+# Benchmark name -> (setup function returning the callable to time, whether it depends on the batch size)
+BENCHMARKS = {
+    "gradient_step": (gradient_step_benchmark, True),
+    "is_check": (is_check_benchmark, True),
+    "restart": (restart_benchmark, True),
+    "adjacency_build": (adjacency_build_benchmark, False),
+    "dataset_load": (dataset_load_benchmark, False),
+}
+
+
+def case_name(benchmark, n, density, batch_size=None):
+    """
+    Returns the identifier of a benchmark case, e.g. "gradient_step[n=200,density=0.05,batch_size=32]".
+    """
+    parameters = f"n={n},density={density}" + (f",batch_size={batch_size}" if batch_size is not None else "")
+    return f"{benchmark}[{parameters}]"
+
+
+def suite_cases(grid=DEFAULT_GRID, benchmarks=None):
+    """
+    Expands a parameter grid into benchmark cases. Benchmarks that do not depend on the batch size
+    get one case per (n, density).
+
+    Args:
+        grid (dict, optional): Lists of "n", "density" and "batch_size" values. Defaults to DEFAULT_GRID.
+        benchmarks (list of str, optional): Names of the benchmarks to include. Defaults to all of BENCHMARKS.
+
+    Returns:
+        list of dict: Cases with their "name", "benchmark", "n", "density" and "batch_size" (None when unused).
+    """
+    cases = []
+    for benchmark in benchmarks or BENCHMARKS:
+        if benchmark not in BENCHMARKS:
+            raise ValueError(f"Unknown benchmark '{benchmark}', expected one of {list(BENCHMARKS)}")
+        batch_sizes = grid["batch_size"] if BENCHMARKS[benchmark][1] else [None]
+        for n, density, batch_size in itertools.product(grid["n"], grid["density"], batch_sizes):
+            cases.append(
+                {
+                    "name": case_name(benchmark, n, density, batch_size),
+                    "benchmark": benchmark,
+                    "n": n,
+                    "density": density,
+                    "batch_size": batch_size,
+                }
+            )
+    return cases
+
+
+def _synchronizer(device):
+    return torch.cuda.synchronize if str(device).startswith("cuda") else lambda: None
+
+
+def calibrate(function, min_sample_time=0.05, device="cpu"):
+    """
+    Warms a callable up and returns how many calls a timing sample needs to last at least
+    `min_sample_time`, which keeps timer resolution and per-call noise out of fast benchmarks.
+    """
+    synchronize = _synchronizer(device)
+    synchronize()
+    start = time.perf_counter()
+    function()
+    synchronize()
+    return max(1, int(min_sample_time / max(time.perf_counter() - start, 1e-9)))
+
+
+def time_sample(function, calls, device="cpu"):
+    """
+    Returns the mean seconds per call of `calls` consecutive calls of a callable.
+    """
+    synchronize = _synchronizer(device)
+    synchronize()
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    synchronize()
+    return (time.perf_counter() - start) / calls
+
+
+def run_suite(cases, samples=11, min_sample_time=0.05, device="cpu", seed=0):
+    """
+    Runs benchmark cases on synthetic graphs.
+
+    Samples are taken round-robin over the cases rather than case after case, so slow drifts of the
+    machine (frequency scaling, background load) spread over all cases instead of biasing a few.
+
+    Args:
+        cases (list of dict): Cases from `suite_cases`.
+        samples (int, optional): Timing samples per case. Defaults to 11.
+        min_sample_time (float, optional): Minimum duration of a sample in seconds. Defaults to 0.05.
+        device (str, optional): Torch device. Defaults to "cpu".
+        seed (int, optional): Seed of the synthetic graphs and random inputs. Defaults to 0.
+
+    Returns:
+        dict: Results document with the machine "fingerprint" and "machine" description, the run
+            settings and, per case name, its parameters, timing "samples" and "median" in seconds.
+    """
+    fingerprint, description = machine_fingerprint()
+    graphs = {}
+    functions = {}
+    times = {case["name"]: [] for case in cases}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for case in cases:
+            key = (case["n"], case["density"])
+            if key not in graphs:
+                graphs[key] = synthetic_graph(case["n"], case["density"], seed=seed)
+
+            torch.manual_seed(seed)
+            setup, _ = BENCHMARKS[case["benchmark"]]
+            if case["benchmark"] == "dataset_load":
+                function = setup(graphs[key], case["batch_size"], device, directory)
+            else:
+                function = setup(graphs[key], case["batch_size"], device)
+            functions[case["name"]] = (function, calibrate(function, min_sample_time, device))
+
+        for _ in range(samples):
+            for case in cases:
+                function, calls = functions[case["name"]]
+                times[case["name"]].append(time_sample(function, calls, device))
+
+    results = {}
+    for case in cases:
+        results[case["name"]] = dict(case, samples=times[case["name"]], median=float(numpy.median(times[case["name"]])))
+        logger.info("%s: median %.6f s over %s samples", case["name"], results[case["name"]]["median"], samples)
+
+    return {
+        "fingerprint": fingerprint,
+        "machine": description,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "device": str(device),
+        "samples": samples,
+        "min_sample_time": min_sample_time,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def write_results(results, path):
+    """
+    Writes a results document of `run_suite` as JSON, replacing the file atomically.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    os.replace(temporary_path, path)
+
+
+def read_results(path):
+    """
+    Reads a results document written by `write_results`.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def compare(baseline, current, alpha=0.01, threshold=0.1):
+    """
+    Compares two results documents case by case.
+
+    A case is a regression when its current samples are significantly slower than the baseline ones
+    (one-sided Mann-Whitney U test at level `alpha`) and its median slowed down by more than
+    `threshold`; improvements are detected symmetrically. Requiring both keeps statistically
+    significant but negligible shifts, and large but noisy ones, from being flagged.
+
+    Args:
+        baseline (dict): Results document of the reference run.
+        current (dict): Results document of the run under test.
+        alpha (float, optional): Significance level. Defaults to 0.01.
+        threshold (float, optional): Minimum relative change of the median. Defaults to 0.1.
+
+    Returns:
+        list of dict: One entry per case present in both documents, with the baseline and current
+            medians, their "ratio" (current / baseline), the two one-sided "p_slower" and "p_faster"
+            values and a "status" of "regression", "improvement" or "unchanged".
+    """
+    if baseline["fingerprint"] != current["fingerprint"]:
+        logger.warning(
+            "Comparing runs of different machines (%s and %s)", baseline["fingerprint"], current["fingerprint"]
+        )
+
+    comparisons = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        ratio = result["median"] / reference["median"]
+        p_slower = mannwhitneyu(result["samples"], reference["samples"], alternative="greater").pvalue
+        p_faster = mannwhitneyu(result["samples"], reference["samples"], alternative="less").pvalue
+
+        if p_slower < alpha and ratio > 1 + threshold:
+            status = "regression"
+        elif p_faster < alpha and ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+
+        comparisons.append(
+            {
+                "name": name,
+                "baseline_median": reference["median"],
+                "current_median": result["median"],
+                "ratio": ratio,
+                "p_slower": float(p_slower),
+                "p_faster": float(p_faster),
+                "status": status,
+            }
+        )
+    return comparisons
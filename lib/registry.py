@@ -0,0 +1,45 @@
+import importlib
+
+# Solver classes by name, with the module defining them. Modules are imported on first use, so a run
+# pays for (and needs the optional dependencies of) only the solvers it uses: torch for the pCQO-MIS
+# and dataless network solvers, ortools for CP-SAT and gurobipy for Gurobi. ReduMIS needs neither.
+SOLVER_CLASSES = {
+    "pCQOMIS_MGD": "solvers.pCQO_MIS",
+    "pCQOMIS_anneal": "solvers.pCQO_MIS_anneal",
+    "CPSATMIS": "solvers.CPSAT_MIS",
+    "GurobiMIS": "solvers.Gurobi_MIS",
+    "ReduMIS": "solvers.KaMIS",
+    "ReduMISPortfolio": "solvers.KaMIS",
+    "DNNMIS": "solvers.previous_work_MIS_dNNs",
+}
+
+# Top-level packages of this repository, whose import errors are bugs rather than missing dependencies
+_LOCAL_PACKAGES = ("lib", "solvers", "models")
+
+
+def solver_names():
+    """
+    Returns the names of the registered solver classes, sorted.
+    """
+    return sorted(SOLVER_CLASSES)
+
+
+def resolve_solver_class(class_name):
+    """
+    Imports and returns the solver class registered under `class_name`.
+
+    Raises:
+        ValueError: If no solver is registered under `class_name`.
+        ImportError: If the solver's module needs a package that is not installed.
+    """
+    if class_name not in SOLVER_CLASSES:
+        raise ValueError(f"Unknown solver class '{class_name}', expected one of {solver_names()}")
+    try:
+        module = importlib.import_module(SOLVER_CLASSES[class_name])
+    except ModuleNotFoundError as error:
+        if error.name is None or error.name.split(".")[0] in _LOCAL_PACKAGES:
+            raise
+        raise ImportError(
+            f"Solver class '{class_name}' requires the '{error.name.split('.')[0]}' package, which is not installed"
+        ) from error
+    return getattr(module, class_name)
@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import hashlib
+import logging
+
+import numpy
+
+logger = logging.getLogger(__name__)
+
+
+def job_key(job):
+    """
+    Identifies a job by its graph, solver configuration and seed, independently of its position in
+    the spec, so a restarted or reordered benchmark recognizes work it has already done.
+
+    Returns:
+        str: Hex digest of the job identity.
+    """
+    identity = {
+        "graph": job["graph"]["path"],
+        "solver": job["solver"]["name"],
+        "class": job["solver"]["class"],
+        "params": job["solver"]["params"],
+        "seed": job["seed"],
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def to_json(value):
+    """
+    Converts solution data (numpy arrays and scalars, torch tensors, nested containers) to JSON types.
+    """
+    if isinstance(value, dict):
+        return {str(key): to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    # Tensors only exist once a solver imported torch, which is not worth importing for this check
+    torch = sys.modules.get("torch")
+    if isinstance(value, numpy.ndarray) or (torch is not None and isinstance(value, torch.Tensor)):
+        return value.tolist()
+    if isinstance(value, numpy.generic):
+        return value.item()
+    return value
+
+
+class ResultStore:
+    """
+    Append-only JSONL store of finished benchmark jobs.
+
+    Each line records one job: its key (see `job_key`), a description of the job and its solution
+    rows. Lines are flushed and fsynced as soon as a job completes, so an interrupted benchmark loses
+    at most the job that was running, and a restarted one skips every job already in the store.
+    A partially written last line, left by a kill mid-write, is discarded when the store is opened.
+
+    Parameters:
+        path (str): Path of the JSONL file. Created, along with its directory, if missing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.records = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Missing line terminator")
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning("Discarding incomplete record at byte %s of %s", valid_bytes, self.path)
+                    break
+                self.records[record["key"]] = record
+                valid_bytes += len(line)
+
+        if valid_bytes < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+    def __contains__(self, job):
+        return job_key(job) in self.records
+
+    def __len__(self):
+        return len(self.records)
+
+    def append(self, job, rows):
+        """
+        Durably records the solution rows of a finished job.
+
+        Args:
+            job (dict): Job built by `lib.benchmark_spec.build_jobs`.
+            rows (list of dict): Solution rows returned by `lib.benchmark_runner.run_job`.
+        """
+        record = {
+            "key": job_key(job),
+            "graph": job["graph"],
+            "solver": job["solver"],
+            "seed": job["seed"],
+            "rows": to_json(rows),
+        }
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.records[record["key"]] = record
+
+    def rows(self, jobs):
+        """
+        Returns the stored solution rows of the given jobs, in job order. Jobs without a record are skipped.
+        """
+        rows = []
+        for job in jobs:
+            record = self.records.get(job_key(job))
+            if record is not None:
+                rows.extend(record["rows"])
+        return rows
+
+
+def summary_table(rows, graphs, summary_columns=("size", "time")):
+    """
+    Builds the wide summary table: one row per graph, one column per (solution method, statistic).
+
+    Args:
+        rows (list of dict): Solution rows with "solution_method", "dataset_name", "data" and "time_taken".
+        graphs (list of dict): Graph descriptors from `lib.benchmark_spec.list_spec_graphs`, giving the row order.
+        summary_columns (list of str, optional): Statistics reported per solution method: "size", "time",
+            or any other key of the solution data (e.g. "steps_to_best_MIS"). Defaults to size and time.
+
+    Returns:
+        pandas.DataFrame: The summary table. Methods missing on a graph are left empty, and methods run
+            with several seeds report their mean (see `lib.statistics` for the spread).
+    """
+    import pandas
+
+    methods = list(dict.fromkeys(row["solution_method"] for row in rows))
+    by_graph = {}
+    for row in rows:
+        by_graph.setdefault(row["dataset_name"], {}).setdefault(row["solution_method"], []).append(row)
+
+    column_suffixes = {"size": " Solution Size", "time": " Solution Time"}
+    table_headers = ["Dataset Name"]
+    for column in summary_columns:
+        suffix = column_suffixes.get(column, f" {column}")
+        table_headers.extend([method + suffix for method in methods])
+
+    table_data = []
+    for graph in graphs:
+        graph_rows = by_graph.get(graph["name"])
+        if not graph_rows:
+            continue
+        table_row = [graph["name"]]
+        for column in summary_columns:
+            for method in methods:
+                values = [
+                    row["time_taken"] if column == "time" else row["data"].get(column)
+                    for row in graph_rows.get(method, [])
+                ]
+                values = [value for value in values if value is not None]
+                if not values:
+                    table_row.append(None)
+                elif len(values) == 1:
+                    table_row.append(values[0])
+                else:
+                    table_row.append(sum(values) / len(values))
+        table_data.append(table_row)
+
+    return pandas.DataFrame(table_data, columns=table_headers)
+
+
+def write_summary(rows, graphs, path, summary_columns=("size", "time")):
+    """
+    Writes the summary table of `summary_table` to a CSV file, replacing it atomically.
+    """
+    temporary_path = f"{path}.tmp"
+    summary_table(rows, graphs, summary_columns).to_csv(temporary_path)
+    os.replace(temporary_path, path)
@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger(__name__)
+
+# Thread pool sizes read by OpenMP and MKL when they initialize, e.g. when a solver first imports torch
+THREAD_ENVIRONMENT_VARIABLES = ("OMP_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+def available_cores():
+    """
+    Returns the CPU cores this process may run on.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class SerialScheduler:
+    """
+    Runs benchmark jobs one after another in the current process.
+
+    A scheduler takes the list of jobs built from a benchmark spec, executes each one with
+    `run_job(job)` and hands every result to `on_result(job, result)` as soon as it is available.
+    After `run` returns, `makespan` holds the wall time in seconds from the first job's start to
+    the last job's completion.
+    """
+
+    def __init__(self):
+        self.makespan = None
+
+    def run(self, jobs, run_job, on_result):
+        """
+        Executes the jobs in order.
+
+        Args:
+            jobs (list of dict): Jobs built by `lib.benchmark_spec.build_jobs`.
+            run_job (callable): Function executing a single job and returning its result.
+            on_result (callable): Called with (job, result) after each job completes.
+        """
+        start = time.perf_counter()
+        for job in jobs:
+            on_result(job, run_job(job))
+        self.makespan = time.perf_counter() - start
+
+
+def _run_pinned(run_job, job, cores):
+    """
+    Runs a job in a pool worker restricted to `cores`, with OpenMP, MKL and torch using one thread per core.
+
+    Jobs whose solvers do not use torch never import it: the thread count is passed through the
+    environment to libraries loaded by the job, and set on torch only if an earlier job of this
+    worker already imported it.
+    """
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+    for variable in THREAD_ENVIRONMENT_VARIABLES:
+        os.environ[variable] = str(len(cores))
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(len(cores))
+    return run_job(job)
+
+
+class ProcessPoolScheduler:
+    """
+    Runs benchmark jobs concurrently in a pool of worker processes, pinned to disjoint sets of cores.
+
+    Every job reserves `job["threads"]` cores (capped at the machine size). Jobs are started in order
+    as soon as enough cores are free; when the next job does not fit, later jobs that do fit are
+    started first so no core idles while work is pending. A running job's worker is pinned to its
+    cores with `os.sched_setaffinity` and uses one OpenMP, MKL and torch intra-op thread per core, so
+    the machine is saturated without being oversubscribed. CP-SAT and Gurobi receive the same count
+    through their "threads" parameter.
+
+    Parameters:
+        cores (int or list of int, optional): Number of cores to use, or the explicit core ids.
+            Defaults to every core available to this process.
+        start_method (str, optional): multiprocessing start method of the workers. "spawn" keeps
+            workers free of the parent's torch and OpenMP thread pools. Defaults to "spawn".
+    """
+
+    def __init__(self, cores=None, start_method="spawn"):
+        available = available_cores()
+        if cores is None:
+            self.cores = available
+        elif isinstance(cores, int):
+            self.cores = available[:cores]
+        else:
+            self.cores = sorted(cores)
+        self.start_method = start_method
+        self.makespan = None
+
+    def _job_cores(self, job):
+        return min(max(int(job.get("threads", 1)), 1), len(self.cores))
+
+    def run(self, jobs, run_job, on_result):
+        """
+        Executes the jobs across the pool. Results are reported in completion order.
+
+        Args:
+            jobs (list of dict): Jobs built by `lib.benchmark_spec.build_jobs`.
+            run_job (callable): Picklable module-level function executing a single job.
+            on_result (callable): Called with (job, result) in this process after each job completes.
+        """
+        pending = list(jobs)
+        free_cores = list(self.cores)
+        running = {}
+
+        context = multiprocessing.get_context(self.start_method)
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=len(self.cores), mp_context=context) as executor:
+            while pending or running:
+                # First-fit packing of pending jobs onto the free cores
+                for job in list(pending):
+                    needed = self._job_cores(job)
+                    if needed <= len(free_cores):
+                        cores, free_cores = free_cores[:needed], free_cores[needed:]
+                        future = executor.submit(_run_pinned, run_job, job, cores)
+                        running[future] = (job, cores)
+                        pending.remove(job)
+                        logger.info("Started job %s on cores %s", job.get("id"), cores)
+                    if not free_cores:
+                        break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job, cores = running.pop(future)
+                    free_cores = sorted(free_cores + cores)
+                    on_result(job, future.result())
+
+        self.makespan = time.perf_counter() - start
+        logger.info("Ran %s jobs on %s cores, makespan %.3f s", len(jobs), len(self.cores), self.makespan)
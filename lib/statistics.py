@@ -0,0 +1,266 @@
+import os
+import math
+import logging
+
+import numpy
+import pandas
+
+logger = logging.getLogger(__name__)
+
+# Distinct graph sizes a memory fit needs: two points always fit a line exactly, so a third is the
+# least that can contradict the power law
+MEMORY_SCALING_MIN_SIZES = 3
+
+
+def bootstrap_ci(values, statistic=numpy.mean, confidence=0.95, resamples=10000, seed=0):
+    """
+    Computes a percentile bootstrap confidence interval of a statistic.
+
+    Args:
+        values (array-like): Observations, e.g. the solution sizes of one solver on one graph over seeds.
+        statistic (callable, optional): Reduction applied along axis 1 of the resampled matrix. Defaults to numpy.mean.
+        confidence (float, optional): Confidence level. Defaults to 0.95.
+        resamples (int, optional): Number of bootstrap resamples. Defaults to 10000.
+        seed (int, optional): Seed of the resampling. Defaults to 0.
+
+    Returns:
+        tuple: (low, high) bounds of the interval; both equal the single value for one observation.
+    """
+    values = numpy.asarray(values, dtype=float)
+    if len(values) < 2:
+        return (float(values[0]), float(values[0])) if len(values) else (math.nan, math.nan)
+
+    rng = numpy.random.default_rng(seed)
+    samples = values[rng.integers(0, len(values), size=(resamples, len(values)))]
+    estimates = statistic(samples, axis=1)
+    tail = (1 - confidence) / 2 * 100
+    low, high = numpy.percentile(estimates, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def row_value(row, column):
+    """
+    Returns the "time" (time taken) or a solution data entry of a solution row.
+    """
+    return row["time_taken"] if column == "time" else row["data"].get(column)
+
+
+def seed_statistics(rows, columns=("size", "time"), confidence=0.95):
+    """
+    Aggregates repeated runs (seeds) of every solution method on every graph.
+
+    Args:
+        rows (list of dict): Solution rows with "solution_method", "dataset_name", "data" and "time_taken".
+        columns (list of str, optional): Statistics to aggregate: "size", "time" or any solution data key.
+        confidence (float, optional): Level of the bootstrap confidence intervals. Defaults to 0.95.
+
+    Returns:
+        pandas.DataFrame: One row per (graph, solution method) with the number of runs and the mean,
+            median and bootstrap confidence interval of the mean of each column.
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault((row["dataset_name"], row["solution_method"]), []).append(row)
+
+    table = []
+    for (graph_name, method), group in groups.items():
+        entry = {"Dataset Name": graph_name, "Solution Method": method, "Runs": len(group)}
+        for column in columns:
+            values = [row_value(row, column) for row in group if row_value(row, column) is not None]
+            low, high = bootstrap_ci(values, confidence=confidence)
+            entry[f"{column} mean"] = numpy.mean(values) if values else math.nan
+            entry[f"{column} median"] = numpy.median(values) if values else math.nan
+            entry[f"{column} ci low"] = low
+            entry[f"{column} ci high"] = high
+        table.append(entry)
+    return pandas.DataFrame(table)
+
+
+def trajectories(rows):
+    """
+    Collects the anytime trajectory of every run: the (time, size) points of its checkpoints, of the
+    incumbent trajectory some solvers record, and of its final solution, in time order.
+
+    Returns:
+        dict: Maps (graph, solver, seed) to a list of (time, size) pairs.
+    """
+    runs = {}
+    for row in rows:
+        points = runs.setdefault((row["dataset_name"], row.get("solver", row["solution_method"]), row.get("seed")), [])
+        points.extend(tuple(point) for point in row["data"].get("trajectory", []))
+        if row["data"].get("size") is not None and row["time_taken"] is not None:
+            points.append((row["time_taken"], row["data"]["size"]))
+    return {run: sorted(points) for run, points in runs.items()}
+
+
+def time_to_target(rows, target_fraction=1.0):
+    """
+    Computes the time every run needed to reach a target solution size.
+
+    The target of a graph is `target_fraction` times the largest size any run found on it.
+
+    Returns:
+        pandas.DataFrame: One row per (graph, solver, seed) with the target and the time to reach it,
+            infinite when the run never reached it.
+    """
+    runs = trajectories(rows)
+    best_sizes = {}
+    for (graph_name, _, _), points in runs.items():
+        best_sizes[graph_name] = max([best_sizes.get(graph_name, 0)] + [size for _, size in points])
+
+    table = []
+    for (graph_name, solver, seed), points in runs.items():
+        target = target_fraction * best_sizes[graph_name]
+        reached = [time for time, size in points if size >= target]
+        table.append(
+            {
+                "Dataset Name": graph_name,
+                "Solver": solver,
+                "Seed": seed,
+                "Target": target,
+                "Time to Target": min(reached) if reached else math.inf,
+            }
+        )
+    return pandas.DataFrame(table)
+
+
+def performance_profile(time_to_target_table):
+    """
+    Computes Dolan-More performance profiles from times to target.
+
+    The performance of a solver on a graph is its median time to target over seeds. Its ratio to the
+    best solver's on that graph is r, and the profile rho(tau) of a solver is the fraction of graphs on
+    which r <= tau. Graphs no solver reached the target on are left out.
+
+    Args:
+        time_to_target_table (pandas.DataFrame): Output of `time_to_target`.
+
+    Returns:
+        pandas.DataFrame: Profile values indexed by tau, one column per solver.
+    """
+    performance = (
+        time_to_target_table.groupby(["Dataset Name", "Solver"])["Time to Target"].median().unstack("Solver")
+    )
+    best = performance.min(axis=1)
+    performance = performance[numpy.isfinite(best)]
+    ratios = performance.div(best[numpy.isfinite(best)].clip(lower=1e-12), axis=0)
+
+    finite_ratios = ratios.to_numpy()[numpy.isfinite(ratios.to_numpy())]
+    taus = numpy.unique(numpy.concatenate(([1.0], finite_ratios)))
+    profile = pandas.DataFrame(
+        {solver: [(ratios[solver] <= tau).mean() for tau in taus] for solver in ratios.columns},
+        index=pandas.Index(taus, name="tau"),
+    )
+    return profile
+
+
+def memory_table(rows):
+    """
+    Collects the memory peaks of every run (see `lib.memory.memory_phase`).
+
+    Returns:
+        pandas.DataFrame: One row per (graph, solver, seed) with the graph's "Nodes" and "Edges", one
+            "<phase> <measure>" column per recorded phase and measure, and the run's "Host Peak Bytes":
+            the peak RSS of the solve phase plus that of the solver's external process, if any.
+    """
+    table = {}
+    for row in rows:
+        if "memory" not in row:
+            continue
+        run = (row["dataset_name"], row.get("solver", row["solution_method"]), row.get("seed"))
+        entry = {
+            "Dataset Name": run[0],
+            "Solver": run[1],
+            "Seed": run[2],
+            "Nodes": row.get("number_of_nodes"),
+            "Edges": row.get("number_of_edges"),
+        }
+        for phase, measures in row["memory"].items():
+            for measure, value in measures.items():
+                entry[f"{phase} {measure}"] = value
+        solve_peak = row["memory"].get("solve", {}).get("peak_rss_bytes") or 0
+        process_peak = row["memory"].get("process", {}).get("peak_rss_bytes") or 0
+        entry["Host Peak Bytes"] = solve_peak + process_peak
+        table[run] = entry
+    return pandas.DataFrame(list(table.values()))
+
+
+def physical_memory_bytes():
+    """
+    Returns the physical memory of the machine, or None where the OS does not report it.
+    """
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def memory_scaling(memory, host_budget_bytes=None, device_budget_bytes=None):
+    """
+    Fits how the memory of every solver grows with the number of nodes and predicts the largest
+    instance that fits a memory budget.
+
+    Host memory is modelled as base + c * n^b: each run's growth over the RSS it started its setup
+    with is fitted, and the base is the lowest such starting RSS (interpreter and libraries). Torch
+    CUDA allocator peaks are modelled as c * n^b. The exponent and coefficient are a least-squares
+    fit in log-log space, so e.g. dense pCQO-MIS matrices show b close to 2. Fits need runs on at least
+    MEMORY_SCALING_MIN_SIZES distinct graph sizes, and fits whose exponent is not positive (memory not
+    growing with the graph, e.g. dominated by allocator reuse) are dropped with a warning.
+
+    Args:
+        memory (pandas.DataFrame): Output of `memory_table`.
+        host_budget_bytes (int, optional): Host memory budget. Defaults to the physical memory.
+        device_budget_bytes (int, optional): CUDA memory budget. Defaults to the memory of device 0.
+
+    Returns:
+        pandas.DataFrame: One row per (solver, resource) with a valid fit: the "Exponent", "Coefficient",
+            "Base Bytes", "Budget Bytes", "Largest Feasible Nodes" and the number of distinct "Sizes" fitted.
+    """
+    if host_budget_bytes is None:
+        host_budget_bytes = physical_memory_bytes()
+    if device_budget_bytes is None and "solve peak_torch_bytes" in memory:
+        import torch
+
+        if torch.cuda.is_available():
+            device_budget_bytes = torch.cuda.get_device_properties(0).total_memory
+
+    table = []
+    for solver, runs in memory.groupby("Solver") if len(memory) else []:
+        starts = runs.get("setup rss_before_bytes", pandas.Series(0.0, index=runs.index)).astype(float).fillna(0.0)
+        resources = [("host", runs["Host Peak Bytes"], starts, host_budget_bytes)]
+        if "solve peak_torch_bytes" in runs:
+            resources.append(("device", runs["solve peak_torch_bytes"], starts * 0, device_budget_bytes))
+
+        for resource, peaks, starts, budget in resources:
+            base = float(starts.min())
+            nodes = runs["Nodes"].astype(float).to_numpy()
+            growth = peaks.astype(float).to_numpy() - starts.to_numpy()
+            valid = numpy.isfinite(growth) & (growth > 0) & (nodes > 0)
+            sizes = len(numpy.unique(nodes[valid]))
+            if sizes < MEMORY_SCALING_MIN_SIZES:
+                continue
+
+            exponent, log_coefficient = numpy.polyfit(numpy.log(nodes[valid]), numpy.log(growth[valid]), 1)
+            if exponent <= 0:
+                logger.warning(
+                    "Skipping the %s memory fit of %s: exponent %.3f over %s sizes, memory does not grow with n",
+                    resource, solver, exponent, sizes,
+                )
+                continue
+            coefficient = math.exp(log_coefficient)
+            largest = None
+            if budget is not None and budget > base:
+                largest = int(((budget - base) / coefficient) ** (1 / exponent))
+            table.append(
+                {
+                    "Solver": solver,
+                    "Resource": resource,
+                    "Exponent": exponent,
+                    "Coefficient": coefficient,
+                    "Base Bytes": base,
+                    "Budget Bytes": budget,
+                    "Largest Feasible Nodes": largest,
+                    "Sizes": sizes,
+                }
+            )
+    return pandas.DataFrame(table)
@@ -0,0 +1,45 @@
+import sys
+import time
+
+# Timings every solver reports, in seconds, all on one monotonic clock (time.perf_counter_ns) whose
+# origin is the start of the solver's timer (see lib.Solver.Solver._start_timer):
+#   - setup_time: converting the graph and building the model, matrices or input files.
+#   - solve_time: the search itself, from the end of the setup to the end of the timer.
+#   - time_to_best: when the best solution reported was found, or None where the solver does not
+#     observe it. Setup counts, so solvers with a costly setup do not look faster than they are.
+#   - total_time: from the start to the end of the timer.
+TIMING_KEYS = ("setup_time", "solve_time", "time_to_best", "total_time")
+
+NANOSECONDS = 1e9
+
+
+def empty_timings():
+    """
+    Returns the timings of a solver whose timer has not run, with every key of TIMING_KEYS set to None.
+    """
+    return dict.fromkeys(TIMING_KEYS)
+
+
+def synchronize(device):
+    """
+    Waits for the work queued on a CUDA device, so that a clock read afterwards includes it. Does nothing
+    for CPU devices, None, or when torch was never imported (no device work can then be pending).
+
+    Args:
+        device (torch.device or str, optional): Device the solver computes on.
+    """
+    torch = sys.modules.get("torch")
+    if device is None or torch is None:
+        return
+    device = torch.device(device)
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+def elapsed_seconds(start_ns, end_ns=None):
+    """
+    Returns the seconds between two time.perf_counter_ns readings, the second defaulting to now.
+    """
+    if end_ns is None:
+        end_ns = time.perf_counter_ns()
+    return (end_ns - start_ns) / NANOSECONDS
@@ -0,0 +1,279 @@
+import json
+import math
+import logging
+import itertools
+
+import torch
+
+from lib.adjacency import graph_edge_index, build_adjacency
+
+logger = logging.getLogger(__name__)
+
+# Keys of a tuned parameters file, as read by pCQOMIS_MGD ("params_file") and cpp_impl/pcqomis.cpp
+PARAMS_FILE_KEYS = ("learning_rate", "momentum", "gamma", "gamma_prime", "steps_per_batch")
+
+
+def complement_max_degree(G):
+    """
+    Returns the maximum degree of the complement of G, n - 1 - (minimum degree of G), without building it.
+    """
+    return G.number_of_nodes() - 1 - min((degree for _, degree in G.degree()), default=0)
+
+
+def feasible_gamma(G, gamma_prime):
+    """
+    Returns the edge penalty gamma = 2 + gamma' * Delta(G'), which satisfies the bound
+    gamma > 1 + gamma' * Delta(G') under which every local minimum of pCQO is a maximal IS.
+    """
+    return 2 + gamma_prime * complement_max_degree(G)
+
+
+def maximal_independent_rows(X, adjacency):
+    """
+    Tests which rows of X binarize to a maximal independent set.
+
+    A row is an IS when no selected node has a selected neighbour, and a maximal one when every
+    unselected node has a selected neighbour: exactly the binarized points that a projected gradient
+    step of -1 + (nA - A_hat) X leaves unchanged.
+
+    Args:
+        X (torch.Tensor): (rows, n) matrix of points in [0, 1]^n. Nonzero entries count as selected.
+        adjacency (torch.Tensor): Dense symmetric (n, n) adjacency matrix.
+
+    Returns:
+        tuple: (maximal, sizes) boolean and integer tensors of shape (rows,).
+    """
+    masks = X.bool()
+    selected_neighbours = (masks.to(adjacency.dtype) @ adjacency) > 0
+    maximal = ~(masks & selected_neighbours).any(dim=1) & (masks | selected_neighbours).all(dim=1)
+    return maximal, masks.sum(dim=1)
+
+
+def batched_mgd_convergence(
+    adjacency, adjacency_comp, X, learning_rate, momentum, gamma, gamma_prime, max_steps, check_interval=1
+):
+    """
+    Runs pCQO momentum gradient descent from every row of X until each row reaches a maximal IS.
+
+    Every row carries its own hyperparameters, so many configurations and initializations advance
+    together in one batched product per step. Converged rows are frozen, and the convergence test
+    runs every `check_interval` steps (and before the first step), so reported step counts are
+    rounded up to a multiple of it.
+
+    Args:
+        adjacency (torch.Tensor): Dense (n, n) adjacency matrix.
+        adjacency_comp (torch.Tensor): Dense (n, n) adjacency matrix of the complement graph.
+        X (torch.Tensor): (rows, n) initial points.
+        learning_rate, momentum, gamma, gamma_prime (torch.Tensor): (rows,) hyperparameters.
+        max_steps (int): Steps after which rows that have not converged are abandoned.
+        check_interval (int, optional): Steps between convergence tests. Defaults to 1.
+
+    Returns:
+        tuple: (steps, sizes) integer tensors of shape (rows,): the step at which each row was found
+            to be a maximal IS and its size, or -1 and 0 for rows that did not converge.
+    """
+    rows = X.shape[0]
+    X = X.clone()
+    velocity = torch.zeros_like(X)
+    learning_rate, momentum, gamma, gamma_prime = (
+        value.to(X).unsqueeze(1) for value in (learning_rate, momentum, gamma, gamma_prime)
+    )
+
+    steps = torch.full((rows,), -1, dtype=torch.int64, device=X.device)
+    sizes = torch.zeros(rows, dtype=torch.int64, device=X.device)
+    active = torch.ones(rows, dtype=torch.bool, device=X.device)
+
+    for step in range(max_steps + 1):
+        if step % check_interval == 0 or step == max_steps:
+            maximal, row_sizes = maximal_independent_rows(X, adjacency)
+            converged = active & maximal
+            steps[converged] = step
+            sizes[converged] = row_sizes[converged]
+            active &= ~maximal
+            if not active.any():
+                break
+        if step == max_steps:
+            break
+
+        gradient = -1 + gamma * (X @ adjacency) - gamma_prime * (X @ adjacency_comp)
+        velocity = torch.where(active.unsqueeze(1), momentum * velocity + learning_rate * gradient, velocity)
+        X = torch.where(active.unsqueeze(1), (X - velocity).clamp(0, 1), X)
+
+    return steps, sizes
+
+
+def seeded_initializations(seeds, number_of_nodes, device="cpu"):
+    """
+    Returns one uniform float32 initialization per seed, each drawn as torch.rand(n) after
+    torch.manual_seed(seed). The dtype is explicit, since pCQOMIS_MGD changes torch's default dtype.
+    """
+    X = torch.empty((len(seeds), number_of_nodes), dtype=torch.float32, device=device)
+    for row, seed in enumerate(seeds):
+        torch.manual_seed(seed)
+        X[row] = torch.rand(number_of_nodes, dtype=torch.float32)
+    return X
+
+
+def evaluate_configurations(G, configurations, seeds, max_steps, check_interval=1, device="cpu"):
+    """
+    Evaluates hyperparameter configurations on one graph, all seeds of all configurations in one batch.
+
+    Args:
+        G (networkx.Graph): The graph.
+        configurations (list of dict): learning_rate, momentum, gamma and gamma_prime of each configuration.
+        seeds (list of int): Seeds of the initializations every configuration is run from.
+        max_steps (int): Step limit per initialization.
+        check_interval (int, optional): Steps between convergence tests. Defaults to 1.
+        device (str, optional): Torch device. Defaults to "cpu".
+
+    Returns:
+        list of dict: Per configuration, the "steps" and "sizes" lists of its initializations
+            (-1 and 0 when an initialization did not converge).
+    """
+    number_of_nodes, edges = graph_edge_index(G)
+    adjacency = build_adjacency(number_of_nodes, edges, dtype=torch.float32, device=device)
+    adjacency_comp = build_adjacency(number_of_nodes, edges, dtype=torch.float32, device=device, complement=True)
+
+    X = seeded_initializations(seeds, number_of_nodes, device).repeat(len(configurations), 1)
+    row_values = {
+        name: torch.tensor(
+            [configuration[name] for configuration in configurations], dtype=torch.float32, device=device
+        ).repeat_interleave(len(seeds))
+        for name in ("learning_rate", "momentum", "gamma", "gamma_prime")
+    }
+
+    steps, sizes = batched_mgd_convergence(
+        adjacency, adjacency_comp, X, max_steps=max_steps, check_interval=check_interval, **row_values
+    )
+    steps = steps.view(len(configurations), -1).tolist()
+    sizes = sizes.view(len(configurations), -1).tolist()
+    return [{"steps": steps[k], "sizes": sizes[k]} for k in range(len(configurations))]
+
+
+def configuration_grid(learning_rates, momentums, gamma_primes, gammas=None):
+    """
+    Builds the candidate configurations. Without explicit gammas, each configuration's gamma is left
+    as None, to be set to the feasibility bound of the tuning graphs (see `feasible_gamma`).
+    """
+    return [
+        {"learning_rate": learning_rate, "momentum": momentum, "gamma": gamma, "gamma_prime": gamma_prime}
+        for learning_rate, momentum, gamma_prime, gamma in itertools.product(
+            learning_rates, momentums, gamma_primes, gammas or [None]
+        )
+    ]
+
+
+def successive_halving(
+    graphs, configurations, seeds, max_steps, initial_graphs=1, eta=2, check_interval=1, device="cpu"
+):
+    """
+    Races hyperparameter configurations over a sample of graphs with successive halving.
+
+    Round r evaluates the surviving configurations on the first initial_graphs * eta^r graphs (results
+    on graphs of earlier rounds are reused), scores each configuration by its mean MIS size over all
+    initializations relative to the best configuration on each graph, with initializations that did
+    not converge scoring 0, and keeps the best 1/eta of them. Racing stops when one configuration is
+    left or every graph has been used.
+
+    Args:
+        graphs (list of networkx.Graph): Tuning graphs, in the order they enter the race.
+        configurations (list of dict): Candidates from `configuration_grid`.
+        seeds (list of int): Seeds of the batched initializations each configuration runs per graph.
+        max_steps (int): Step limit per initialization.
+        initial_graphs (int, optional): Graphs in the first round. Defaults to 1.
+        eta (int, optional): Elimination factor. Defaults to 2.
+        check_interval (int, optional): Steps between convergence tests. Defaults to 1.
+        device (str, optional): Torch device. Defaults to "cpu".
+
+    Returns:
+        tuple: (survivors, configurations, evaluations): the indices of the surviving configurations,
+            best first, the configurations with their gamma resolved, and the per-graph results of each
+            configuration index.
+    """
+    # A gamma satisfying the feasibility bound on every tuning graph
+    largest_complement_degree = max(complement_max_degree(G) for G in graphs)
+    configurations = [
+        dict(configuration, gamma=2 + configuration["gamma_prime"] * largest_complement_degree)
+        if configuration.get("gamma") is None
+        else configuration
+        for configuration in configurations
+    ]
+
+    survivors = list(range(len(configurations)))
+    evaluations = {index: [] for index in survivors}
+    number_of_graphs = 0
+    round_index = 0
+
+    while True:
+        sample_size = min(len(graphs), initial_graphs * eta**round_index)
+        for G in graphs[number_of_graphs:sample_size]:
+            results = evaluate_configurations(
+                G, [configurations[index] for index in survivors], seeds, max_steps, check_interval, device
+            )
+            for index, result in zip(survivors, results):
+                evaluations[index].append(result)
+        number_of_graphs = sample_size
+
+        scores = {index: 0.0 for index in survivors}
+        for graph_index in range(number_of_graphs):
+            means = {index: sum(evaluations[index][graph_index]["sizes"]) / len(seeds) for index in survivors}
+            best = max(means.values()) or 1
+            for index in survivors:
+                scores[index] += means[index] / best / number_of_graphs
+
+        # Ties go to the configuration converging in fewer steps
+        survivors.sort(key=lambda index: (-scores[index], max_converged_steps(evaluations[index])))
+        logger.info(
+            "Round %s: %s configurations on %s graphs, best score %.4f",
+            round_index, len(survivors), number_of_graphs, scores[survivors[0]],
+        )
+
+        if len(survivors) == 1 or number_of_graphs == len(graphs):
+            return survivors, configurations, evaluations
+        survivors = survivors[: math.ceil(len(survivors) / eta)]
+        round_index += 1
+
+
+def max_converged_steps(results):
+    """
+    Returns the largest number of steps any converged initialization needed, over per-graph results.
+    """
+    return max((step for result in results for step in result["steps"]), default=-1)
+
+
+def tune(graphs, configurations, seeds, max_steps, initial_graphs=1, eta=2, check_interval=1, device="cpu"):
+    """
+    Selects pCQO-MIS hyperparameters for a dataset by successive halving.
+
+    The steps per batch T is set to the largest number of steps the winning configuration needed to
+    reach a maximal IS from any initialization.
+
+    Returns:
+        dict: The tuned parameters, with the keys of PARAMS_FILE_KEYS.
+    """
+    survivors, configurations, evaluations = successive_halving(
+        graphs, configurations, seeds, max_steps, initial_graphs, eta, check_interval, device
+    )
+    best = survivors[0]
+    steps = max_converged_steps(evaluations[best])
+    return dict(configurations[best], steps_per_batch=max(steps, check_interval))
+
+
+def write_params_file(params, path):
+    """
+    Writes tuned parameters as a flat JSON object, readable by `read_params_file` and the C++ engine.
+    """
+    with open(path, "w") as f:
+        json.dump({key: params[key] for key in PARAMS_FILE_KEYS if key in params}, f, indent=4)
+        f.write("\n")
+
+
+def read_params_file(path):
+    """
+    Reads a parameters file written by `write_params_file`.
+
+    Returns:
+        dict: Solver parameters, e.g. learning_rate, momentum, gamma, gamma_prime and steps_per_batch.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
@@ -2,15 +2,18 @@ import torch
 import torch.nn as nn
 from torch import Tensor
 
-import networkx as nx
+import numpy as np
 from networkx import MultiGraph
 
+from lib.adjacency import graph_edge_index
+
 
 class ConstrainedElemMultiply(nn.Module):
     def __init__(self, in_features, out_features, lower_bound=0, upper_bound=1):
         super().__init__()
         self.in_features, self.out_features = in_features, out_features
-        self.weight = torch.nn.Parameter(torch.Tensor(in_features, out_features))
+        # One weight per feature, multiplied elementwise
+        self.weight = torch.nn.Parameter(torch.empty(in_features))
         self.lower_bound = lower_bound
         self.upper_bound = upper_bound
 
@@ -36,59 +39,52 @@ def generate_theta_weight(graph: MultiGraph, graph_order: int) -> nn.Parameter:
     return nn.Parameter(theta_weight)
 
 
-def generate_second_layer_weight(
-    graph: MultiGraph, graph_order: int, graph_size: int, graph_c_size: int
-) -> nn.Parameter:
-    second_layer_weight = torch.zeros(
-        graph_order, graph_order + graph_size + graph_c_size
-    )
-
-    for i in range(graph_order):
-        second_layer_weight[i, i] = 1.0
-
-    for i, pair in enumerate(graph.edges):
-        second_layer_weight[pair[0], graph_order + i] = 1.0
-        second_layer_weight[pair[1], graph_order + i] = 1.0
-
-    complement_graph: MultiGraph = nx.complement(graph)
-    for i, pair in enumerate(complement_graph.edges):
-        second_layer_weight[pair[0], graph_order + graph_size + i] = 1.0
-        second_layer_weight[pair[1], graph_order + graph_size + i] = 1.0
-    del complement_graph
-
-    return nn.Parameter(second_layer_weight.t().to_dense())
+def simple_edges(edges: np.ndarray) -> np.ndarray:
+    """
+    Returns the distinct edges (u < v) of an edge index array, without self-loops.
+    """
+    edges = np.sort(edges, axis=1)
+    return np.unique(edges[edges[:, 0] != edges[:, 1]], axis=0)
 
 
-def generate_second_layer_biases(
-    graph_order: int, graph_size: int, graph_c_size: int
-) -> nn.Parameter:
-    second_layer_biases = torch.zeros(graph_order + graph_size + graph_c_size)
+def pairwise_relu_sum(x: Tensor) -> Tensor:
+    """
+    Computes the sum of ReLU(x_u + x_v - 1) over all pairs u < v along the last dimension, in
+    O(n log n) time and O(n) memory.
 
-    second_layer_biases[0:graph_order] = -0.5
-    second_layer_biases[graph_order:] = -1.0
+    With the values sorted, the partners v of u with x_u + x_v > 1 form a suffix found by binary search,
+    so the sum over ordered pairs is sum_u [c_u (x_u - 1) + S_u], with c_u the suffix length and S_u its
+    sum. Removing the diagonal u = v and halving gives the sum over pairs. The gradient is that of the
+    ReLU terms: x_u receives the number of partners with x_u + x_v > 1.
+    """
+    n = x.shape[-1]
+    values, _ = torch.sort(x, dim=-1)
+    suffix_sums = torch.flip(torch.cumsum(torch.flip(values, (-1,)), dim=-1), (-1,))
+    suffix_sums = torch.cat((suffix_sums, torch.zeros_like(suffix_sums[..., :1])), dim=-1)
+    starts = torch.searchsorted(values.detach(), (1 - values).detach(), right=True)
+    ordered_pairs = ((n - starts) * (values - 1) + torch.gather(suffix_sums, -1, starts)).sum(dim=-1)
+    return (ordered_pairs - torch.relu(2 * x - 1).sum(dim=-1)) / 2
 
-    return nn.Parameter(second_layer_biases)
 
+class DatalessNet(nn.Module):
+    """
+    Dataless neural network of the MIS problem, f(theta) = -sum_v ReLU(theta_v - T)
+    + gamma sum_{uv in E} ReLU(theta_u + theta_v - 1) - T sum_{uv not in E} ReLU(theta_u + theta_v - 1).
 
-def generate_third_layer_weight(
-    graph_order: int, graph_size: int, graph_c_size: int
-) -> nn.Parameter:
-    third_layer_weight = torch.zeros(graph_order + graph_size + graph_c_size)
-
-    third_layer_weight[0:graph_order] = -1.0
-    third_layer_weight[graph_order : graph_order + graph_size] = graph_order
-    third_layer_weight[graph_order + graph_size :] = -1.0
-
-    return nn.Parameter(third_layer_weight.to_dense())
+    The second layer of the network has one ReLU unit per node, edge and non-edge. They are computed
+    from the edge index instead of a dense (n + m + m') x n weight matrix: the edge terms by gathering
+    theta at both endpoints, and the non-edge terms as the sum over all pairs (see `pairwise_relu_sum`)
+    minus the edge terms. Memory is O(n + m) and the loss and gradients are those of the dense layers.
 
+    A (batch_size, n) initial `theta` trains a batch of independent networks at once: the forward pass
+    then returns one output per row.
+    """
 
-class DatalessNet(nn.Module):
-    def __init__(self, graph: MultiGraph) -> None:
+    def __init__(self, graph: MultiGraph, theta: Tensor = None) -> None:
         super().__init__()
-        G = nx.relabel.convert_node_labels_to_integers(graph)
-        self.graph_order = len(G.nodes)
-        self.graph_size = len(G.edges)
-        self.graph_c_size = len(nx.complement(G).edges)
+        self.graph_order, edges = graph_edge_index(graph)
+        self.graph_size = len(edges)
+        self.graph_c_size = self.graph_order * (self.graph_order - 1) // 2 - len(simple_edges(edges))
 
         self.temperature = 0.5
 
@@ -98,48 +94,42 @@ class DatalessNet(nn.Module):
             in_features=self.graph_order, out_features=self.graph_order
         )
         with torch.no_grad():
-            self.theta_layer.weight = generate_theta_weight(G, self.graph_order)
-
-        self.layer2 = nn.Linear(
-            in_features=self.graph_order,
-            out_features=self.graph_order + self.graph_size + self.graph_c_size,
-        )
-        self.layer2.weight = generate_second_layer_weight(
-            G, self.graph_order, self.graph_size, self.graph_c_size
-        )
-        self.layer2.bias = generate_second_layer_biases(
-            self.graph_order, self.graph_size, self.graph_c_size
-        )
-        self.layer2.requires_grad_(False)
+            if theta is None:
+                self.theta_layer.weight = generate_theta_weight(graph, self.graph_order)
+            else:
+                self.theta_layer.weight = nn.Parameter(theta.clone())
 
-        self.layer3 = nn.Linear(
-            in_features=self.graph_order + self.graph_size + self.graph_c_size,
-            out_features=1,
-            bias=False,
-        )
+        # Edge endpoints, as listed by the graph, and the distinct edges the complement excludes when the
+        # graph has self-loops or parallel edges
+        self.register_buffer("edge_index", torch.as_tensor(edges.T.copy()))
+        self.register_buffer("simple_edge_index", None)
+        if len(simple_edges(edges)) != len(edges):
+            self.simple_edge_index = torch.as_tensor(simple_edges(edges).T.copy())
 
-        self.layer3.weight = generate_third_layer_weight(
-            self.graph_order, self.graph_size, self.graph_c_size
-        )
-        self.layer3.requires_grad_(False)
+        # Weight of the edge terms, gamma once `update_gamma` is called
+        self.edge_weight = self.graph_order
 
         self.activation = nn.ReLU()
 
-    def forward(self, x: Tensor) -> Tensor:
-        with torch.no_grad():
-            self.layer3.weight.data[self.graph_order + self.graph_size :] = (
-                -1.0 * self.temperature
-            )
-            self.layer2.bias.data[0 : self.graph_order] = -1.0 * self.temperature
+    def _edge_relu_sum(self, nodes_first: Tensor, edge_index: Tensor) -> Tensor:
+        # Gathering whole rows of the (n, batch) layout is much faster than indexing the last dimension
+        pairs = nodes_first.index_select(0, edge_index[0]) + nodes_first.index_select(0, edge_index[1])
+        return self.activation(pairs - 1).sum(dim=0)
 
+    def forward(self, x: Tensor) -> Tensor:
         x = self.theta_layer(x)
-        x = self.activation(self.layer2(x))
-        x = self.layer3(x)
+        nodes_first = x.reshape(-1, self.graph_order).T.contiguous()
+
+        node_terms = self.activation(x - self.temperature).sum(dim=-1)
+        edge_terms = self._edge_relu_sum(nodes_first, self.edge_index).reshape(x.shape[:-1])
+        simple_edge_terms = edge_terms
+        if self.simple_edge_index is not None:
+            simple_edge_terms = self._edge_relu_sum(nodes_first, self.simple_edge_index).reshape(x.shape[:-1])
+        complement_terms = pairwise_relu_sum(x) - simple_edge_terms
+
+        x = -node_terms + self.edge_weight * edge_terms - self.temperature * complement_terms
 
         return x
 
     def update_gamma(self) -> None:
-        with torch.no_grad():
-            self.layer3.weight.data[
-                self.graph_order : self.graph_order + self.graph_size
-            ] = self.gamma
+        self.edge_weight = self.gamma
@@ -0,0 +1,6 @@
+from lib.cli import main
+
+# Command line entry point: python pcqo_mis.py solve <graph> --solver <name> (see lib/cli.py)
+
+if __name__ == "__main__":
+    main()
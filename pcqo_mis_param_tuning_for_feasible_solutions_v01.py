@@ -11,6 +11,8 @@ import torch
 import networkx as nx
 import numpy as np
 
+from lib.tuning import batched_mgd_convergence, seeded_initializations
+
 # We need to set the following parameters:
 
 '''
@@ -31,7 +33,7 @@ Note that to obtain the best results from pCQO, we need more tuning.
 - From our Theorem, we have $\gamma > 1 +\gamma'\Delta(G')$ where $\Delta(G')$ is the maximum degree of the compliment graph $G'$. As such, here, we set $\gamma = 2+\Delta(G')$.
 - Select $\beta$. Below, we use $\beta = 0.9$.
 - Iterate over a set of step sizes. For example, $\alpha \in \{0.0001, 0.0005, 0.0001, 0.005, 0.01, 0.05\}$.
-- At each $\alpha$, we use multiple initilizations. We use a while loop to record the number of steps needed for convergence in under a limit or $T$. Below, we use $T=500$.
+- At each $\alpha$, we use multiple initilizations. We record the number of steps needed for convergence in under a limit or $T$. Below, we use $T=500$. All ($\alpha$, initialization) pairs run as the rows of a single batched MGD computation, and each row stops once it reaches a maximal IS.
 - Log the best MIS, $T$, and number of times we get a feasible solution over the number of initializations.
 - Then, select the smallest $T$ based on the largest MIS and the ratio of obtaining solutions.
 - Set $\eta \geq 2.5$ for the variance of the Gaussian distribution used to obtain the initializations of the next batch. This is not needed here.
@@ -111,25 +113,6 @@ adjacency_matrix_comp = nx.adjacency_matrix(complement_G)
 adjacency_matrix_dense_comp = adjacency_matrix_comp.todense()
 adjacency_matrix_tensor_comp = torch.tensor(adjacency_matrix_dense_comp, dtype=torch.float32)
 
-### Efficient MIS Checking 2: Directly check if a binarized X is a maximal IS without checking whether it is an IS first...
-
-def MIS_checker_efficient_3(X_torch, adjacency_matrix_tensor, adjacency_matrix_tensor_comp):
-  n = X_torch.shape[0]
-  # binarized X
-  X_torch_binarized = X_torch.bool().float()
-  # if for some gradient update, we are still at the boundary, then we have maximal IS
-  X_torch_binarized_update = X_torch_binarized - 0.1*(-torch.ones(n) + (n*adjacency_matrix_tensor)@X_torch_binarized)
-  # Projection to [0,1]
-  X_torch_binarized_update[X_torch_binarized_update>=1] =1
-  X_torch_binarized_update[X_torch_binarized_update<=0] =0
-  if torch.equal(X_torch_binarized, X_torch_binarized_update):
-    # we have a maximal IS:
-    MIS = torch.nonzero(X_torch_binarized).squeeze()
-    # Exit the function with True
-    return True, MIS
-  # If not a maximal IS, Exit the function with False
-  return False, None
-
 ### Here, we set gamma, gamma', and beta.
 
 gamma_c = 1
@@ -142,61 +125,42 @@ beta = 0.8
 
 alpha_set = [0.000001, 0.000005,0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5]
 
-### optimization loop using MGD to obtain T
-
-
-def opt_loop_MGD(seed, adjacency_matrix_tensor, adjacency_matrix_tensor_comp,gamma, gamma_c, alpha, beta):
-  n = adjacency_matrix_tensor.shape[0]
-  torch.manual_seed(seed)
-  input_tensor = torch.rand(n)
-  input_velocity = torch.zeros_like(input_tensor)
-
-  Checker,MIS = MIS_checker_efficient_3(input_tensor, adjacency_matrix_tensor, adjacency_matrix_tensor_comp)
-  iteration_T = 0
-  while Checker == False:
-
-      iteration_T += 1
-
-      # Compute the gradient
-      gradient = -torch.ones(n) + (gamma*adjacency_matrix_tensor - gamma_c*adjacency_matrix_tensor_comp)@input_tensor
-
-      input_velocity = beta*input_velocity + alpha*gradient
-
-      input_tensor = torch.clamp(input_tensor - input_velocity, 0, 1)
-
-      Checker,MIS = MIS_checker_efficient_3(input_tensor, adjacency_matrix_tensor, adjacency_matrix_tensor_comp)
-
-      if Checker:
-        print(iteration_T, Checker, len(MIS))
-        break
-
-      if iteration_T > 500:
-        iteration_T = 0
-        MIS = [0]
-        break
-
-  return [iteration_T, Checker, len(MIS)]
-
-###
+### Batched sweep over alpha_set x seeds to obtain T
 
 number_of_initializations = 5
+T_limit = 500
+
+# Steps between convergence tests. Larger intervals make the sweep cheaper, with T rounded up to a multiple of it.
+check_interval = 1
+
+# Row a * number_of_initializations + seed starts from the torch.rand(n) drawn after torch.manual_seed(seed)
+# and runs MGD with step size alpha_set[a]
+seeds = list(range(number_of_initializations))
+number_of_rows = len(alpha_set) * number_of_initializations
+X_initial = seeded_initializations(seeds, n).repeat(len(alpha_set), 1)
+
+steps, sizes = batched_mgd_convergence(
+    adjacency_matrix_tensor,
+    adjacency_matrix_tensor_comp,
+    X_initial,
+    learning_rate=torch.tensor(alpha_set).repeat_interleave(number_of_initializations),
+    momentum=torch.full((number_of_rows,), beta),
+    gamma=torch.full((number_of_rows,), float(gamma)),
+    gamma_prime=torch.full((number_of_rows,), float(gamma_c)),
+    max_steps=T_limit,
+    check_interval=check_interval,
+)
+
+# An initialization that does not converge within T_limit is logged with T = 0 and an MIS of size 1
+converged = steps >= 0
+MGD_iter_per_alpha = torch.where(converged, steps, 0).view(len(alpha_set), -1).numpy()
+MGD_MIS_per_alpha = torch.where(converged, sizes, 1).view(len(alpha_set), -1).numpy()
 
 T_and_MIS_per_alpha = {}
 
-for alpha in alpha_set:
+for alpha, MGD_iter, MGD_MIS in zip(alpha_set, MGD_iter_per_alpha, MGD_MIS_per_alpha):
   print("+++++++ We are at alpha = ", [alpha])
-  MGD_MIS=[]
-  MGD_iter=[]
-  T_and_MIS_per_alpha[alpha] = []
-  ctr = 0
-  for seed in range(number_of_initializations):
-    print("We are at seed = ", [seed])
-
-    temp = opt_loop_MGD(seed, adjacency_matrix_tensor, adjacency_matrix_tensor_comp, gamma, gamma_c, alpha, beta)
-    if temp[2] > 1:
-      ctr += 1
-    MGD_MIS.append(temp[2])
-    MGD_iter.append(temp[0])
+  ctr = np.count_nonzero(MGD_MIS > 1)
 
   # Here, we log the avg T over seeds, max T over seeds, avg MIS over seeds, mas MIS over seeds, and percentage of obtaining solutions (number of times we got a sol over the number of inits we solved)
   T_and_MIS_per_alpha[alpha] = [np.mean(MGD_iter), np.max(MGD_iter), np.mean(MGD_MIS), np.max(MGD_MIS), ctr/number_of_initializations]
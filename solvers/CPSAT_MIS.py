@@ -2,71 +2,38 @@ from ortools.sat.python import cp_model
 import networkx as nx
 import numpy as np
 from lib.Solver import Solver
-import time
+from lib.clique_cover import independence_constraints
 
 
-class VarArraySolutionPrinter(cp_model.CpSolverSolutionCallback):
+class SolutionTrajectoryCallback(cp_model.CpSolverSolutionCallback):
     """
-    A callback class for printing intermediate solutions during the search process.
+    A silent callback recording the anytime trajectory of the search: the time and size of every
+    improving solution, as `GurobiMIS.data_cb` does.
 
-    This class inherits from `CpSolverSolutionCallback` and is used to track and print
-    intermediate solutions found by the CP-SAT solver.
+    Only the objective value and a clock are read, so the callback costs no work per variable and
+    never writes to stdout.
+
+    Args:
+        clock (callable, optional): Returns the time of a solution in seconds. Defaults to the wall time
+            of the search.
 
     Attributes:
-        _variables (list of cp_model.IntVar): List of variables representing nodes in the graph.
-        _solution_count (int): Counter for the number of solutions found.
-        _solution_limit (int): The limit on the number of solutions to print before stopping the search.
-        start_time (float): Time when the search started.
-        times (list of float): List to store the time taken to find each solution.
-        paths (list of int): List to store the size of each solution.
+        times (list of float): Time, in seconds, at which each solution was found.
+        paths (list of int): Size of each solution.
     """
-    
-    def __init__(self, variables, limit):
-        """
-        Initializes the solution printer with variables and solution limit.
 
-        Args:
-            variables (list of cp_model.IntVar): The variables to track during the search.
-            limit (int): The maximum number of solutions to print.
-        """
+    def __init__(self, clock=None):
         cp_model.CpSolverSolutionCallback.__init__(self)
-        self._variables = variables
-        self._solution_count = 0
-        self._solution_limit = limit
-        self.start_time = time.time()
-
+        self.clock = clock if clock is not None else self.WallTime
         self.times = []
         self.paths = []
 
     def on_solution_callback(self):
         """
         Callback method that is called at each new solution found by the solver.
-
-        This method records the solution size, the time taken, and prints the solution
-        details. It also stops the search if the solution limit is reached.
-        """
-        solution_size = 0
-        self.times.append(time.time() - self.start_time)
-        for v in self._variables:
-            solution_size += self.Value(v)
-
-        self.paths.append(solution_size)
-
-        self._solution_count += 1
-        print(f'Solution {self._solution_count}:')
-        # for v in self._variables:
-        #     print(f'  {v.Name()} = {self.Value(v)}')
-        if self._solution_count >= self._solution_limit:
-            self.StopSearch()  # Optional: Stop search after N solutions
-
-    def solution_count(self):
-        """
-        Returns the number of solutions found by the callback.
-
-        Returns:
-            int: The number of solutions found.
         """
-        return self._solution_count
+        self.times.append(self.clock())
+        self.paths.append(int(round(self.ObjectiveValue())))
 
 
 class CPSATMIS(Solver):
@@ -78,8 +45,22 @@ class CPSATMIS(Solver):
         G (networkx.Graph): The graph on which the MIS problem will be solved.
         params (dict): Dictionary containing solver parameters:
             - time_limit (int, optional): Time limit (in seconds) for the solver to run. Defaults to None.
+            - threads (int, optional): Number of CP-SAT search workers. Defaults to the CP-SAT default.
+            - num_workers (int, optional): Number of CP-SAT search workers, taking precedence over threads,
+              e.g. to run fewer workers than the cores a job reserves.
+            - seed (int, optional): Random seed of the search. Defaults to the CP-SAT default.
+            - formulation (str, optional): "edge" for one at-most-one constraint per edge, or "clique" for one per
+              clique of a greedy edge clique cover (see `lib.clique_cover`), fewer and stronger constraints.
+              Defaults to "edge".
+            - hint_solution (array-like, optional): 0/1 mask over the nodes, in iteration order, given to CP-SAT as
+              a solution hint, e.g. the mask of a pCQO-MIS run (see the "hint_solver" key of benchmark specs).
+              Defaults to None.
+            - record_trajectory (bool, optional): Records the time and size of every improving solution in
+              `times` and `paths`, the times counting from the start of the model build. Defaults to True.
     """
 
+    default_threads = 8
+
     def __init__(self, G, params):
         """
         Initializes the CPSATMIS solver with the given graph and parameters.
@@ -88,11 +69,16 @@ class CPSATMIS(Solver):
             G (networkx.Graph): The graph to solve the MIS problem on.
             params (dict): Parameters for the solver, including optional time_limit.
         """
+        super().__init__()
         self.G = G
         self.time_limit = params.get("time_limit", None)
+        self.threads = params.get("num_workers", params.get("threads", None))
+        self.seed = params.get("seed", None)
+        self.formulation = params.get("formulation", "edge")
+        self.hint_solution = params.get("hint_solution", None)
         self.solution = {}
         self.solution_time = None
-        self.print_intermediate = True
+        self.record_trajectory = params.get("record_trajectory", True)
 
         self.times = []
         self.paths = []
@@ -104,16 +90,26 @@ class CPSATMIS(Solver):
         The method performs the following steps:
         1. Creates and configures a new CP-SAT model.
         2. Defines binary variables for each node in the graph.
-        3. Adds constraints to ensure no two adjacent nodes are both in the independent set.
-        4. Sets the objective to maximize the number of nodes in the independent set.
-        5. Optionally prints intermediate solutions and their sizes.
-        6. Solves the model and extracts the solution if found.
+        3. Adds at-most-one constraints over the edges or the cliques of a clique cover, so no two adjacent
+           nodes are both in the independent set.
+        4. Sets the objective to maximize the number of nodes in the independent set, and the solution hint if given.
+        5. Solves the model, optionally recording the trajectory of improving solutions, and extracts the
+           solution if found.
 
         Outputs:
             - self.solution (dict): Contains the results of the MIS computation:
                 - graph_mask (numpy.ndarray): Array where 1s denote nodes in the MIS.
                 - size (int): Size of the MIS.
+                - build_time (float): Time taken to build the model, including the clique cover.
+                - number_of_constraints (int): Number of independence constraints of the model.
+                - bound (float): Best upper bound on the MIS size proven by the solver.
+                - time_to_optimal (float): Time from the start of the model build to the proof of optimality,
+                  i.e. the total time of `self.timings`, else None. GurobiMIS reports the same quantity.
+            - self.solution_time (float): Wall time of the search as CP-SAT reports it, excluding the build.
+            - self.timings (dict): Setup (build), solve, time-to-best and total times (see lib.timing);
+              the time to best is only known when the trajectory is recorded.
         """
+        self._start_timer()
         model = cp_model.CpModel()
         solver = cp_model.CpSolver()
 
@@ -121,32 +117,51 @@ class CPSATMIS(Solver):
         if self.time_limit is not None:
             solver.parameters.max_time_in_seconds = float(self.time_limit)
 
-        # Create binary variables for each node
-        node_vars = {node: model.NewBoolVar(f"node_{node}") for node in self.G.nodes}
-
-        # Add constraints: no two adjacent nodes can both be in the independent set
-        for u, v in self.G.edges:
-            model.Add(node_vars[u] + node_vars[v] <= 1)
-
-        # Objective: Maximize the sum of the variables (maximize the size of the independent set)
-        model.Maximize(sum(node_vars[node] for node in node_vars))
-
-        if self.print_intermediate:
-            # Prepare the solution printer
-            solution_printer = VarArraySolutionPrinter(
-                list(node_vars.values()), limit=30
-            )
-            # Start the solver and pass the solution printer
-            status = solver.Solve(model, solution_printer)
-            print(f"Number of solutions found: {solution_printer.solution_count()}")
+        if self.threads is not None:
+            solver.parameters.num_workers = int(self.threads)
+
+        if self.seed is not None:
+            solver.parameters.random_seed = int(self.seed)
+
+        with self._memory_phase("build"):
+            # Create binary variables for each node, in iteration order
+            node_vars = [model.NewBoolVar(f"node_{node}") for node in self.G.nodes]
+
+            # Add constraints: at most one node of every edge or clique is in the independent set
+            constraint_indptr, constraint_nodes = independence_constraints(self.G, self.formulation)
+            constraint_nodes = constraint_nodes.tolist()
+            for start, end in zip(constraint_indptr[:-1].tolist(), constraint_indptr[1:].tolist()):
+                model.AddAtMostOne([node_vars[node] for node in constraint_nodes[start:end]])
+
+            # Objective: Maximize the sum of the variables (maximize the size of the independent set)
+            model.Maximize(cp_model.LinearExpr.Sum(node_vars))
+
+            if self.hint_solution is not None:
+                hint = np.asarray(self.hint_solution).reshape(-1)
+                if len(hint) != len(node_vars):
+                    raise ValueError(f"The solution hint has {len(hint)} entries for {len(node_vars)} nodes")
+                for var, value in zip(node_vars, (hint > 0.5).tolist()):
+                    model.AddHint(var, value)
+        self._end_setup()
+        self.solution["build_time"] = self.timings["setup_time"]
+        self.solution["number_of_constraints"] = len(constraint_indptr) - 1
+
+        if self.record_trajectory:
+            # Start the solver with the trajectory callback
+            trajectory = SolutionTrajectoryCallback(clock=lambda: self._elapsed(synchronize_device=False))
+            status = solver.Solve(model, trajectory)
+            self.times = trajectory.times
+            self.paths = trajectory.paths
+            if self.times:
+                self._record_best(self.times[-1])
         else:
-            # Start the solver without the solution printer
+            # Start the solver without a callback
             status = solver.Solve(model)
 
         # Check if a valid solution exists
         if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
             solution_nodes = [
-                node for node, var in node_vars.items() if solver.Value(var) == 1
+                index for index, var in enumerate(node_vars) if solver.Value(var) == 1
             ]
             self.solution["graph_mask"] = np.zeros(len(node_vars))
             self.solution["graph_mask"][solution_nodes] = 1
@@ -155,7 +170,10 @@ class CPSATMIS(Solver):
             self.solution["graph_mask"] = np.zeros(len(node_vars))
             self.solution["size"] = 0
 
+        self._stop_timer()
         self.solution_time = solver.WallTime()
+        self.solution["bound"] = solver.BestObjectiveBound()
+        self.solution["time_to_optimal"] = self.timings["total_time"] if status == cp_model.OPTIMAL else None
 
 
 if __name__ == "__main__":
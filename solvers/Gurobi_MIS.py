@@ -1,6 +1,8 @@
+import numpy as np
 import networkx as nx
-from gurobipy import Model, GRB, quicksum
+from gurobipy import Model, GRB
 from lib.Solver import Solver
+from lib.clique_cover import independence_constraints, constraint_matrix
 
 class GurobiMIS(Solver):
     """
@@ -10,7 +12,18 @@ class GurobiMIS(Solver):
         G (networkx.Graph): The graph on which the MIS problem will be solved.
         params (dict): Dictionary containing solver parameters:
             - time_limit (int, optional): Time limit (in seconds) for the solver to run. Defaults to None.
+            - threads (int, optional): Number of Gurobi threads. Defaults to the Gurobi default.
+            - seed (int, optional): Random seed of the search. Defaults to the Gurobi default.
+            - formulation (str, optional): "edge" for one constraint x_u + x_v <= 1 per edge, or "clique" for one
+              per clique of a greedy edge clique cover (see `lib.clique_cover`), fewer constraints with a
+              stronger LP relaxation. Defaults to "edge".
+            - hint_solution (array-like, optional): 0/1 mask over the nodes, in iteration order, set as the MIP
+              start (Start attributes), e.g. the mask of a pCQO-MIS run (see the "hint_solver" key of benchmark
+              specs). Defaults to None.
     """
+
+    default_threads = 8
+
     def __init__(self, G, params):
         """
         Initializes the GurobiMIS solver with the given graph and parameters.
@@ -19,8 +32,13 @@ class GurobiMIS(Solver):
             G (networkx.Graph): The graph to solve the MIS problem on.
             params (dict): Parameters for the solver, including optional time_limit.
         """
+        super().__init__()
         self.G = G
         self.time_limit = params.get("time_limit", None)
+        self.threads = params.get("threads", None)
+        self.seed = params.get("seed", None)
+        self.formulation = params.get("formulation", "edge")
+        self.hint_solution = params.get("hint_solution", None)
         self.solution = {}
         self.model = None
         self.solution_time = None  # Initialize solution_time
@@ -32,7 +50,7 @@ class GurobiMIS(Solver):
         Callback function for Gurobi's MIP solver.
 
         This function is called during the optimization process to monitor the progress.
-        It records the best objective value and corresponding runtime at each callback.
+        It records every improvement of the incumbent and the time since the model build started.
 
         Args:
             model (gurobipy.Model): The Gurobi model being optimized.
@@ -41,10 +59,15 @@ class GurobiMIS(Solver):
         if where == GRB.Callback.MIP:
             cur_obj = model.cbGet(GRB.Callback.MIP_OBJBST)
 
-            self._stop_timer()
+            # No incumbent yet
+            if cur_obj <= -GRB.INFINITY:
+                return
+
             if len(self.paths) == 0 or self.paths[-1] < cur_obj:
-                self.times.append(self.solution_time)
-                self.paths.append(cur_obj)
+                elapsed = self._elapsed(synchronize_device=False)
+                self.times.append(elapsed)
+                self.paths.append(int(round(cur_obj)))
+                self._record_best(elapsed)
 
     def solve(self):
         """
@@ -52,17 +75,29 @@ class GurobiMIS(Solver):
 
         The method performs the following steps:
         1. Creates and configures a new Gurobi model for the MIS problem.
-        2. Defines binary variables for each node in the graph.
-        3. Adds constraints to ensure no two adjacent nodes are both in the independent set.
-        4. Sets the objective function to maximize the number of selected nodes.
-        5. Optimizes the model and records the solution time.
+        2. Defines a vector of binary variables, one per node in the graph.
+        3. Adds the constraints A x <= 1 over the edges or the cliques of a clique cover as one sparse
+           matrix, so no two adjacent nodes are both in the independent set.
+        4. Sets the objective function to maximize the number of selected nodes, and the MIP start if given.
+        5. Optimizes the model, recording the trajectory of improving incumbents.
         6. Extracts and prints the solution if the model finds an optimal or feasible solution.
-        7. Prints the progress paths and times.
 
         Outputs:
             - self.solution (dict): Contains the results of the MIS computation:
                 - graph_mask (list of int): List of 0s and 1s where 1s denote nodes in the MIS.
                 - size (int): Size of the MIS.
+                - build_time (float): Time taken to build the model, including the clique cover.
+                - runtime (float): Time Gurobi spent optimizing, as it reports it (its Runtime).
+                - number_of_constraints (int): Number of independence constraints of the model.
+                - bound (float): Best upper bound on the MIS size proven by the solver.
+                - time_to_optimal (float): Time from the start of the model build to the proof of optimality,
+                  i.e. the total time of `self.timings`, else None. CPSATMIS reports the same quantity.
+                - trajectory (list): [time, size] of every improving incumbent.
+            - self.solution_time (float): Build and solve time.
+            - self.timings (dict): Setup (build), solve, time-to-best and total times (see lib.timing).
+
+        All times are measured from the start of the model build, so they are comparable with solvers
+        whose reported times include building their matrices.
         """
         # Create a new Gurobi model
         self.model = Model("Maximum_Independent_Set")
@@ -71,46 +106,62 @@ class GurobiMIS(Solver):
         if self.time_limit is not None:
             self.model.setParam("TimeLimit", self.time_limit)
 
-        # Create a binary variable for each node
-        node_vars = {
-            node: self.model.addVar(vtype=GRB.BINARY, name=f"node_{node}")
-            for node in self.G.nodes
-        }
+        if self.threads is not None:
+            self.model.setParam("Threads", int(self.threads))
 
-        # Add constraints: no two adjacent nodes can both be in the independent set
-        for u, v in self.G.edges:
-            if u != v:  # avoid adding a constraint for self-loops, if they exist
-                self.model.addConstr(node_vars[u] + node_vars[v] <= 1, f"edge_{u}_{v}")
+        if self.seed is not None:
+            self.model.setParam("Seed", int(self.seed))
 
-        # Set the objective: maximize the sum of the selected nodes
-        self.model.setObjective(
-            quicksum(node_vars[node] for node in self.G.nodes), GRB.MAXIMIZE
-        )
+        self._start_timer()
+        with self._memory_phase("build"):
+            # Create a binary variable for each node, in iteration order
+            node_vars = self.model.addMVar(self.G.number_of_nodes(), vtype=GRB.BINARY, name="node")
+
+            # Add constraints: at most one node of every edge or clique is in the independent set
+            # (self-loops are ignored)
+            constraints = constraint_matrix(
+                *independence_constraints(self.G, self.formulation), self.G.number_of_nodes()
+            )
+            self.model.addMConstr(
+                constraints, node_vars, GRB.LESS_EQUAL, np.ones(constraints.shape[0]), name=self.formulation
+            )
+
+            # Set the objective: maximize the sum of the selected nodes
+            self.model.setObjective(node_vars.sum(), GRB.MAXIMIZE)
+
+            # Warm start from the given mask
+            if self.hint_solution is not None:
+                start = np.asarray(self.hint_solution, dtype=np.float64).reshape(-1)
+                if len(start) != self.G.number_of_nodes():
+                    raise ValueError(f"The MIP start has {len(start)} entries for {self.G.number_of_nodes()} nodes")
+                node_vars.Start = (start > 0.5).astype(np.float64)
+        self._end_setup()
+        self.solution["build_time"] = self.timings["setup_time"]
+        self.solution["number_of_constraints"] = constraints.shape[0]
 
         # Optimize the model
-        self._start_timer()
         self.model.optimize(callback=self.data_cb)
-        self.solution_time = self.model.Runtime
+        self._stop_timer()
+        self.solution["runtime"] = self.model.Runtime
 
         # Check if a valid solution exists
         if self.model.status == GRB.OPTIMAL or self.model.status == GRB.TIME_LIMIT:
-            self.solution["graph_mask"] = [
-                int(node_vars[node].X) for node in self.G.nodes
-            ]
+            self.solution["graph_mask"] = np.rint(node_vars.X).astype(int).tolist()
             self.solution["size"] = sum(self.solution["graph_mask"])
+            self.solution["bound"] = self.model.ObjBound
             print(f"Maximum Independent Set size: {self.solution['size']}")
         else:
             print("No valid solution found.")
             self.solution["graph_mask"] = []
             self.solution["size"] = 0
-
-        print(self.paths, self.times)
+        self.solution["time_to_optimal"] = self.timings["total_time"] if self.model.status == GRB.OPTIMAL else None
+        self.solution["trajectory"] = [[t, size] for t, size in zip(self.times, self.paths)]
 
         # Optional: Output the variables if the solution was found
         if self.model.status == GRB.OPTIMAL:
             print("Nodes in the independent set:")
-            for node in self.G.nodes:
-                if node_vars[node].X > 0.5:  # effectively checking if the variable is 1
+            for node, value in zip(self.G.nodes, node_vars.X):
+                if value > 0.5:  # effectively checking if the variable is 1
                     print(node)
 
 if __name__ == "__main__":
@@ -1,25 +1,67 @@
 import os
 import subprocess
 import re
+import asyncio
+import logging
+import tempfile
 from lib.Solver import Solver
-import time
-from pathlib import Path
+from lib.memory import communicate_with_peak_rss, process_peak_rss_bytes
+from lib.graph_cache import DEFAULT_METIS_DIRECTORY, DEFAULT_METIS_MAX_BYTES, metis_file
+from lib.io import networkx_to_csr, write_metis
 import numpy
 import networkx
 
+logger = logging.getLogger(__name__)
+
 module_directory = os.path.dirname(os.path.abspath(__file__))
 
+# Final "Time found" line of the ReduMIS log
+TIME_FOUND_REGEX = re.compile(r"Time found:\s*([0-9.eE+-]+)")
+
+# Solution sizes in the ReduMIS log: the "Size:" lines of its result block and, with --console_log, of
+# every improvement
+PROGRESS_REGEX = re.compile(r"^\s*(?:[Bb]est\s+)?[Ss]ize:\s*([0-9]+)")
+
+# Memory-backed file systems for the private working directories, in order of preference
+TMPFS_DIRECTORIES = ("/dev/shm", "/run/shm")
+
+
+def scratch_directory():
+    """
+    Returns a writable memory-backed (tmpfs) directory to create private working directories in,
+    or None to fall back to the system temporary directory.
+    """
+    for directory in TMPFS_DIRECTORIES:
+        if os.path.isdir(directory) and os.access(directory, os.W_OK | os.X_OK):
+            return directory
+    return None
+
+
 class ReduMIS(Solver):
     """
     A solver class for finding the Maximum Independent Set (MIS) of a graph using the ReduMIS algorithm.
 
+    Every solve runs in its own private working directory, on tmpfs where available, and captures the
+    ReduMIS log in memory, so any number of instances can run concurrently from threads or processes.
+
     Parameters:
         G (networkx.Graph): The graph on which the MIS problem will be solved.
         params (dict): Dictionary containing solver parameters:
             - seed (int, optional): Seed for randomization. Defaults to None.
             - time_limit (int, optional): Time limit (in seconds) for the algorithm to run. Defaults to None.
             - redumis_path (str, optional): Path to the ReduMIS executable. Defaults to "../external/redumis".
+            - working_directory (str, optional): Directory the private working directories are created in.
+              Defaults to a tmpfs directory (see `scratch_directory`).
+            - metis_directory (str, optional): Directory caching the METIS files of the graphs by fingerprint,
+              shared by runs across seeds, time limits and processes (see `lib.graph_cache.metis_file`).
+              Defaults to DEFAULT_METIS_DIRECTORY; None writes the file into the working directory of every run.
+            - metis_fingerprint (str, optional): Precomputed `lib.graph_cache.metis_fingerprint` of the graph,
+              sparing the conversion and hashing of the graph when its METIS file is cached. Defaults to None.
+            - metis_max_bytes (int, optional): Size budget of metis_directory, whose least recently used files
+              are removed beyond it; None for unbounded growth. Defaults to DEFAULT_METIS_MAX_BYTES.
     """
+    reads_metis_file = True
+
     def __init__(self, G, params):
         """
         Initializes the ReduMIS solver with the given graph and parameters.
@@ -35,72 +77,112 @@ class ReduMIS(Solver):
         self.redumis_path = params.get(
             "redumis_path", os.path.join(module_directory, "../external/KaMIS/deploy/redumis")
         )
+        self.working_directory = params.get("working_directory", scratch_directory())
+        self.metis_directory = params.get("metis_directory", DEFAULT_METIS_DIRECTORY)
+        self.metis_fingerprint = params.get("metis_fingerprint", None)
+        self.metis_max_bytes = params.get("metis_max_bytes", DEFAULT_METIS_MAX_BYTES)
         self.solution = {}
         self.solution_time = 0.0
+        self.log = ""
 
     def solve(self):
         """
         Executes the ReduMIS algorithm to find the Maximum Independent Set (MIS) of the graph.
 
         The method performs the following steps:
-        1. Converts the input graph to METIS format and saves it to a temporary file.
-        2. Constructs and executes the ReduMIS command with the specified parameters.
-        3. Extracts the solution time from the ReduMIS log file.
+        1. Converts the input graph to METIS format, or reuses its cached METIS file.
+        2. Constructs and executes the ReduMIS command with the specified parameters, capturing its log.
+        3. Extracts the solution time from the log.
         4. Reads and processes the solution from the result file.
-        5. Cleans up temporary files used during execution.
+        5. Removes the working directory.
 
         Outputs:
             - self.solution (dict): Contains the results of the MIS computation:
                 - graph_mask (numpy.array): Array of 0s and 1s where 1s denote nodes in the MIS.
                 - size (int): Size of the MIS.
+            - self.log (str): The standard output of ReduMIS.
+            - self.solution_time (float): The "Time found" ReduMIS reports for its best solution.
+            - self.timings (dict): Setup (METIS conversion), solve (the ReduMIS process), time-to-best and
+              total times (see lib.timing), the time to best being the "Time found" after the process start.
         """
-        # Define temporary file paths
-        temp_graph_path = f"./temp_kamis_metis_{time.time()}"
-        temp_graph_os_path = Path(temp_graph_path)
-        temp_result_path = f"./temp_kamis_solution_{time.time()}"
-        temp_result_os_path = Path(temp_result_path)
+        with tempfile.TemporaryDirectory(prefix="redumis_", dir=self.working_directory) as directory:
+            result_path = os.path.join(directory, "solution")
+
+            # Start timing
+            self._start_timer()
+
+            # Convert networkx graph to METIS format
+            graph_path = self._graph_path(directory)
+
+            # Build ReduMIS command
+            redumis_command = self._command(graph_path, result_path, self.seed, self.time_limit)
+            self._end_setup()
+
+            # Execute ReduMIS command, keeping its log in memory and sampling the peak memory of the process
+            process = subprocess.Popen(
+                redumis_command, shell=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+            )
+            self.log, errors, peak_rss = communicate_with_peak_rss(process)
+            self.memory_usage["process"] = {"peak_rss_bytes": peak_rss}
+            if process.returncode != 0:
+                raise RuntimeError(f"ReduMIS exited with status {process.returncode}: {errors.strip()}")
 
-        # Convert networkx graph to METIS format
-        self.networkx_to_metis(self.G, temp_graph_path)
+            # Extract solution time from the log
+            time_found = None
+            for match in TIME_FOUND_REGEX.finditer(self.log):
+                time_found = float(match.group(1))
 
-        # Start timing
-        self._start_timer()
+            # Read and process the result
+            self.solution["graph_mask"] = self.read_solution_mask(result_path)
+            self.solution["size"] = numpy.count_nonzero(self.solution["graph_mask"] == 1)
+            self._stop_timer()
+
+            self.solution_time = 0.0 if time_found is None else time_found
+            if time_found is not None:
+                # The self-reported time and the process start may disagree by the launch latency
+                self._record_best(min(self.timings["setup_time"] + time_found, self.timings["total_time"]))
+
+    def _graph_path(self, directory):
+        """
+        Returns the path of the graph's METIS file: the cached file (see `lib.graph_cache.metis_file`), or
+        a file written into `directory` when caching is disabled.
+        """
+        if self.metis_directory is not None:
+            return metis_file(self.G, self.metis_directory, self.metis_fingerprint, self.metis_max_bytes)
+        graph_path = os.path.join(directory, "graph.metis")
+        self.networkx_to_metis(self.G, graph_path)
+        return graph_path
 
-        # Build ReduMIS command
+    def _command(self, graph_path, result_path, seed, time_limit):
+        """
+        Builds the ReduMIS command line.
+        """
         redumis_command = [
             self.redumis_path,
-            temp_graph_path,
-            f"--output={temp_result_path}",
+            graph_path,
+            f"--output={result_path}",
         ]
 
-        if self.time_limit is not None:
-            redumis_command.append(f"--time_limit={self.time_limit}")
+        if time_limit is not None:
+            redumis_command.append(f"--time_limit={time_limit}")
 
-        if self.seed is not None:
-            redumis_command.append(f"--seed={self.seed}")
+        if seed is not None:
+            redumis_command.append(f"--seed={seed}")
 
-        # Execute ReduMIS command
-        with open("redumis.log", "w") as output_file:
-            subprocess.run(redumis_command, shell=False, stdout=output_file, text=True)
+        return redumis_command
 
-        # Extract solution time from the log file
-        solution_time_regex = r"(?<=Time found:).+([0-9]+.[0-9]+)"
-        with open("redumis.log", "r") as f:
-            for line in f:
-                match = re.search(solution_time_regex, line)
-                if match:
-                    self.solution_time = float(match.group())
+    @staticmethod
+    def read_solution_mask(result_path):
+        """
+        Reads a ReduMIS solution file, one 0 or 1 per line and node.
 
-        # Read and process the result
-        with open(temp_result_path, "r") as f:
+        Returns:
+            numpy.array: Array of 0s and 1s where 1s denote nodes in the MIS.
+        """
+        with open(result_path, "r") as f:
             result = f.read().split("\n")
             result.pop()  # Remove the last empty line
-            self.solution["graph_mask"] = numpy.array(result, dtype=int)
-            self.solution["size"] = numpy.count_nonzero(self.solution["graph_mask"] == 1)
-
-        # Clean up temporary files
-        temp_graph_os_path.unlink(missing_ok=True)
-        temp_result_os_path.unlink(missing_ok=True)
+            return numpy.array(result, dtype=int)
 
     @staticmethod
     def networkx_to_metis(G, output_file):
@@ -111,26 +193,282 @@ class ReduMIS(Solver):
             G (networkx.Graph): The graph to be converted.
             output_file (str): Path to the file where the METIS formatted graph will be saved.
 
-        The METIS format consists of:
+        Nodes are numbered from 1 in iteration order and self-loops are dropped. The METIS format consists of:
         - The number of nodes and edges on the first line.
         - Each subsequent line represents the adjacency list of each node.
         """
-        graph_order = len(G.nodes)
-        graph_size = len(G.edges)
+        write_metis(output_file, *networkx_to_csr(G))
+
+
+class ReduMISPortfolio(ReduMIS):
+    """
+    Parallel portfolio of ReduMIS runs with different seeds on the same graph, the parallel baseline to
+    batched pCQO-MIS.
+
+    The runs share the graph's METIS file and are driven by asyncio: the log of every run is parsed as
+    it is written into an anytime trajectory of (time, size) points, so the portfolio stops every run
+    still going once one of them reaches `target_size` or the `deadline` passes. Trajectory times are
+    seconds on the solver's timer, which starts before the METIS file is written (see lib.timing); the
+    deadline counts from the launch of the runs. The best solution mask written by a run is returned.
+
+    ReduMIS writes its solution only when it reaches its time limit, so runs are stopped with SIGTERM
+    and given `grace_period` seconds to exit; a run killed before writing its solution still contributes
+    its trajectory. When the target size is reached, the run that reached it first is then replayed with
+    its seed and a time limit of the time it took to reach the target plus `grace_period`, so ReduMIS
+    exits by itself and writes the solution (its size can differ from the logged one if the replay is
+    slower). The deadline is also passed as every run's time limit, so runs reaching it exit with their
+    solution by themselves; runs stopped on the deadline are not replayed.
+
+    Parameters:
+        G (networkx.Graph): The graph on which the MIS problem will be solved.
+        params (dict): Dictionary containing solver parameters, those of ReduMIS and:
+            - portfolio_size (int, optional): Number of concurrent runs. Defaults to the job's "threads",
+              one run per reserved core.
+            - seeds (list of int, optional): Seeds of the runs. Defaults to portfolio_size consecutive
+              seeds starting at seed * portfolio_size, so different job seeds run disjoint portfolios.
+            - target_size (int, optional): Size at which the portfolio stops. Defaults to None.
+            - deadline (float, optional): Wall-clock seconds after which the portfolio stops. Defaults
+              to time_limit.
+            - grace_period (float, optional): Seconds stopped runs get to exit before being killed, and the
+              margin of the replay's time limit. Defaults to 1.
+            - console_log (bool, optional): Passes --console_log, with which ReduMIS logs every
+              improvement instead of only its result. Defaults to True.
+            - progress_regex (str, optional): Regular expression whose first group is the solution size
+              in a log line. Defaults to PROGRESS_REGEX.
+    """
+    default_threads = 4
+
+    def __init__(self, G, params):
+        """
+        Initializes the portfolio with the given graph and parameters.
+
+        Args:
+            G (networkx.Graph): The graph to solve the MIS problem on.
+            params (dict): Parameters for the portfolio (see the class documentation).
+        """
+        super().__init__(G, params)
+        portfolio_size = params.get("portfolio_size", params.get("threads", self.default_threads))
+        first_seed = (self.seed or 0) * portfolio_size
+        self.seeds = list(params.get("seeds", range(first_seed, first_seed + portfolio_size)))
+        self.target_size = params.get("target_size", None)
+        self.deadline = params.get("deadline", self.time_limit)
+        self.grace_period = params.get("grace_period", 1.0)
+        self.console_log = params.get("console_log", True)
+        self.progress_regex = re.compile(params.get("progress_regex", PROGRESS_REGEX.pattern))
+        self.times = []
+        self.paths = []
+        self.runs = []
+
+    def _record_progress(self, run, line):
+        """
+        Parses one log line of a run, extending its trajectory and that of the portfolio.
+
+        Returns:
+            bool: True when the line reports a solution of at least the target size, after which the run's
+                "reached_target" is the time it did.
+        """
+        time_found = TIME_FOUND_REGEX.search(line)
+        if time_found:
+            run["time_found"] = float(time_found.group(1))
+
+        progress = self.progress_regex.search(line)
+        if not progress:
+            return False
+        size = int(progress.group(1))
+        elapsed = self._elapsed(synchronize_device=False)
+        run["trajectory"].append((elapsed, size))
+        if not self.paths or size > self.paths[-1]:
+            self.times.append(elapsed)
+            self.paths.append(size)
+        if self.target_size is None or size < self.target_size:
+            return False
+        if run["reached_target"] is None:
+            run["reached_target"] = elapsed
+        return True
+
+    async def _follow(self, run, process, stop):
+        """
+        Streams the log of a run until it exits, setting `stop` once it reaches the target size.
+        """
+        errors = asyncio.create_task(process.stderr.read())
+        async for raw_line in process.stdout:
+            line = raw_line.decode(errors="replace")
+            run["log"].append(line)
+            if self._record_progress(run, line):
+                stop.set()
+        run["errors"] = (await errors).decode(errors="replace")
+        run["returncode"] = await process.wait()
+
+    async def _sample_memory(self, processes, peaks):
+        """
+        Samples the peak RSS of every running process until cancelled (see `communicate_with_peak_rss`).
+        """
+        while True:
+            for index, process in enumerate(processes):
+                sample = process_peak_rss_bytes(process.pid) if process.returncode is None else None
+                if sample is not None:
+                    peaks[index] = max(peaks[index] or 0, sample)
+            await asyncio.sleep(0.05)
+
+    async def _run_portfolio(self, graph_path, directory):
+        """
+        Launches one ReduMIS process per seed and waits until they all exit, the target size is reached or
+        the deadline passes.
+
+        Returns:
+            str or None: "target" or "deadline" when the portfolio stopped its runs early, else None.
+        """
+        processes = []
+        for seed in self.seeds:
+            result_path = os.path.join(directory, f"solution_{seed}")
+            command = self._command(graph_path, result_path, seed, self.deadline)
+            if self.console_log:
+                command.append("--console_log")
+            self.runs.append(
+                {
+                    "seed": seed,
+                    "result_path": result_path,
+                    "log": [],
+                    "trajectory": [],
+                    "time_found": None,
+                    "reached_target": None,
+                    "launched": self._elapsed(synchronize_device=False),
+                }
+            )
+            processes.append(
+                await asyncio.create_subprocess_exec(
+                    *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+            )
+
+        stop = asyncio.Event()
+        peaks = [None] * len(processes)
+        sampler = asyncio.create_task(self._sample_memory(processes, peaks))
+        followers = asyncio.gather(*(self._follow(run, process, stop) for run, process in zip(self.runs, processes)))
+        stopped = asyncio.create_task(stop.wait())
+
+        # Runs given the deadline as time limit normally exit by themselves within the grace period
+        launched = self._elapsed(synchronize_device=False) - self.timings["setup_time"]
+        timeout = None if self.deadline is None else max(self.deadline - launched, 0) + self.grace_period
+        await asyncio.wait({followers, stopped}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+        reason = None
+        if not followers.done():
+            reason = "target" if stop.is_set() else "deadline"
+            logger.info("Stopping the ReduMIS portfolio on its %s", reason)
+            for process in processes:
+                if process.returncode is None:
+                    process.terminate()
+            try:
+                await asyncio.wait_for(asyncio.shield(followers), self.grace_period)
+            except asyncio.TimeoutError:
+                for process in processes:
+                    if process.returncode is None:
+                        process.kill()
+                await followers
+
+        stopped.cancel()
+        sampler.cancel()
+        if any(peak is not None for peak in peaks):
+            self.memory_usage["process"] = {"peak_rss_bytes": sum(peak or 0 for peak in peaks)}
+
+        if reason == "target":
+            winners = [run for run in self.runs if run["reached_target"] is not None]
+            winner = min(winners, key=lambda run: run["reached_target"])
+            if winner["returncode"] != 0 or not os.path.exists(winner["result_path"]):
+                await self._replay(winner, graph_path)
+        return reason
+
+    async def _replay(self, run, graph_path):
+        """
+        Reruns a run stopped after reaching the target size with its seed and a time limit just past the
+        time it took, so ReduMIS exits by itself and writes its solution to the run's result path.
+        """
+        time_limit = run["reached_target"] - run["launched"] + self.grace_period
+        logger.info("Replaying ReduMIS seed %s for %.3f s to write its solution", run["seed"], time_limit)
+        command = self._command(graph_path, run["result_path"], run["seed"], time_limit)
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            output, errors = await asyncio.wait_for(process.communicate(), time_limit + self.grace_period)
+        except asyncio.TimeoutError:
+            process.kill()
+            output, errors = await process.communicate()
+        run["log"].append(output.decode(errors="replace"))
+        run["errors"] = errors.decode(errors="replace")
+        run["returncode"] = process.returncode
+        run["replayed"] = True
+
+    def solve(self):
+        """
+        Runs the portfolio and keeps the best solution written by any of its runs.
+
+        Outputs:
+            - self.solution (dict): Contains the results of the MIS computation:
+                - graph_mask (numpy.array): Array of 0s and 1s where 1s denote nodes in the MIS, or None
+                  when every run was stopped on the deadline before writing its solution.
+                - size (int): Size of the MIS, or the best size logged when no run wrote its solution.
+                - stopped (str): "target" or "deadline" when the runs were stopped early, else None.
+                - runs (list of dict): seed, size, time_found and trajectory of every run, and whether it
+                  was replayed to write its solution.
+            - self.solution_time (float): Time at which the best solution was found: its run's "Time found",
+              or the time after the launch at which the portfolio first logged its size.
+            - self.timings (dict): Setup (METIS conversion), solve (the runs), time-to-best and total times
+              (see lib.timing).
+            - self.times, self.paths (list): Anytime trajectory of the portfolio, the times and sizes of
+              its improving solutions.
+        """
+        with tempfile.TemporaryDirectory(prefix="redumis_portfolio_", dir=self.working_directory) as directory:
+            self._start_timer()
+            graph_path = self._graph_path(directory)
+            self._end_setup()
+
+            reason = asyncio.run(self._run_portfolio(graph_path, directory))
+            setup_time = self.timings["setup_time"]
+            wall_time = self._elapsed(synchronize_device=False) - setup_time
+
+            best_run = None
+            for run in self.runs:
+                run["size"] = None
+                if run["returncode"] != 0 and reason is None:
+                    raise RuntimeError(f"ReduMIS exited with status {run['returncode']}: {run['errors'].strip()}")
+                if run["returncode"] == 0 and os.path.exists(run["result_path"]):
+                    run["graph_mask"] = self.read_solution_mask(run["result_path"])
+                    run["size"] = int(numpy.count_nonzero(run["graph_mask"] == 1))
+                    if best_run is None or run["size"] > best_run["size"]:
+                        best_run = run
 
-        # Relabel nodes to be consecutive integers starting from 1
-        G = networkx.relabel.convert_node_labels_to_integers(G, first_label=1)
+        self.log = "".join(line for run in self.runs for line in run["log"])
+        best_logged = self.paths[-1] if self.paths else 0
+        if best_run is None:
+            logger.warning("No ReduMIS run of the portfolio wrote its solution, reporting the best logged size")
+        self.solution = {
+            "graph_mask": best_run["graph_mask"] if best_run is not None else None,
+            "size": best_run["size"] if best_run is not None else best_logged,
+            "stopped": reason,
+            "wall_time": wall_time,
+            "runs": [
+                dict(
+                    {key: run[key] for key in ("seed", "size", "time_found", "trajectory")},
+                    replayed=run.get("replayed", False),
+                )
+                for run in self.runs
+            ],
+        }
 
-        # Remove self-loops
-        self_loops = [(u, v) for u, v in G.edges() if u == v]
-        G.remove_edges_from(self_loops)
+        self._stop_timer()
+        size = self.solution["size"]
+        reached = next((t for t, s in zip(self.times, self.paths) if s >= size), None)
+        if best_run is not None and best_run["time_found"] is not None:
+            self.solution_time = best_run["time_found"]
+            self._record_best(min(setup_time + best_run["time_found"], self.timings["total_time"]))
+        elif reached is not None:
+            self.solution_time = reached - setup_time
+            self._record_best(reached)
+        else:
+            self.solution_time = wall_time
 
-        # Write the graph in METIS format
-        with open(output_file, "w") as f:
-            f.write(f"{graph_order} {graph_size}\n")
-            for _, neighbors in sorted(G.adjacency()):
-                sorted_neighbors = sorted(int(nei) for nei in neighbors.keys())
-                f.write(f"{' '.join(map(str, sorted_neighbors))}\n")
 
 if __name__ == "__main__":
     # Create a simple example graph
@@ -1,9 +1,11 @@
 import torch
 from torch.func import vmap
-import networkx as nx
 from networkx import Graph
 import time
 from lib.Solver import Solver
+from lib.adjacency import graph_edge_index, build_adjacency, degree_scaling_vector, AdjacencyOperator
+from lib.graph_cache import get_default_cache, graph_fingerprint
+from lib.tuning import read_params_file, maximal_independent_rows
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,8 +19,8 @@ def three_term_grad_function(
 
     Parameters:
         Matrix_X (torch.Tensor): The matrix of variable values.
-        adjacency_matrix_tensor (torch.Tensor): The adjacency matrix of the original graph.
-        adjacency_matrix_tensor_comp (torch.Tensor): The adjacency matrix of the complement graph.
+        adjacency_matrix_tensor (torch.Tensor or AdjacencyOperator): The adjacency matrix of the original graph.
+        adjacency_matrix_tensor_comp (torch.Tensor or AdjacencyOperator): The adjacency matrix of the complement graph.
         gamma (float): Regularization parameter for the adjacency matrix of the original graph.
         gamma_prime (float): Regularization parameter for the adjacency matrix of the complement graph.
 
@@ -38,7 +40,7 @@ def two_term_grad_function(
 
     Parameters:
         Matrix_X (torch.Tensor): The matrix of variable values.
-        adjacency_matrix_tensor (torch.Tensor): The adjacency matrix of the original graph.
+        adjacency_matrix_tensor (torch.Tensor or AdjacencyOperator): The adjacency matrix of the original graph.
         gamma (float): Regularization parameter for the adjacency matrix of the original graph.
 
     Returns:
@@ -58,33 +60,39 @@ def velocity_update_function(
     return vector_x, new_velocity
 
 
-def normalize_adjacency_matrix(graph):
+def compute_derived_matrices(graph, device):
     """
-    Normalizes the adjacency matrix of a graph.
+    Builds the matrices pCQO-MIS derives from a graph.
 
     Parameters:
-        graph (networkx.Graph): The graph whose adjacency matrix will be normalized.
+        graph (networkx.Graph): The graph to derive the matrices from.
+        device (torch.device): Device the tensors are created on.
 
     Returns:
-        torch.Tensor: The normalized adjacency matrix as a PyTorch tensor.
+        dict: Tensors "adjacency" and "adjacency_comp" (float16 adjacency matrices of the graph and its
+        complement), "degree_scaling" and "degree_scaling_comp" (their D^(-1/2) normalization vectors),
+        "degrees" (node degrees) and "mean_vector" (degree-based initializer means).
     """
-    # Get the adjacency matrix
-    adjacency_matrix = nx.adjacency_matrix(graph).todense()
-
-    # Convert to PyTorch tensor
-    adjacency_matrix = torch.tensor(adjacency_matrix)
-
-    # Calculate the degree matrix
-    degree_matrix = torch.diag(torch.tensor(list(dict(graph.degree()).values())))
-
-    # Normalize the adjacency matrix
-    normalized_adjacency = (
-        torch.inverse(torch.sqrt(degree_matrix))
-        @ adjacency_matrix
-        @ torch.inverse(torch.sqrt(degree_matrix)).to_dense()
+    # Both matrices are filled in place from the edge index, without networkx/scipy intermediates
+    graph_order, edges = graph_edge_index(graph)
+    adjacency_matrix_dense = build_adjacency(graph_order, edges, dtype=torch.float16, device=device)
+    adjacency_matrix_comp_dense = build_adjacency(
+        graph_order, edges, dtype=torch.float16, device=device, complement=True
     )
 
-    return normalized_adjacency
+    # Degree-based initializer: 1 - degree / max_degree, rescaled so that its largest entry is 1
+    degrees = torch.tensor([degree for _, degree in graph.degree()], dtype=torch.float64)
+    mean_vector = 1 - degrees / degrees.max()
+    mean_vector = mean_vector / mean_vector.max()
+
+    return {
+        "adjacency": adjacency_matrix_dense,
+        "adjacency_comp": adjacency_matrix_comp_dense,
+        "degree_scaling": degree_scaling_vector(adjacency_matrix_dense),
+        "degree_scaling_comp": degree_scaling_vector(adjacency_matrix_comp_dense),
+        "degrees": degrees.to(device),
+        "mean_vector": mean_vector.to(device=device, dtype=torch.float16),
+    }
 
 
 class pCQOMIS_MGD(Solver):
@@ -95,24 +103,42 @@ class pCQOMIS_MGD(Solver):
     Parameters:
         G (networkx.Graph): The graph on which the MIS problem will be solved.
         params (dict): Dictionary containing solver parameters:
-            - learning_rate (float, optional): Learning rate for the optimizer. Defaults to 0.001.
+            - learning_rate (float or list of float, optional): Learning rate for the optimizer. Defaults to 0.001.
             - number_of_steps (int, optional): Number of training steps. Defaults to 10000.
             - number_of_terms (str, optional): Type of loss function to use ("two" or "three"). Defaults to "three".
-            - gamma (float, optional): Loss function parameter. Defaults to 775.
-            - gamma_prime (float, optional): Loss function parameter. Defaults to 1.
+            - gamma (float or list of float, optional): Loss function parameter. Defaults to 775.
+            - gamma_prime (float or list of float, optional): Loss function parameter. Defaults to 1.
             - batch_size (int, optional): Number of graphs per batch. Defaults to 256.
             - steps_per_batch (int, optional): Number of optimization steps per batch. Defaults to 350.
             - output_interval (int, optional): Interval for outputting progress. Defaults to steps_per_batch.
             - threshold (float, optional): Threshold for binarization of solutions. Defaults to 0.0.
             - seed (int, optional): Random seed for initialization. Defaults to 113.
-            - normalize (bool, optional): Whether to normalize adjacency matrices. Defaults to False.
-            - combine (bool, optional): Whether to combine original and normalized adjacency matrices. Defaults to False.
+            - normalize (bool, optional): Whether to use the degree-normalized adjacency matrices D^(-1/2) A D^(-1/2)
+              in the gradient. Applied as row and column scaling, without building normalized matrices. Defaults to False.
+            - combine (bool, optional): Whether to use the sum of the original and normalized adjacency matrices
+              in the gradient. Defaults to False.
             - value_initializer (str, optional): Method for initializing values ("random" or "degree"). Defaults to "random".
             - value_initializer_std (float, optional): Standard deviation for random initialization (only applies to "degree-based" initializations). Defaults to 2.25.
             - test_runtime (bool, optional): Whether to test runtime performance. Defaults to False.
             - save_sample_path (bool, optional): Whether to save the sample path. Defaults to False.
+            - use_cache (bool, optional): Whether to share derived matrices (adjacency, complement, degree
+              statistics) across solver instances through the process-wide cache. Defaults to True.
+            - momentum (float or list of float, optional): Momentum of the gradient descent. Defaults to 0.9.
+            - params_file (str, optional): Parameters file written by `tune.py` (see `lib.tuning`). Its values
+              are used for every parameter not given explicitly.
+
+    List-valued learning_rate, momentum, gamma and gamma_prime (of equal length, scalars are shared) solve
+    several hyperparameter configurations at once: the batch holds batch_size rows per configuration, each
+    row carrying its own hyperparameters, so all configurations share every product with A and its
+    complement. Per-configuration results are stored in `config_solutions`; `solution` and `solutions`
+    hold those of the configuration that found the largest MIS.
     """
 
+    VECTORIZED_PARAMETERS = ("learning_rate", "momentum", "gamma", "gamma_prime")
+
+    # Torch intra-op threads used when run by a parallel scheduler
+    default_threads = 4
+
     def __init__(self, G: Graph, params):
         """
         Initializes the pCQOMIS solver with the given graph and parameters.
@@ -123,6 +149,9 @@ class pCQOMIS_MGD(Solver):
         """
         super().__init__()
 
+        if "params_file" in params:
+            params = {**read_params_file(params["params_file"]), **params}
+
         self.learning_rate = params.get("learning_rate", 0.001)
         self.number_of_steps = params.get("number_of_steps", 10000)
         self.graph = G
@@ -133,7 +162,7 @@ class pCQOMIS_MGD(Solver):
         self.steps_per_batch = params.get("steps_per_batch", 350)
         self.output_interval = params.get("output_interval", self.steps_per_batch)
         self.threshold = params.get("threshold", 0.0)
-        self.seed = 113
+        self.seed = params.get("seed", 113)
         self.graph_order = len(G.nodes)
         self.solution = {}
         self.solutions = []
@@ -146,6 +175,23 @@ class pCQOMIS_MGD(Solver):
         self.save_sample_path = params.get("save_sample_path", False)
         self.momentum = params.get("momentum", 0.9)
         self.sample_previous_batch_best = params.get("sample_previous_batch_best", False)
+        self.use_cache = params.get("use_cache", True)
+        self.configurations = self._hyperparameter_configurations()
+        self.config_solutions = []
+
+    def _hyperparameter_configurations(self):
+        """
+        Returns the learning_rate, momentum, gamma and gamma_prime of every configuration solved in the batch.
+        """
+        values = {name: getattr(self, name) for name in self.VECTORIZED_PARAMETERS}
+        lengths = {len(value) for value in values.values() if isinstance(value, (list, tuple))}
+        if len(lengths) > 1:
+            raise ValueError(f"List-valued {', '.join(self.VECTORIZED_PARAMETERS)} must have the same length")
+        number_of_configurations = lengths.pop() if lengths else 1
+        return [
+            {name: value[k] if isinstance(value, (list, tuple)) else value for name, value in values.items()}
+            for k in range(number_of_configurations)
+        ]
 
     def solve(self):
         """
@@ -161,7 +207,8 @@ class pCQOMIS_MGD(Solver):
 
         Outputs:
             - self.solution (dict): Contains the results of the MIS computation:
-                - graph_mask (torch.Tensor): Tensor where 1s denote nodes in the MIS.
+                - graph_mask (torch.Tensor): 0/1 tensor over the nodes, in iteration order, where 1s denote
+                  nodes in the MIS (all 0s if no initialization reached a maximal IS).
                 - size (int): Size of the best MIS found.
                 - number_of_steps (int): Total number of training steps performed.
                 - steps_to_best_MIS (int): Number of steps to reach the best MIS.
@@ -174,7 +221,9 @@ class pCQOMIS_MGD(Solver):
         box_constraint_time_cum = 0
         is_check_time_cum = 0
         restart_time_cum = 0
-        initializations_solved = 0
+        number_of_configurations = len(self.configurations)
+        number_of_rows = number_of_configurations * self.batch_size
+        initializations_solved = [0] * number_of_configurations
 
         self._start_timer()
 
@@ -184,34 +233,30 @@ class pCQOMIS_MGD(Solver):
         # Optimization loop:
         # Initialization:
         torch.manual_seed(self.seed)
+        # The batch is built in float16 through the default dtype, restored at the end for other solvers
+        previous_default_dtype = torch.get_default_dtype()
         torch.set_default_dtype(torch.float16)
 
         device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
         logger.info("using device: %s", device)
+        self.timing_device = device
+
+        with self._memory_phase("build"):
+            if self.use_cache:
+                derived_matrices = get_default_cache().get_or_compute(
+                    (graph_fingerprint(self.graph), str(device), "float16"),
+                    lambda: compute_derived_matrices(self.graph, device),
+                    device=device,
+                )
+            else:
+                derived_matrices = compute_derived_matrices(self.graph, device)
 
-                ### Value Initializer Code
+        ### Value Initializer Code
         if self.value_initializer == "random":
             mean_vector =[]
             self.value_initializer = lambda _, output_tensor: output_tensor.random_(0, 1)
         elif self.value_initializer == "degree":
-            mean_vector = []
-            degrees = dict(self.graph.degree())
-
-            # Find the maximum degree
-            max_degree = max(degrees.values())
-
-            for _, degree in self.graph.degree():
-                degree_init = 1 - degree / max_degree
-                mean_vector.append(degree_init)
-
-            min_degree_initialization = max(mean_vector)
-
-            for i in range(len(mean_vector)):
-                mean_vector[i] = mean_vector[i] / min_degree_initialization
-
-            mean_vector = torch.tensor(mean_vector, device=device)
-
-            track_this = mean_vector
+            mean_vector = derived_matrices["mean_vector"]
 
             self.value_initializer = lambda mean, output_tensor: torch.normal(
                 out=output_tensor, mean=mean, std=self.value_initializer_std
@@ -222,41 +267,36 @@ class pCQOMIS_MGD(Solver):
             torch.cuda.synchronize()
             degree_calc_time = time.time() - start_time
 
-        if not self.normalize or self.combine:
-            adjacency_matrix_dense = torch.tensor(
-                nx.adjacency_matrix(self.graph).todense(), device=device
-            ).to_dense(dtype=torch.float16)
-            adjacency_matrix_comp_dense = torch.tensor(
-                nx.adjacency_matrix(nx.complement(self.graph)).todense(), device=device
-            ).to_dense(dtype=torch.float16)
-        if self.normalize or self.combine:
-            normalized_adjacency_matrix_dense = normalize_adjacency_matrix(self.graph)
-            normalized_adjacency_matrix_comp_dense = normalize_adjacency_matrix(
-                nx.complement(self.graph)
-            )
+        adjacency_matrix_dense = derived_matrices["adjacency"]
+        adjacency_matrix_comp_dense = derived_matrices["adjacency_comp"]
+
+        # The gradient sees A (or its normalization) through an operator applying the degree scaling
+        # as vectors around A @ X, while IS checks always use the unnormalized matrices
         if self.combine:
-            adjacency_matrix_dense = torch.stack(
-                (adjacency_matrix_dense, normalized_adjacency_matrix_dense), dim=0
-            )
-            adjacency_matrix_comp_dense = torch.stack(
-                (adjacency_matrix_comp_dense, normalized_adjacency_matrix_comp_dense),
-                dim=0,
-            )
+            operator_mode = "combine"
         elif self.normalize:
-            adjacency_matrix_dense = normalized_adjacency_matrix_dense
-            adjacency_matrix_comp_dense = normalized_adjacency_matrix_comp_dense
+            operator_mode = "normalize"
+        else:
+            operator_mode = "raw"
+        adjacency_operator = AdjacencyOperator(
+            adjacency_matrix_dense, derived_matrices["degree_scaling"], operator_mode
+        )
+        adjacency_operator_comp = AdjacencyOperator(
+            adjacency_matrix_comp_dense, derived_matrices["degree_scaling_comp"], operator_mode
+        )
 
         if self.test_runtime:
             torch.cuda.synchronize()
             adj_matrix_time = time.time() - degree_calc_time
 
-        Matrix_X = torch.empty((self.batch_size, self.graph_order), device=device, requires_grad=False)
-        velocity_matrix = torch.zeros((self.batch_size, self.graph_order), device=device, requires_grad=False)
+        # Rows [k * batch_size, (k + 1) * batch_size) belong to hyperparameter configuration k
+        Matrix_X = torch.empty((number_of_rows, self.graph_order), device=device, requires_grad=False)
+        velocity_matrix = torch.zeros((number_of_rows, self.graph_order), device=device, requires_grad=False)
 
         if self.test_runtime:
             X_create_time = time.time() - adj_matrix_time
 
-        for batch in range(self.batch_size):
+        for batch in range(number_of_rows):
             self.value_initializer(
                 mean_vector,
                 Matrix_X[batch, :]
@@ -266,35 +306,41 @@ class pCQOMIS_MGD(Solver):
             torch.cuda.synchronize()
             X_init_time = time.time() - X_create_time
 
-        gamma = torch.tensor(self.gamma, device=device)
-        gamma_prime = torch.tensor(self.gamma_prime, device=device)
-        learning_rate = torch.tensor(self.learning_rate, device=device)
-        momentum = torch.tensor(self.momentum, device=device)
+        def row_hyperparameter(name):
+            values = torch.tensor([configuration[name] for configuration in self.configurations], device=device)
+            return values.repeat_interleave(self.batch_size)
+
+        gamma = row_hyperparameter("gamma")
+        gamma_prime = row_hyperparameter("gamma_prime")
+        learning_rate = row_hyperparameter("learning_rate")
+        momentum = row_hyperparameter("momentum")
         number_of_iterations_T = self.number_of_steps
 
         adjacency_matrix_tensor = adjacency_matrix_dense.to(device)
         adjacency_matrix_tensor_comp = adjacency_matrix_comp_dense.to(device)
 
-        best_MIS = 0
-        MIS = []
+        best_MIS = [0] * number_of_configurations
+        MIS = [torch.zeros(self.graph_order, dtype=torch.int32, device=device) for _ in range(number_of_configurations)]
+        track_this = [mean_vector] * number_of_configurations
+        checkpoint_solutions = [[] for _ in range(number_of_configurations)]
 
         if self.save_sample_path:
             solution_path = []
             solution_times = []
 
-        steps_to_best_MIS = 0
+        steps_to_best_MIS = [0] * number_of_configurations
 
         if self.number_of_terms == "three":
             per_sample_grad_funct = vmap(
-                three_term_grad_function, in_dims=(0, None, None, None, None)
+                three_term_grad_function, in_dims=(0, None, None, 0, 0)
             )
         else:
             per_sample_grad_funct = vmap(
-                two_term_grad_function, in_dims=(0, None, None)
+                two_term_grad_function, in_dims=(0, None, 0)
             )
 
         per_sample_velocity_update_funct = vmap(
-                velocity_update_function, in_dims=(0, 0, 0, None, None)
+                velocity_update_function, in_dims=(0, 0, 0, 0, 0)
             )
         
         if self.test_runtime:
@@ -302,23 +348,22 @@ class pCQOMIS_MGD(Solver):
                 memory_load_time = time.time()
                 memory_load_time_cum += memory_load_time - start_time
 
-        if device == "cuda:0":
-            torch.cuda.synchronize()
+        self._end_setup()
 
         for iteration_t in range(number_of_iterations_T):
 
             if self.number_of_terms == "three":
                 per_sample_gradients = per_sample_grad_funct(
                         Matrix_X,
-                        adjacency_matrix_tensor,
-                        adjacency_matrix_tensor_comp,
+                        adjacency_operator,
+                        adjacency_operator_comp,
                         gamma,
                         gamma_prime,
                     )
             else:
                 per_sample_gradients = per_sample_grad_funct(
                         Matrix_X,
-                        adjacency_matrix_tensor,
+                        adjacency_operator,
                         gamma,
                     )
 
@@ -349,61 +394,56 @@ class pCQOMIS_MGD(Solver):
                 box_constraint_time_cum += box_constraint_time - velocity_update_time
 
             if (iteration_t + 1) % self.steps_per_batch == 0:
-                masks = Matrix_X.bool().to(torch.float16)
-                n = self.graph_order
-
-                masks = masks.to(device)
-                indices_to_replace = []
-
-                for batch_id, X_torch_binarized in enumerate(masks):
-                    if X_torch_binarized.sum() != 0 and (X_torch_binarized.T @ adjacency_matrix_tensor @ X_torch_binarized) == 0:
-                        # we have an IS. Next, we check if this IS is maximal based on the proof of the second theorem: Basically, we are checking if it is a local min based on the fixed point definition:
-                        # if for some gradient update, we are still at the boundary, then we have maximal IS
-                        X_torch_binarized_update = X_torch_binarized - 0.1*(-torch.ones(n, device=device) + (n*adjacency_matrix_tensor - adjacency_matrix_tensor_comp)@X_torch_binarized)
-                        # Projection to [0,1]
-                        X_torch_binarized_update[X_torch_binarized_update>=1] =1
-                        X_torch_binarized_update[X_torch_binarized_update<=0] =0
-                        if torch.equal(X_torch_binarized, X_torch_binarized_update):
-                            initializations_solved += 1
-                            indices_to_replace.append(batch_id)
-                            # we have a maximal IS:
-                            MIS = torch.nonzero(X_torch_binarized).squeeze()
-                            # Exit the function with True
-                            if len(MIS) > best_MIS:
-                                steps_to_best_MIS = iteration_t + 1
-                                best_MIS = len(MIS)
-                                MIS = MIS
-                                track_this = X_torch_binarized
-                
+                masks = Matrix_X.bool()
+
+                # A row is a maximal IS when no selected node has a selected neighbour and every unselected
+                # node has one: exactly the rows that a projected gradient step leaves on the boundary
+                maximal, row_sizes = maximal_independent_rows(Matrix_X, adjacency_matrix_tensor)
+                maximal = maximal.view(number_of_configurations, -1)
+                sizes = torch.where(maximal, row_sizes.view(number_of_configurations, -1), 0)
+                best_rows = sizes.argmax(dim=1)
+
+                for k, (solved, best_row, size) in enumerate(
+                    zip(maximal.sum(dim=1).tolist(), best_rows.tolist(), sizes.amax(dim=1).tolist())
+                ):
+                    initializations_solved[k] += solved
+                    if solved and size > best_MIS[k]:
+                        if size > max(best_MIS):
+                            self._record_best()
+                        X_torch_binarized = masks[k * self.batch_size + best_row].to(torch.float16)
+                        steps_to_best_MIS[k] = iteration_t + 1
+                        best_MIS[k] = size
+                        MIS[k] = X_torch_binarized.int()
+                        track_this[k] = X_torch_binarized
+
                 if self.test_runtime:
                     torch.cuda.synchronize()
                     IS_check_time = time.time()
                     is_check_time_cum += IS_check_time - box_constraint_time
 
                 if iteration_t+1 in self.checkpoints:
-                    if device == "cuda:0":
-                        torch.cuda.synchronize()
                     self._stop_timer()
-                    self.solutions.append({
-                        "size": best_MIS,
-                        "number_of_steps": iteration_t+1,
-                        "steps_to_best_MIS": steps_to_best_MIS,
-                        "time": self.solution_time
-                        })
+                    for k in range(number_of_configurations):
+                        checkpoint_solutions[k].append({
+                            "size": best_MIS[k],
+                            "number_of_steps": iteration_t+1,
+                            "steps_to_best_MIS": steps_to_best_MIS[k],
+                            "time": self.solution_time
+                            })
                 if self.save_sample_path:
                     self._stop_timer()
-                    solution_path.append(best_MIS)
+                    solution_path.append(max(best_MIS))
                     solution_times.append(self.solution_time)
 
                 # Restart X and the optimizer to search at a different point in [0,1]^n
                 if self.sample_previous_batch_best:
-                    for batch in range(self.batch_size):
+                    for batch in range(number_of_rows):
                         self.value_initializer(
-                            track_this,
+                            track_this[batch // self.batch_size],
                             Matrix_X[batch, :]
                         )
                 else: 
-                    for batch in range(self.batch_size):
+                    for batch in range(number_of_rows):
                         self.value_initializer(
                             mean_vector,
                             Matrix_X[batch, :]
@@ -415,11 +455,9 @@ class pCQOMIS_MGD(Solver):
                     restart_time_cum += restart_time - IS_check_time
 
             if (iteration_t + 1) % self.output_interval == 0:
-                logger.info("Step %d/%d, IS: %s, lr: %s, MIS Size: %s", iteration_t + 1, number_of_iterations_T, MIS, learning_rate, best_MIS)
+                logger.info("Step %d/%d, lr: %s, MIS Size: %s", iteration_t + 1, number_of_iterations_T, self.learning_rate, best_MIS)
 
 
-        if device == "cuda:0":
-            torch.cuda.synchronize()
         self._stop_timer()
 
         logger.info("Steps to best MIS: %s", steps_to_best_MIS)
@@ -439,8 +477,22 @@ class pCQOMIS_MGD(Solver):
 
         logger.info("Initializations solved: %s", initializations_solved)
 
-        self.solution["graph_mask"] = MIS
-        self.solution["size"] = best_MIS
-        self.solution["number_of_steps"] = number_of_iterations_T
-        self.solution["steps_to_best_MIS"] = steps_to_best_MIS
-        self.solution["initializations_solved"] = initializations_solved
+        self.config_solutions = [
+            {
+                "params": configuration,
+                "solution": {
+                    "graph_mask": MIS[k],
+                    "size": best_MIS[k],
+                    "number_of_steps": number_of_iterations_T,
+                    "steps_to_best_MIS": steps_to_best_MIS[k],
+                    "initializations_solved": initializations_solved[k],
+                },
+                "solutions": checkpoint_solutions[k],
+            }
+            for k, configuration in enumerate(self.configurations)
+        ]
+
+        best_configuration = max(range(number_of_configurations), key=lambda k: best_MIS[k])
+        self.solution.update(self.config_solutions[best_configuration]["solution"])
+        self.solutions.extend(self.config_solutions[best_configuration]["solutions"])
+        torch.set_default_dtype(previous_default_dtype)
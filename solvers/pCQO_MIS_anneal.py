@@ -1,10 +1,10 @@
 import torch
 from torch.func import grad, vmap
 import torch.optim as optim
-import networkx as nx
 from networkx import Graph
 import time
 from lib.Solver import Solver
+from lib.adjacency import graph_edge_index, build_adjacency, degree_scaling_vector, AdjacencyOperator
 
 
 def three_term_loss_function(
@@ -15,8 +15,8 @@ def three_term_loss_function(
 
     Parameters:
         Matrix_X (torch.Tensor): The matrix of variable values.
-        adjacency_matrix_tensor (torch.Tensor): The adjacency matrix of the original graph.
-        adjacency_matrix_tensor_comp (torch.Tensor): The adjacency matrix of the complement graph.
+        adjacency_matrix_tensor (torch.Tensor or AdjacencyOperator): The adjacency matrix of the original graph.
+        adjacency_matrix_tensor_comp (torch.Tensor or AdjacencyOperator): The adjacency matrix of the complement graph.
         gamma (float): Regularization parameter for the adjacency matrix of the original graph.
         beta (float): Regularization parameter for the adjacency matrix of the complement graph.
 
@@ -25,8 +25,8 @@ def three_term_loss_function(
     """
     summed_weights = Matrix_X.sum()
 
-    second_term = (gamma / 2) * (Matrix_X.T @ (adjacency_matrix_tensor) @ Matrix_X)
-    third_term = (beta / 2) * ((Matrix_X.T @ (adjacency_matrix_tensor_comp)) @ Matrix_X)
+    second_term = (gamma / 2) * (Matrix_X @ (adjacency_matrix_tensor @ Matrix_X))
+    third_term = (beta / 2) * (Matrix_X @ (adjacency_matrix_tensor_comp @ Matrix_X))
 
     loss = -summed_weights + second_term - third_term
 
@@ -41,49 +41,20 @@ def two_term_loss_function(
 
     Parameters:
         Matrix_X (torch.Tensor): The matrix of variable values.
-        adjacency_matrix_tensor (torch.Tensor): The adjacency matrix of the original graph.
+        adjacency_matrix_tensor (torch.Tensor or AdjacencyOperator): The adjacency matrix of the original graph.
         gamma (float): Regularization parameter for the adjacency matrix of the original graph.
 
     Returns:
         torch.Tensor: The computed loss value.
     """
     summed_weights = Matrix_X.sum()
-    second_term = (gamma / 2) * (Matrix_X.T @ (adjacency_matrix_tensor) @ Matrix_X)
+    second_term = (gamma / 2) * (Matrix_X @ (adjacency_matrix_tensor @ Matrix_X))
 
     loss = -summed_weights + second_term
 
     return loss
 
 
-def normalize_adjacency_matrix(graph):
-    """
-    Normalizes the adjacency matrix of a graph.
-
-    Parameters:
-        graph (networkx.Graph): The graph whose adjacency matrix will be normalized.
-
-    Returns:
-        torch.Tensor: The normalized adjacency matrix as a PyTorch tensor.
-    """
-    # Get the adjacency matrix
-    adjacency_matrix = nx.adjacency_matrix(graph).todense()
-
-    # Convert to PyTorch tensor
-    adjacency_matrix = torch.Tensor(adjacency_matrix)
-
-    # Calculate the degree matrix
-    degree_matrix = torch.diag(torch.tensor(list(dict(graph.degree()).values())))
-
-    # Normalize the adjacency matrix
-    normalized_adjacency = (
-        torch.inverse(torch.sqrt(degree_matrix))
-        @ adjacency_matrix
-        @ torch.inverse(torch.sqrt(degree_matrix)).to_dense()
-    )
-
-    return normalized_adjacency
-
-
 class pCQOMIS_anneal(Solver):
     """
     Solver for the Maximum Independent Set (MIS) problem using a Quadratic Optimization approach with 
@@ -103,8 +74,10 @@ class pCQOMIS_anneal(Solver):
             - graphs_per_optimizer (int, optional): Number of graphs per optimizer. Defaults to 128.
             - threshold (float, optional): Threshold for binarization of solutions. Defaults to 0.0.
             - seed (int, optional): Random seed for initialization. Defaults to 113.
-            - normalize (bool, optional): Whether to normalize adjacency matrices. Defaults to False.
-            - combine (bool, optional): Whether to combine original and normalized adjacency matrices. Defaults to False.
+            - normalize (bool, optional): Whether to use the degree-normalized adjacency matrices D^(-1/2) A D^(-1/2)
+              in the loss. Applied as row and column scaling, without building normalized matrices. Defaults to False.
+            - combine (bool, optional): Whether to use the sum of the original and normalized adjacency matrices
+              in the loss. Defaults to False.
             - value_initializer (str, optional): Method for initializing values ("random" or "degree"). Defaults to "random".
             - value_initializer_std (float, optional): Standard deviation for random initialization (only applies to "degree-based" initializations). Defaults to 2.25.
             - test_runtime (bool, optional): Whether to test runtime performance. Defaults to False.
@@ -113,6 +86,9 @@ class pCQOMIS_anneal(Solver):
             - adam_beta_2 (float, optional): Beta2 parameter for Adam optimizer. Defaults to 0.999.
     """
 
+    # Torch intra-op threads used when run by a parallel scheduler
+    default_threads = 4
+
     def __init__(self, G: Graph, params):
         """
         Initializes the pCQOMIS solver with the given graph and parameters.
@@ -135,7 +111,7 @@ class pCQOMIS_anneal(Solver):
         self.output_interval = params.get("output_interval", self.steps_per_batch)
         self.graphs_per_optimizer = params.get("graphs_per_optimizer", 128)
         self.threshold = params.get("threshold", 0.0)
-        self.seed = 113
+        self.seed = params.get("seed", 113)
         self.graph_order = len(G.nodes)
         self.solution = {}
         self.normalize = params.get("normalize", False)
@@ -186,7 +162,8 @@ class pCQOMIS_anneal(Solver):
 
         Outputs:
             - self.solution (dict): Contains the results of the MIS computation:
-                - graph_mask (torch.Tensor): Tensor where 1s denote nodes in the MIS.
+                - graph_mask (torch.Tensor): 0/1 tensor over the nodes, in iteration order, where 1s denote
+                  nodes in the MIS (all 0s if no initialization reached a maximal IS).
                 - size (int): Size of the best MIS found.
                 - number_of_steps (int): Total number of training steps performed.
                 - steps_to_best_MIS (int): Number of steps to reach the best MIS.
@@ -195,29 +172,10 @@ class pCQOMIS_anneal(Solver):
 
         self._start_timer()
 
-        if not self.normalize or self.combine:
-            adjacency_matrix_dense = torch.Tensor(
-                nx.adjacency_matrix(self.graph).todense()
-            ).to_dense()
-            adjacency_matrix_comp_dense = torch.Tensor(
-                nx.adjacency_matrix(nx.complement(self.graph)).todense()
-            ).to_dense()
-        if self.normalize or self.combine:
-            normalized_adjacency_matrix_dense = normalize_adjacency_matrix(self.graph)
-            normalized_adjacency_matrix_comp_dense = normalize_adjacency_matrix(
-                nx.complement(self.graph)
-            )
-        if self.combine:
-            adjacency_matrix_dense = torch.stack(
-                (adjacency_matrix_dense, normalized_adjacency_matrix_dense), dim=0
-            )
-            adjacency_matrix_comp_dense = torch.stack(
-                (adjacency_matrix_comp_dense, normalized_adjacency_matrix_comp_dense),
-                dim=0,
-            )
-        elif self.normalize:
-            adjacency_matrix_dense = normalized_adjacency_matrix_dense
-            adjacency_matrix_comp_dense = normalized_adjacency_matrix_comp_dense
+        with self._memory_phase("build"):
+            graph_order, edges = graph_edge_index(self.graph)
+            adjacency_matrix_dense = build_adjacency(graph_order, edges, dtype=torch.float32)
+            adjacency_matrix_comp_dense = build_adjacency(graph_order, edges, dtype=torch.float32, complement=True)
 
         # Optimization loop:
         # Initialization:
@@ -225,6 +183,7 @@ class pCQOMIS_anneal(Solver):
 
         device = torch.device("cuda:0" if torch.cuda.is_available() else "cpu")
         print("using device: ", device)
+        self.timing_device = device
 
         Matrix_X = torch.empty((self.batch_size, self.graph_order))
 
@@ -245,6 +204,21 @@ class pCQOMIS_anneal(Solver):
         adjacency_matrix_tensor = adjacency_matrix_dense.to(device)
         adjacency_matrix_tensor_comp = adjacency_matrix_comp_dense.to(device)
 
+        # The loss sees A (or its normalization) through an operator applying the degree scaling
+        # as vectors around A @ X, while IS checks always use the unnormalized matrices
+        if self.combine:
+            operator_mode = "combine"
+        elif self.normalize:
+            operator_mode = "normalize"
+        else:
+            operator_mode = "raw"
+        adjacency_operator = AdjacencyOperator(
+            adjacency_matrix_tensor, degree_scaling_vector(adjacency_matrix_tensor), operator_mode
+        )
+        adjacency_operator_comp = AdjacencyOperator(
+            adjacency_matrix_tensor_comp, degree_scaling_vector(adjacency_matrix_tensor_comp), operator_mode
+        )
+
         # Define Optimizer over matrix X
         with torch.no_grad():
             parts = torch.split(Matrix_X, self.graphs_per_optimizer)
@@ -255,7 +229,7 @@ class pCQOMIS_anneal(Solver):
             optimizers.append(optim.Adam([part], learning_rate_alpha, betas=(self.adam_beta_1, self.adam_beta_2)))
 
         best_MIS = 0
-        MIS = []
+        MIS = torch.zeros(self.graph_order, dtype=torch.int32, device=device)
 
         zero_grad_time_cum = 0
         per_sample_grad_time_cum = 0
@@ -281,8 +255,7 @@ class pCQOMIS_anneal(Solver):
                 grad(two_term_loss_function), in_dims=(0, None, None)
             )
 
-        if device == "cuda:0":
-            torch.cuda.synchronize()
+        self._end_setup()
 
         for iteration_t in range(number_of_iterations_T):
             gamma += gamma_step
@@ -302,8 +275,8 @@ class pCQOMIS_anneal(Solver):
                 per_sample_gradients = torch.split(
                     per_sample_grad_funct(
                         Matrix_X,
-                        adjacency_matrix_tensor,
-                        adjacency_matrix_tensor_comp,
+                        adjacency_operator,
+                        adjacency_operator_comp,
                         gamma,
                         beta,
                     ),
@@ -313,7 +286,7 @@ class pCQOMIS_anneal(Solver):
                 per_sample_gradients = torch.split(
                     per_sample_grad_funct(
                         Matrix_X,
-                        adjacency_matrix_tensor,
+                        adjacency_operator,
                         gamma,
                     ),
                     self.graphs_per_optimizer,
@@ -354,7 +327,7 @@ class pCQOMIS_anneal(Solver):
                 indices_to_replace = []
 
                 for batch_id, X_torch_binarized in enumerate(masks):
-                    if X_torch_binarized.sum() != 0 and (X_torch_binarized.T @ adjacency_matrix_tensor @ X_torch_binarized) == 0:
+                    if X_torch_binarized.sum() != 0 and (X_torch_binarized @ (adjacency_matrix_tensor @ X_torch_binarized)) == 0:
                         # we have an IS. Next, we check if this IS is maximal based on the proof of the second theorem: Basically, we are checking if it is a local min based on the fixed point definition:
                         # if for some gradient update, we are still at the boundary, then we have maximal IS
                         X_torch_binarized_update = X_torch_binarized - 0.1*(-torch.ones(n, device=device) + (n*adjacency_matrix_tensor - adjacency_matrix_tensor_comp)@X_torch_binarized)
@@ -365,12 +338,12 @@ class pCQOMIS_anneal(Solver):
                             initializations_solved += 1
                             indices_to_replace.append(batch_id)
                             # we have a maximal IS:
-                            MIS = torch.nonzero(X_torch_binarized).squeeze()
-                            # Exit the function with True
-                            if len(MIS) > best_MIS:
+                            size = int(X_torch_binarized.sum())
+                            if size > best_MIS:
+                                self._record_best()
                                 steps_to_best_MIS = iteration_t + 1
-                                best_MIS = len(MIS)
-                                MIS = MIS
+                                best_MIS = size
+                                MIS = X_torch_binarized.int()
                 
                 if self.test_runtime:
                     torch.cuda.synchronize()
@@ -400,8 +373,6 @@ class pCQOMIS_anneal(Solver):
                     f"Step {iteration_t + 1}/{number_of_iterations_T}, IS: {MIS}, lr: {learning_rate_alpha}, MIS Size: {best_MIS}"
                 )
 
-        if device == "cuda:0":
-            torch.cuda.synchronize()
         self._stop_timer()
 
         if self.save_sample_path:
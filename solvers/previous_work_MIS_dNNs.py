@@ -1,8 +1,41 @@
 import torch
 from torch import Tensor
 from lib.Solver import Solver
-from models.datalessnet import DatalessNet
-import networkx as nx
+from lib.adjacency import graph_edge_index, build_adjacency, AdjacencyOperator
+from models.datalessnet import DatalessNet, generate_theta_weight
+
+
+def max_degree_repair(adjacency_operator, selected):
+    """
+    Turns node selections into independent sets by repeatedly removing a node of maximum degree in the
+    subgraph induced by each selection, until no selected node has a selected neighbour.
+
+    Every round removes one node per unfinished row, the first node of maximum degree as networkx
+    iteration would find it, so a single row gives the result of the node-by-node removal on a networkx
+    subgraph. Ties are broken explicitly through a unique priority, degree * n - index, since the index
+    `max` returns among equal values is not specified on every device. Degrees within the selections are
+    recomputed with one product with the adjacency operator per round.
+
+    Args:
+        adjacency_operator (AdjacencyOperator): Operator applying the (n, n) adjacency matrix.
+        selected (torch.Tensor): Boolean (batch_size, n) selections.
+
+    Returns:
+        torch.Tensor: Boolean (batch_size, n) independent sets.
+    """
+    selected = selected.clone()
+    number_of_nodes = selected.shape[1]
+    rows = torch.arange(selected.shape[0], device=selected.device)
+    reversed_index = torch.arange(number_of_nodes - 1, -1, -1, device=selected.device)
+    while True:
+        values = selected.to(adjacency_operator.adjacency.dtype)
+        degrees = ((adjacency_operator @ values.T).T * values).round().to(torch.int64)
+        nodes = (degrees * number_of_nodes + reversed_index).argmax(dim=1)
+        unfinished = degrees[rows, nodes] > 0
+        if not unfinished.any():
+            return selected
+        selected[rows[unfinished], nodes[unfinished]] = False
+
 
 class DNNMIS(Solver):
     """
@@ -10,6 +43,10 @@ class DNNMIS(Solver):
     dataless neural network model. The neural network is trained to predict theta values
     which are then used to determine the MIS.
 
+    A batch of theta initializations is trained at once: the first is the degree-based initialization
+    of the network, the others add uniform noise to it. Every start is thresholded and repaired into an
+    independent set, and the largest one is reported.
+
     Parameters:
         G (networkx.Graph): The graph on which the MIS problem will be solved.
         params (dict): Dictionary containing solver parameters:
@@ -17,8 +54,16 @@ class DNNMIS(Solver):
             - selection_criteria (float, optional): Threshold for selecting nodes based on theta values. Defaults to 0.5.
             - learning_rate (float, optional): Learning rate for the optimizer. Defaults to 0.0001.
             - use_cpu (bool, optional): Flag to use CPU for computations instead of GPU. Defaults to False.
+            - seed (int, optional): Random seed of the network initialization. Defaults to None (unseeded).
+            - batch_size (int, optional): Number of theta initializations trained at once. Defaults to 1.
+            - init_noise (float, optional): Width of the uniform noise added to the degree-based initialization
+              of every start but the first. Defaults to 0.1.
+            - time_limit (float, optional): Training stops after this many seconds. Defaults to None.
     """
 
+    # Torch intra-op threads used when run by a parallel scheduler
+    default_threads = 4
+
     def __init__(self, G, params):
         """
         Initializes the DNNMIS solver with the given graph and parameters.
@@ -32,15 +77,25 @@ class DNNMIS(Solver):
         self.learning_rate = params.get("learning_rate", 0.0001)
         self.max_steps = params.get("max_steps", 100000)
         self.use_cpu = params.get("use_cpu", False)
+        self.seed = params.get("seed", None)
+        self.batch_size = params.get("batch_size", 1)
+        self.init_noise = params.get("init_noise", 0.1)
+        self.time_limit = params.get("time_limit", None)
+
+        if self.seed is not None:
+            torch.manual_seed(self.seed)
 
         self.graph = G
         self.graph_order = len(G.nodes)
         print(self.graph_order)
 
-        self.model = DatalessNet(G)
+        theta = generate_theta_weight(G, self.graph_order).detach().repeat(self.batch_size, 1)
+        theta[1:] += self.init_noise * torch.rand(self.batch_size - 1, self.graph_order)
+
+        self.model = DatalessNet(G, theta)
         self.optimizer = torch.optim.Adam(self.model.parameters(), lr=self.learning_rate)
         self.loss_fn = lambda predicted, desired: predicted - desired
-        
+
         self.x = torch.ones(self.graph_order)
         self.objective = torch.tensor(-(self.graph_order ** 2) / 2)
         self.solution = {}
@@ -50,74 +105,74 @@ class DNNMIS(Solver):
         Trains the neural network model to find the Maximum Independent Set (MIS) of the graph.
 
         The method performs the following steps:
-        1. Trains the model for a specified number of steps.
+        1. Trains the batch of theta initializations for a specified number of steps or until the time limit.
         2. Evaluates the model to get theta values.
-        3. Applies a selection criterion to determine which nodes are in the MIS.
-        4. Constructs the MIS by iteratively removing nodes with the highest degree from the subgraph.
-        5. Records the solution details including the graph mask, size of the MIS, and number of training steps.
+        3. Applies a selection criterion to determine which nodes each start selects.
+        4. Repairs every selection into an independent set by removing nodes of maximum degree (see
+           `max_degree_repair`).
+        5. Records the solution details of the largest independent set and the sizes of all starts.
 
         Outputs:
             - self.solution (dict): Contains the results of the MIS computation:
                 - graph_mask (list of int): List where 1s denote nodes in the MIS.
-                - graph_probabilities (list of float): Theta weight results for each node in the graph.
+                - graph_probabilities (list of float): Theta weight results of the best start for each node in the graph.
                 - size (int): Size of the MIS.
+                - start_sizes (list of int): Size of the independent set of every start.
+                - best_start (int): Index of the start the MIS comes from.
                 - number_of_steps (int): Number of training steps performed.
                 - steps_to_best_MIS (int): Number of steps to reach the best MIS (currently set to 0).
         """
         device = torch.device("cuda:0" if torch.cuda.is_available() and not self.use_cpu else "cpu")
         print("using device: ", device)
 
+        self.timing_device = device
+        self._start_timer()
+
         self.model = self.model.to(device)
         self.x = self.x.to(device)
         self.objective = self.objective.to(device)
+        self._end_setup()
 
-        self._start_timer()
-
+        # Starts are independent: Adam updates every entry of theta on its own
+        steps = 0
         for i in range(self.max_steps):
+            if self.time_limit is not None and self._elapsed(synchronize_device=False) > self.time_limit:
+                break
+
             self.optimizer.zero_grad()
 
             predicted: Tensor = self.model(self.x)
 
-            output = self.loss_fn(predicted, self.objective)
+            output = self.loss_fn(predicted, self.objective).sum()
 
             output.backward()
             self.optimizer.step()
+            steps = i + 1
 
             if i % 500 == 0:
                 print(
-                    f"Training step: {i}, Output: {predicted.item():.4f}, Desired Output: {self.objective.item():.4f}"
+                    f"Training step: {i}, Output: {predicted.min().item():.4f}, Desired Output: {self.objective.item():.4f}"
                 )
 
+        with torch.no_grad():
+            theta = self.model.theta_layer.weight.clamp(0, 1).reshape(self.batch_size, self.graph_order)
+            number_of_nodes, edges = graph_edge_index(self.graph)
+            adjacency = build_adjacency(number_of_nodes, edges, dtype=torch.float32, layout="csr", device=device)
+            independent_sets = max_degree_repair(AdjacencyOperator(adjacency), theta >= self.selection_criteria)
+            start_sizes = independent_sets.sum(dim=1)
+            best_start = int(torch.argmax(start_sizes))
+
+        # The repaired sets are the only solutions, so the best one is found when the solve ends
+        self._record_best()
         self._stop_timer()
 
-        self.solution["graph_probabilities"] = self.model.theta_layer.weight.detach().tolist()
-
-        graph_mask = [0 if x < self.selection_criteria else 1 for x in self.solution["graph_probabilities"]]
-        indices = [i for i, x in enumerate(graph_mask) if x == 1]
-
-        subgraph = self.graph.subgraph(indices)
-        subgraph = nx.Graph(subgraph)
-        while len(subgraph) > 0:
-            degrees = dict(subgraph.degree())
-            max_degree_nodes = [
-                node
-                for node, degree in degrees.items()
-                if degree == max(degrees.values())
-            ]
-
-            if (
-                len(max_degree_nodes) == 0
-                or subgraph.degree(max_degree_nodes[0]) == 0
-            ):
-                break  # No more nodes to remove or all remaining nodes have degree 0
-
-            subgraph.remove_node(max_degree_nodes[0])
-        IS_size = len(subgraph)
-        MIS_size = IS_size
-        MIS_mask = graph_mask
+        MIS_size = int(start_sizes[best_start])
         print(f"Found MIS of size: {MIS_size}")
 
-        self.solution["graph_mask"] = MIS_mask
+        self.solution["graph_probabilities"] = theta[best_start].tolist()
+        self.solution["graph_mask"] = independent_sets[best_start].int().tolist()
         self.solution["size"] = MIS_size
-        self.solution["number_of_steps"] = i
+        self.solution["start_sizes"] = start_sizes.tolist()
+        self.solution["best_start"] = best_start
+        self.solution["number_of_steps"] = steps
         self.solution["steps_to_best_MIS"] = 0
@@ -0,0 +1,32 @@
+import os
+import sys
+import importlib
+
+import pytest
+
+import fake_gurobipy as fake_gurobipy_module
+
+TESTS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def fake_redumis(tmp_path):
+    """
+    Returns the path of an executable running tests/fake_redumis.py, to pass as "redumis_path".
+    """
+    path = tmp_path / "redumis"
+    path.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{os.path.join(TESTS_DIRECTORY, "fake_redumis.py")}" "$@"\n')
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture
+def fake_gurobi_mis(monkeypatch):
+    """
+    Returns the GurobiMIS class imported against tests/fake_gurobipy.py in place of gurobipy, whether or
+    not the real package is installed. The solver module is unloaded again afterwards.
+    """
+    monkeypatch.setitem(sys.modules, "gurobipy", fake_gurobipy_module)
+    sys.modules.pop("solvers.Gurobi_MIS", None)
+    yield importlib.import_module("solvers.Gurobi_MIS").GurobiMIS
+    sys.modules.pop("solvers.Gurobi_MIS", None)
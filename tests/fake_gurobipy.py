@@ -0,0 +1,180 @@
+import time
+
+import numpy as np
+
+# Minimal stand-in for the part of gurobipy that GurobiMIS uses, so the solver can be tested on
+# machines without a Gurobi license. The "optimizer" is a greedy heuristic for the set packing
+# problem max sum(x) s.t. A x <= 1, x binary: it repairs the MIP start, if any, into a feasible
+# incumbent and extends it greedily by increasing number of constraints per variable, reporting every
+# improving incumbent to the callback. It never proves optimality, except for an incumbent selecting
+# every variable, so finished models report GRB.TIME_LIMIT with the trivial bound.
+#
+# Tests get GurobiMIS bound to this module through the `fake_gurobi_mis` fixture of tests/conftest.py.
+
+
+class GurobiError(Exception):
+    pass
+
+
+class GRB:
+    BINARY = "B"
+    CONTINUOUS = "C"
+    MAXIMIZE = -1
+    MINIMIZE = 1
+    LESS_EQUAL = "<"
+    GREATER_EQUAL = ">"
+    EQUAL = "="
+    INFINITY = 1e100
+
+    LOADED = 1
+    OPTIMAL = 2
+    INFEASIBLE = 3
+    TIME_LIMIT = 9
+
+    class Callback:
+        POLLING = 0
+        PRESOLVE = 1
+        SIMPLEX = 2
+        MIP = 3
+        MIPSOL = 4
+        MIPNODE = 5
+        MIP_OBJBST = 3000
+        MIP_OBJBND = 3001
+        MIPSOL_OBJ = 4002
+
+
+class LinearExpression:
+    """
+    Sum of the variables of an MVar, the only objective GurobiMIS builds.
+    """
+
+    def __init__(self, variables):
+        self.variables = variables
+
+
+class MVar:
+    """
+    Vector of variables with the Start (MIP start) and X (solution) attributes.
+    """
+
+    def __init__(self, model, size, vtype, name):
+        self.model = model
+        self.shape = (size,)
+        self.vtype = vtype
+        self.VarName = name
+        self.Start = np.full(size, GRB.INFINITY)
+        self._x = None
+
+    def __len__(self):
+        return self.shape[0]
+
+    def sum(self):
+        return LinearExpression(self)
+
+    @property
+    def X(self):
+        if self._x is None:
+            raise GurobiError("Unable to retrieve attribute 'X'")
+        return self._x.astype(np.float64)
+
+
+class Model:
+    """
+    Model holding one binary MVar, set packing constraints added with addMConstr and a sum objective.
+    """
+
+    def __init__(self, name=""):
+        self.ModelName = name
+        self.params = {}
+        self.variables = None
+        self.constraints = []
+        self.objective = None
+        self.sense = GRB.MINIMIZE
+        self.status = GRB.LOADED
+        self.Runtime = 0.0
+        self.ObjVal = None
+        self.ObjBound = None
+        self.SolCount = 0
+        self._incumbent = None
+
+    def setParam(self, name, value):
+        self.params[name] = value
+
+    def addMVar(self, shape, vtype=GRB.CONTINUOUS, name=""):
+        if self.variables is not None:
+            raise GurobiError("The fake gurobipy supports a single MVar per model")
+        self.variables = MVar(self, int(np.prod(shape)), vtype, name)
+        return self.variables
+
+    def addMConstr(self, A, x, sense, b, name=""):
+        if x is not self.variables or sense != GRB.LESS_EQUAL or not np.all(np.asarray(b) == 1):
+            raise GurobiError("The fake gurobipy only supports constraints A x <= 1 over the model's MVar")
+        self.constraints.append(A.tocsr())
+
+    def setObjective(self, expression, sense=GRB.MINIMIZE):
+        self.objective = expression
+        self.sense = sense
+
+    def update(self):
+        pass
+
+    def cbGet(self, what):
+        if what in (GRB.Callback.MIP_OBJBST, GRB.Callback.MIPSOL_OBJ):
+            return float(self._incumbent.sum()) if self._incumbent is not None else -GRB.INFINITY
+        if what == GRB.Callback.MIP_OBJBND:
+            return float(len(self.variables))
+        raise GurobiError(f"Unknown callback query {what}")
+
+    def _improve(self, incumbent, callback):
+        if self._incumbent is None or incumbent.sum() > self._incumbent.sum():
+            self._incumbent = incumbent.copy()
+            if callback is not None:
+                callback(self, GRB.Callback.MIP)
+
+    def optimize(self, callback=None):
+        start = time.time()
+        number_of_variables = len(self.variables)
+        constraints = [matrix for matrix in self.constraints]
+        rows_of = [matrix.tocsc() for matrix in constraints]
+        load = [np.zeros(matrix.shape[0], dtype=np.int64) for matrix in constraints]
+
+        def fits(node):
+            return all(
+                not load[k][rows_of[k].indices[rows_of[k].indptr[node]:rows_of[k].indptr[node + 1]]].any()
+                for k in range(len(constraints))
+            )
+
+        def select(node, incumbent):
+            incumbent[node] = True
+            for k in range(len(constraints)):
+                load[k][rows_of[k].indices[rows_of[k].indptr[node]:rows_of[k].indptr[node + 1]]] += 1
+
+        # Repair the MIP start: keep its variables set to 1 as long as they fit
+        incumbent = np.zeros(number_of_variables, dtype=bool)
+        start_values = np.asarray(self.variables.Start, dtype=np.float64)
+        for node in np.flatnonzero((start_values > 0.5) & (start_values < GRB.INFINITY)):
+            if fits(node):
+                select(node, incumbent)
+        self._improve(incumbent, callback)
+
+        # Greedy extension by increasing number of constraints per variable
+        memberships = sum(np.diff(matrix.indptr) for matrix in rows_of) if rows_of else np.zeros(number_of_variables)
+        time_limit = self.params.get("TimeLimit", GRB.INFINITY)
+        for node in np.argsort(memberships, kind="stable"):
+            if time.time() - start > time_limit:
+                break
+            if not incumbent[node] and fits(node):
+                select(node, incumbent)
+                self._improve(incumbent, callback)
+
+        self.variables._x = self._incumbent.astype(np.int64)
+        self.ObjVal = float(self._incumbent.sum())
+        self.ObjBound = float(number_of_variables)
+        self.SolCount = 1
+        self.status = GRB.OPTIMAL if self.ObjVal == self.ObjBound else GRB.TIME_LIMIT
+        self.Runtime = time.time() - start
+
+
+def quicksum(terms):
+    return sum(terms)
+
@@ -0,0 +1,66 @@
+"""
+Stand-in for the ReduMIS executable, run by the `fake_redumis` fixture.
+
+It reads the METIS graph, takes the nodes of a greedy independent set one by one, one every
+FAKE_REDUMIS_STEP * (seed + 1) seconds, and logs each improvement with --console_log. Like ReduMIS, it
+then keeps searching until its --time_limit, and only writes its solution and result block when the
+limit is reached: a run stopped by a signal writes nothing. FAKE_REDUMIS_IGNORE_TIME_LIMIT makes it run
+until killed, and FAKE_REDUMIS_EXIT makes it fail at once with that status. It starts its log with the
+paths of its graph and output files.
+"""
+import os
+import sys
+import time
+
+start = time.perf_counter()
+graph_path = sys.argv[1]
+options = dict(argument[2:].partition("=")[::2] for argument in sys.argv[2:])
+
+if "FAKE_REDUMIS_EXIT" in os.environ:
+    print("fake redumis failure", file=sys.stderr)
+    sys.exit(int(os.environ["FAKE_REDUMIS_EXIT"]))
+
+print(f"Graph: {graph_path}", flush=True)
+print(f"Output: {options['output']}", flush=True)
+
+with open(graph_path) as f:
+    lines = f.read().split("\n")
+number_of_nodes = int(lines[0].split()[0])
+neighbors = [[int(token) - 1 for token in line.split()] for line in lines[1 : number_of_nodes + 1]]
+
+independent_set = []
+blocked = set()
+for node in range(number_of_nodes):
+    if node not in blocked:
+        independent_set.append(node)
+        blocked.update(neighbors[node])
+        blocked.add(node)
+
+seed = int(options.get("seed", 0))
+step = float(os.environ.get("FAKE_REDUMIS_STEP", "0.01")) * (seed + 1)
+time_limit = float(options["time_limit"]) if "time_limit" in options else None
+if os.environ.get("FAKE_REDUMIS_IGNORE_TIME_LIMIT"):
+    time_limit = float("inf")
+
+size = 0
+time_found = 0.0
+while size < len(independent_set):
+    time.sleep(step)
+    if time_limit is not None and time.perf_counter() - start > time_limit:
+        break
+    size += 1
+    time_found = time.perf_counter() - start
+    if "console_log" in options:
+        print(f"Size: {size}", flush=True)
+
+if time_limit is not None:
+    while time.perf_counter() - start < time_limit:
+        time.sleep(0.01)
+
+mask = [0] * number_of_nodes
+for node in independent_set[:size]:
+    mask[node] = 1
+with open(options["output"], "w") as f:
+    f.write("".join(f"{value}\n" for value in mask))
+print(f"Time found:   {time_found:.3f}")
+print(f"Size:         {size}")
@@ -0,0 +1,150 @@
+import networkx as nx
+import numpy as np
+import pytest
+import torch
+from torch.func import vmap
+
+from lib.adjacency import (
+    AdjacencyOperator,
+    adjacency_from_graph,
+    build_adjacency,
+    degree_scaling_vector,
+    graph_edge_index,
+)
+
+
+def dense_normalization(adjacency):
+    """
+    D^(-1/2) A D^(-1/2) with D the row sums of A, degree-0 rows and columns left at 0.
+    """
+    degrees = adjacency.sum(axis=1)
+    scaling = np.divide(1, np.sqrt(degrees), out=np.zeros_like(degrees), where=degrees > 0)
+    return scaling[:, None] * adjacency * scaling[None, :]
+
+
+def expected_product(adjacency, mode, X):
+    matrix = {
+        "raw": adjacency,
+        "normalize": dense_normalization(adjacency),
+        "combine": adjacency + dense_normalization(adjacency),
+    }[mode]
+    return matrix @ X
+
+
+def graph_with_isolated_node():
+    G = nx.gnm_random_graph(12, 25, seed=1)
+    G.remove_edges_from(list(G.edges(11)))
+    return G
+
+
+GRAPHS = {"connected": nx.petersen_graph(), "isolated node": graph_with_isolated_node()}
+
+
+@pytest.mark.parametrize("name", GRAPHS)
+@pytest.mark.parametrize("mode", AdjacencyOperator.MODES)
+@pytest.mark.parametrize("layout", ["dense", "csr"])
+def test_operator_matches_the_dense_formula(name, mode, layout):
+    G = GRAPHS[name]
+    adjacency = adjacency_from_graph(G, dtype=torch.float64, layout=layout)
+    operator = AdjacencyOperator(adjacency, degree_scaling_vector(adjacency), mode)
+    dense = nx.to_numpy_array(G)
+    X = torch.rand(G.number_of_nodes(), 3, dtype=torch.float64, generator=torch.Generator().manual_seed(0))
+
+    np.testing.assert_allclose(operator @ X, expected_product(dense, mode, X.numpy()), rtol=1e-12)
+    np.testing.assert_allclose(operator @ X[:, 0], expected_product(dense, mode, X[:, 0].numpy()), rtol=1e-12)
+    assert torch.isfinite(operator @ X).all()
+
+
+@pytest.mark.parametrize("mode", AdjacencyOperator.MODES)
+def test_operator_works_inside_vmap(mode):
+    adjacency = adjacency_from_graph(nx.petersen_graph(), dtype=torch.float64)
+    operator = AdjacencyOperator(adjacency, degree_scaling_vector(adjacency), mode)
+    X = torch.rand(4, 10, dtype=torch.float64)
+
+    np.testing.assert_allclose(vmap(lambda x: operator @ x)(X), (operator @ X.T).T, rtol=1e-12)
+
+
+def test_normalization_equals_the_former_degree_matrix_formula():
+    # Without self-loops or isolated nodes the row sums are the networkx degrees
+    G = nx.gnm_random_graph(15, 40, seed=2)
+    dense = torch.tensor(nx.to_numpy_array(G))
+    inverse_root = torch.inverse(torch.sqrt(torch.diag(torch.tensor([d for _, d in G.degree()], dtype=torch.float64))))
+    former = inverse_root @ dense @ inverse_root
+
+    adjacency = adjacency_from_graph(G, dtype=torch.float64)
+    operator = AdjacencyOperator(adjacency, degree_scaling_vector(adjacency), "normalize")
+    np.testing.assert_allclose(operator @ torch.eye(15, dtype=torch.float64), former, rtol=1e-12)
+
+
+def test_self_loop_counts_once_and_isolated_nodes_scale_to_zero():
+    G = nx.path_graph(3)
+    G.add_edge(2, 2)
+    G.add_node(3)
+    scaling = degree_scaling_vector(adjacency_from_graph(G, dtype=torch.float64))
+
+    # networkx counts the loop of node 2 twice, giving degree 3, while row 2 of A sums to 2
+    assert dict(G.degree())[2] == 3
+    np.testing.assert_allclose(scaling, [1, 2**-0.5, 2**-0.5, 0])
+
+
+def labelled_graph():
+    # Non-integer labels, in an insertion order unrelated to their sort order, with isolated nodes
+    G = nx.Graph()
+    G.add_nodes_from(["z", (1, 2), "a", 3.5, "isolated", "b"])
+    G.add_edges_from([("z", "a"), ((1, 2), "z"), (3.5, "b"), ("a", 3.5), ("b", "z")])
+    G.add_node("last isolated")
+    return G
+
+
+def looped_graph():
+    G = nx.gnm_random_graph(10, 20, seed=3)
+    G.add_edges_from([(4, 4), (7, 7)])
+    return G
+
+
+BUILD_GRAPHS = {
+    "labelled": labelled_graph(),
+    "edgeless": nx.empty_graph(4),
+    "self-loops": looped_graph(),
+    "integer labels out of order": nx.relabel_nodes(nx.path_graph(6), {i: 5 - i for i in range(6)}),
+}
+
+
+@pytest.mark.parametrize("name", BUILD_GRAPHS)
+@pytest.mark.parametrize("layout", ["dense", "csr"])
+def test_adjacency_equals_networkx(name, layout):
+    G = BUILD_GRAPHS[name]
+    adjacency = adjacency_from_graph(G, dtype=torch.float32, layout=layout)
+
+    assert adjacency.shape == (G.number_of_nodes(), G.number_of_nodes())
+    np.testing.assert_array_equal(adjacency.to_dense(), nx.adjacency_matrix(G).toarray())
+
+
+@pytest.mark.parametrize("name", BUILD_GRAPHS)
+def test_complement_equals_networkx(name):
+    G = BUILD_GRAPHS[name]
+    complement = adjacency_from_graph(G, dtype=torch.float32, complement=True)
+
+    np.testing.assert_array_equal(complement, nx.adjacency_matrix(nx.complement(G), nodelist=list(G)).toarray())
+
+
+def test_edge_index_numbers_nodes_in_iteration_order():
+    number_of_nodes, edges = graph_edge_index(labelled_graph())
+
+    position = {node: i for i, node in enumerate(labelled_graph())}
+    assert number_of_nodes == 7
+    assert sorted(map(sorted, edges.tolist())) == sorted(
+        sorted((position[u], position[v])) for u, v in labelled_graph().edges
+    )
+
+
+@pytest.mark.parametrize("layout, complement", [("dense", False), ("dense", True), ("csr", False)])
+def test_empty_graph_gives_empty_matrices(layout, complement):
+    # nx.adjacency_matrix raises on graphs without nodes
+    adjacency = build_adjacency(0, np.zeros((0, 2), dtype=np.int64), layout=layout, complement=complement)
+    assert adjacency.shape == (0, 0)
+
+
+def test_complement_is_rejected_for_the_csr_layout():
+    with pytest.raises(ValueError):
+        adjacency_from_graph(nx.path_graph(3), layout="csr", complement=True)
@@ -0,0 +1,79 @@
+import json
+
+from lib.benchmark_spec import build_jobs, expand_solver_grid, grid_points, list_spec_graphs, load_spec
+
+
+def generated_spec(**overrides):
+    spec = {
+        "name": "test",
+        "datasets": [{"name": "ER", "generator": "er", "grid": {"n,p": [[20, 0.1], [30, 0.2]]}, "seeds": [0, 1]}],
+        "solvers": [
+            {"name": "ReduMIS", "class": "ReduMIS", "params": {"time_limit": 1}},
+            {"name": "CPSAT", "class": "CPSATMIS", "threads": 2, "params": {"time_limit": 1}},
+        ],
+        "seeds": [None],
+    }
+    spec.update(overrides)
+    return spec
+
+
+def test_grid_points_vary_joint_keys_together():
+    points = grid_points({"gamma,gamma_prime": [(1, 2), (3, 4)], "learning_rate": [0.1, 0.2]})
+    assert points == [
+        {"gamma": 1, "gamma_prime": 2, "learning_rate": 0.1},
+        {"gamma": 1, "gamma_prime": 2, "learning_rate": 0.2},
+        {"gamma": 3, "gamma_prime": 4, "learning_rate": 0.1},
+        {"gamma": 3, "gamma_prime": 4, "learning_rate": 0.2},
+    ]
+
+
+def test_expand_solver_grid():
+    solver = {"name": "pCQO", "class": "pCQOMIS_MGD", "params": {"number_of_steps": 10}, "grid": {"gamma": [1, 2]}}
+    configurations = expand_solver_grid(solver)
+    assert [configuration["params"] for configuration in configurations] == [
+        {"number_of_steps": 10, "gamma": 1},
+        {"number_of_steps": 10, "gamma": 2},
+    ]
+    assert [configuration["name"] for configuration in configurations] == ["pCQO gamma=1", "pCQO gamma=2"]
+    assert solver["params"] == {"number_of_steps": 10}
+
+    (vectorized,) = expand_solver_grid(dict(solver, vectorize=True))
+    assert vectorized["params"] == {"number_of_steps": 10, "gamma": [1, 2]}
+    assert vectorized["configuration_names"] == ["pCQO gamma=1", "pCQO gamma=2"]
+
+
+def test_build_jobs_orders_by_graph_and_sets_threads_and_seeds():
+    jobs = build_jobs(generated_spec(seeds=[0, 1]))
+    assert len(jobs) == 4 * 2 * 2
+    assert [job["id"] for job in jobs] == list(range(len(jobs)))
+
+    graph_paths = [job["graph"]["path"] for job in jobs]
+    assert graph_paths == sorted(graph_paths, key=graph_paths.index)
+    assert len(set(graph_paths)) == 4
+
+    for job in jobs:
+        assert job["solver"]["params"]["seed"] == job["seed"]
+        expected_threads = 2 if job["solver"]["class"] == "CPSATMIS" else 1
+        assert job["threads"] == job["solver"]["params"]["threads"] == expected_threads
+
+
+def test_disabled_solvers_are_skipped():
+    spec = generated_spec()
+    spec["solvers"][1]["enabled"] = False
+    assert {job["solver"]["name"] for job in build_jobs(spec)} == {"ReduMIS"}
+
+
+def test_generated_graph_names_and_paths_are_unique():
+    graphs = list_spec_graphs(generated_spec())
+    assert len({graph["name"] for graph in graphs}) == len({graph["path"] for graph in graphs}) == 4
+    assert all(graph["path"].startswith("generator:er?") for graph in graphs)
+
+
+def test_load_spec_defaults(tmp_path):
+    path = tmp_path / "my_spec.json"
+    path.write_text(json.dumps({"datasets": [], "solvers": []}))
+    spec = load_spec(str(path))
+    assert spec["name"] == "my_spec"
+    assert spec["seeds"] == [None]
+    assert spec["summary_columns"] == ["size", "time"]
+    assert spec["target_fraction"] == 1.0
@@ -0,0 +1,81 @@
+import itertools
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import lib.clique_cover
+from lib.clique_cover import constraint_matrix, greedy_clique_cover, independence_constraints
+from lib.io import networkx_to_csr
+
+GRAPHS = {
+    "empty": nx.empty_graph(5),
+    "path": nx.path_graph(6),
+    "complete": nx.complete_graph(7),
+    "petersen": nx.petersen_graph(),
+    "caveman": nx.connected_caveman_graph(4, 5),
+    "gnm sparse": nx.gnm_random_graph(60, 90, seed=2),
+    "gnm dense": nx.gnm_random_graph(30, 300, seed=3),
+}
+
+
+@pytest.fixture(params=["dense", "sparse"])
+def cover_path(request, monkeypatch):
+    # Force every graph onto one implementation of the cover
+    if request.param == "dense":
+        monkeypatch.setattr(lib.clique_cover, "DENSE_COVER_DENSITY", 0)
+    else:
+        monkeypatch.setattr(lib.clique_cover, "DENSE_COVER_MAX_ENTRIES", 0)
+    return request.param
+
+
+def cliques_of(clique_indptr, clique_nodes):
+    return [clique_nodes[start:end].tolist() for start, end in zip(clique_indptr[:-1], clique_indptr[1:])]
+
+
+@pytest.mark.parametrize("name", GRAPHS)
+def test_cover_consists_of_cliques_covering_every_edge(name, cover_path):
+    G = GRAPHS[name]
+    cliques = cliques_of(*greedy_clique_cover(*networkx_to_csr(G)))
+
+    covered = set()
+    for clique in cliques:
+        assert len(clique) >= 2
+        assert len(set(clique)) == len(clique)
+        for u, v in itertools.combinations(clique, 2):
+            assert G.has_edge(u, v)
+            covered.add(frozenset((u, v)))
+    assert covered == {frozenset(edge) for edge in G.edges}
+
+
+def test_dense_and_sparse_covers_agree():
+    G = GRAPHS["gnm dense"]
+    indptr, indices = networkx_to_csr(G)
+    dense = greedy_clique_cover(indptr, indices)
+    sparse = lib.clique_cover._sparse_clique_cover(
+        indptr.astype(np.int64), indices.astype(np.int64), np.argsort(-np.diff(indptr), kind="stable")
+    )
+    assert cliques_of(*dense) == [clique.tolist() for clique in sparse]
+
+
+def test_complete_graph_is_one_clique():
+    clique_indptr, clique_nodes = greedy_clique_cover(*networkx_to_csr(nx.complete_graph(6)))
+    assert len(clique_indptr) == 2
+    assert sorted(clique_nodes.tolist()) == list(range(6))
+
+
+@pytest.mark.parametrize("formulation", ["edge", "clique"])
+def test_constraints_accept_exactly_the_independent_sets(formulation):
+    G = nx.gnm_random_graph(8, 12, seed=4)
+    G.add_edge(3, 3)
+    A = constraint_matrix(*independence_constraints(G, formulation), G.number_of_nodes())
+
+    for selection in itertools.product((0, 1), repeat=G.number_of_nodes()):
+        nodes = [node for node, selected in enumerate(selection) if selected]
+        independent = not any(G.has_edge(u, v) for u, v in itertools.combinations(nodes, 2))
+        assert bool((A @ np.array(selection) <= 1).all()) == independent
+
+
+def test_unknown_formulation_is_rejected():
+    with pytest.raises(ValueError):
+        independence_constraints(nx.path_graph(3), "triangle")
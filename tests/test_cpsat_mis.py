@@ -0,0 +1,16 @@
+import networkx as nx
+import pytest
+
+from solvers.CPSAT_MIS import CPSATMIS
+
+
+@pytest.mark.parametrize("formulation", ["edge", "clique"])
+def test_time_to_optimal_includes_the_model_build(formulation):
+    G = nx.petersen_graph()
+    solver = CPSATMIS(G, {"formulation": formulation, "threads": 1, "seed": 0})
+    solver.solve()
+
+    assert solver.solution["size"] == 4
+    assert solver.solution["time_to_optimal"] == solver.timings["total_time"]
+    assert solver.solution["time_to_optimal"] >= solver.solution["build_time"]
+    assert solver.timings["setup_time"] + solver.timings["solve_time"] == pytest.approx(solver.timings["total_time"])
@@ -0,0 +1,73 @@
+import networkx as nx
+import pytest
+import torch
+
+from models.datalessnet import DatalessNet, pairwise_relu_sum
+
+
+def dense_loss(G, theta, temperature, edge_weight):
+    """
+    Reference DatalessNet output from the dense layers: one ReLU unit per node, edge and complement edge.
+    """
+    n = G.number_of_nodes()
+    pairs = list(G.edges) + list(nx.complement(G).edges)
+    weight = torch.zeros(n + len(pairs), n, dtype=theta.dtype)
+    weight[torch.arange(n), torch.arange(n)] = 1
+    for i, (u, v) in enumerate(pairs):
+        weight[n + i, u] += 1
+        weight[n + i, v] += 1
+    bias = torch.cat((torch.full((n,), -temperature), torch.full((len(pairs),), -1.0))).to(theta.dtype)
+    output_weight = torch.cat(
+        (
+            torch.full((n,), -1.0),
+            torch.full((G.number_of_edges(),), float(edge_weight)),
+            torch.full((len(pairs) - G.number_of_edges(),), -temperature),
+        )
+    ).to(theta.dtype)
+    return torch.relu(theta @ weight.T + bias) @ output_weight
+
+
+def looped_graph():
+    G = nx.gnm_random_graph(12, 30, seed=4)
+    G.add_edges_from([(3, 3), (9, 9)])
+    return G
+
+
+GRAPHS = {"gnm": nx.gnm_random_graph(15, 40, seed=3), "self-loops": looped_graph(), "edgeless": nx.empty_graph(6)}
+
+
+@pytest.mark.parametrize("name", GRAPHS)
+@pytest.mark.parametrize("update_gamma", [False, True])
+def test_loss_and_gradients_match_the_dense_network(name, update_gamma):
+    G = GRAPHS[name]
+    n = G.number_of_nodes()
+    theta = torch.rand(3, n, dtype=torch.float64, generator=torch.Generator().manual_seed(5))
+    model = DatalessNet(G, theta)
+    if update_gamma:
+        model.update_gamma()
+
+    output = model(torch.ones(3, n, dtype=torch.float64))
+    output.sum().backward()
+
+    reference_theta = theta.clone().requires_grad_(True)
+    reference = dense_loss(G, reference_theta, model.temperature, model.edge_weight)
+    reference.sum().backward()
+
+    torch.testing.assert_close(output, reference)
+    torch.testing.assert_close(model.theta_layer.weight.grad, reference_theta.grad)
+
+
+def test_single_network_output_is_a_scalar_per_input():
+    G = GRAPHS["gnm"]
+    theta = torch.rand(G.number_of_nodes(), dtype=torch.float64)
+    model = DatalessNet(G, theta)
+
+    output = model(torch.ones(G.number_of_nodes(), dtype=torch.float64))
+    torch.testing.assert_close(output, dense_loss(G, theta, model.temperature, model.edge_weight))
+
+
+def test_pairwise_relu_sum_matches_all_pairs():
+    x = torch.rand(4, 20, dtype=torch.float64, generator=torch.Generator().manual_seed(6))
+    pairs = torch.triu_indices(20, 20, offset=1)
+    expected = torch.relu(x[:, pairs[0]] + x[:, pairs[1]] - 1).sum(dim=-1)
+    torch.testing.assert_close(pairwise_relu_sum(x), expected)
@@ -0,0 +1,74 @@
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import networkx as nx
+import pytest
+
+from lib import dataset_generation
+from lib.dataset_generation import list_gpickle_files, stream_dataset_from_gpickle
+
+
+@pytest.fixture
+def graph_directories(tmp_path):
+    """
+    Two directories of small path graphs, "a" with 4 graphs and "b" with 3, named by their size.
+    """
+    directories = []
+    for directory, sizes in (("a", [5, 3, 8, 6]), ("b", [4, 7, 2])):
+        (tmp_path / directory).mkdir()
+        for size in sizes:
+            with open(tmp_path / directory / f"path_{size}.gpickle", "wb") as f:
+                pickle.dump(nx.path_graph(size), f)
+        directories.append(str(tmp_path / directory))
+    return directories
+
+
+def names(dataset):
+    return [entry["name"] for entry in dataset]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_stream_yields_graphs_in_listing_order(graph_directories, executor, prefetch):
+    dataset = list(stream_dataset_from_gpickle(graph_directories, prefetch=prefetch, executor=executor))
+
+    assert names(dataset) == ["path_3", "path_5", "path_6", "path_8", "path_2", "path_4", "path_7"]
+    for entry in dataset:
+        assert nx.is_isomorphic(entry["data"], nx.path_graph(int(entry["name"][5:])))
+        assert sorted(entry["data"]) == list(range(entry["data"].number_of_nodes()))
+
+
+@pytest.mark.parametrize("order", ["size", "shuffled"])
+def test_stream_follows_the_requested_order(graph_directories, order):
+    dataset = stream_dataset_from_gpickle(graph_directories, order=order, seed=1)
+    expected = list_gpickle_files(graph_directories, order=order, seed=1)
+
+    assert names(dataset) == [os.path.basename(path)[:-8] for path in expected]
+
+
+def test_choose_n_limits_each_directory(graph_directories):
+    dataset = stream_dataset_from_gpickle(graph_directories, choose_n=2)
+    assert names(dataset) == ["path_3", "path_5", "path_2", "path_4"]
+
+
+@pytest.mark.parametrize("prefetch", [1, 2, 3])
+def test_at_most_prefetch_graphs_are_alive(graph_directories, monkeypatch, prefetch):
+    submitted = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, path):
+            submitted.append(path)
+            return super().submit(fn, path)
+
+    monkeypatch.setattr(dataset_generation, "ThreadPoolExecutor", RecordingExecutor)
+
+    for consumed, _ in enumerate(stream_dataset_from_gpickle(graph_directories, prefetch=prefetch)):
+        # The graph held by the consumer plus the loads in flight or waiting
+        assert len(submitted) - consumed == min(prefetch, 7 - consumed)
+    assert len(submitted) == 7
+
+
+def test_unknown_executor_is_rejected(graph_directories):
+    with pytest.raises(ValueError):
+        next(stream_dataset_from_gpickle(graph_directories, executor="fiber"))
@@ -0,0 +1,60 @@
+import networkx as nx
+import pytest
+import torch
+
+from lib.adjacency import AdjacencyOperator, adjacency_from_graph
+from solvers.previous_work_MIS_dNNs import max_degree_repair
+
+
+def sequential_repair(G, nodes):
+    """
+    The node-by-node repair max_degree_repair replaces: remove the first node of maximum degree of the
+    induced subgraph until it has no edges.
+    """
+    subgraph = nx.Graph(G.subgraph(nodes))
+    while len(subgraph) > 0:
+        degrees = dict(subgraph.degree())
+        max_degree_nodes = [node for node, degree in degrees.items() if degree == max(degrees.values())]
+        if subgraph.degree(max_degree_nodes[0]) == 0:
+            break
+        subgraph.remove_node(max_degree_nodes[0])
+    return sorted(subgraph)
+
+
+# Regular and symmetric graphs, where every round has ties between nodes of equal degree
+GRAPHS = {
+    "cycle": nx.cycle_graph(9),
+    "complete": nx.complete_graph(6),
+    "complete bipartite": nx.complete_bipartite_graph(4, 5),
+    "grid": nx.convert_node_labels_to_integers(nx.grid_2d_graph(4, 5)),
+    "regular": nx.random_regular_graph(3, 16, seed=1),
+    "gnm": nx.gnm_random_graph(25, 70, seed=2),
+}
+
+
+@pytest.mark.parametrize("name", GRAPHS)
+@pytest.mark.parametrize("layout", ["dense", "csr"])
+def test_batched_repair_matches_the_sequential_repair(name, layout):
+    G = GRAPHS[name]
+    n = G.number_of_nodes()
+    selected = torch.rand(8, n, generator=torch.Generator().manual_seed(3)) < 0.7
+    selected[0] = True
+
+    repaired = max_degree_repair(AdjacencyOperator(adjacency_from_graph(G, dtype=torch.float32, layout=layout)), selected)
+
+    for row in range(len(selected)):
+        nodes = torch.nonzero(selected[row]).flatten().tolist()
+        assert torch.nonzero(repaired[row]).flatten().tolist() == sequential_repair(G, nodes)
+
+
+def test_ties_remove_the_lowest_index_first():
+    # Every node of the 4-cycle has degree 2: removing 0 leaves the path 1-2-3, whose middle node goes next
+    adjacency = adjacency_from_graph(nx.cycle_graph(4), dtype=torch.float32)
+    repaired = max_degree_repair(AdjacencyOperator(adjacency), torch.ones(1, 4, dtype=torch.bool))
+    assert torch.nonzero(repaired[0]).flatten().tolist() == [1, 3]
+
+
+def test_independent_selections_are_kept():
+    adjacency = adjacency_from_graph(nx.path_graph(5), dtype=torch.float32)
+    selected = torch.tensor([[True, False, True, False, True], [False] * 5])
+    assert torch.equal(max_degree_repair(AdjacencyOperator(adjacency), selected), selected)
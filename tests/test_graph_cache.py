@@ -0,0 +1,119 @@
+import os
+
+import networkx as nx
+import torch
+
+import lib.benchmark_runner
+import lib.graph_cache
+from lib.graph_cache import DerivedMatrixCache, graph_fingerprint, metis_file, metis_fingerprint
+from lib.io import read_metis, networkx_to_csr
+
+
+def test_self_loop_changes_fingerprint():
+    G = nx.path_graph(4)
+    H = nx.path_graph(4)
+    H.add_edge(2, 2)
+    assert graph_fingerprint(G) != graph_fingerprint(H)
+
+
+def test_fingerprint_ignores_edge_order_and_orientation():
+    G = nx.Graph()
+    G.add_nodes_from(range(4))
+    G.add_edges_from([(0, 1), (2, 3), (1, 2)])
+    H = nx.Graph()
+    H.add_nodes_from(range(4))
+    H.add_edges_from([(3, 2), (2, 1), (1, 0)])
+    assert graph_fingerprint(G) == graph_fingerprint(H)
+
+
+def test_fingerprint_follows_mutation_with_unchanged_counts():
+    G = nx.path_graph(4)
+    before = graph_fingerprint(G)
+    G.remove_edge(0, 1)
+    G.add_edge(0, 3)
+    assert graph_fingerprint(G) != before
+
+
+def test_cache_does_not_share_matrices_of_self_loop_variants():
+    from solvers.pCQO_MIS import compute_derived_matrices
+
+    cache = DerivedMatrixCache()
+    G = nx.path_graph(4)
+    H = nx.path_graph(4)
+    H.add_edge(2, 2)
+    for graph in (G, H):
+        entry = cache.get_or_compute(
+            (graph_fingerprint(graph), "cpu", "float16"), lambda: compute_derived_matrices(graph, "cpu")
+        )
+        assert entry["adjacency"][2, 2].item() == (1 if graph is H else 0)
+    assert cache.misses == 2
+
+
+def test_metis_file_is_reused_and_readable(tmp_path):
+    G = nx.gnm_random_graph(30, 60, seed=1)
+    path = metis_file(G, str(tmp_path))
+    assert metis_file(G, str(tmp_path)) == path
+    indptr, indices = read_metis(path)
+    expected_indptr, expected_indices = networkx_to_csr(G)
+    assert torch.equal(torch.from_numpy(indptr), torch.from_numpy(expected_indptr))
+    assert torch.equal(torch.from_numpy(indices), torch.from_numpy(expected_indices))
+
+
+def forbid(name):
+    def forbidden(*args, **kwargs):
+        raise AssertionError(f"{name} called on a cache hit")
+
+    return forbidden
+
+
+def test_metis_file_hit_neither_converts_nor_rewrites(tmp_path, monkeypatch):
+    G = nx.gnm_random_graph(30, 60, seed=1)
+    path = metis_file(G, str(tmp_path))
+    fingerprint = metis_fingerprint(G)
+    assert os.path.basename(path) == f"{fingerprint}.metis"
+
+    monkeypatch.setattr(lib.graph_cache, "write_metis", forbid("write_metis"))
+    assert metis_file(G, str(tmp_path)) == path
+    monkeypatch.setattr(lib.graph_cache, "networkx_to_csr", forbid("networkx_to_csr"))
+    assert metis_file(G, str(tmp_path), fingerprint=fingerprint) == path
+
+
+def test_metis_file_with_a_fingerprint_writes_a_missing_file(tmp_path):
+    G = nx.gnm_random_graph(30, 60, seed=1)
+    path = metis_file(G, str(tmp_path), fingerprint=metis_fingerprint(G))
+    assert read_metis(path)[1].tolist() == networkx_to_csr(G)[1].tolist()
+
+
+def test_metis_directory_evicts_the_least_recently_used_files(tmp_path):
+    directory = str(tmp_path)
+    graphs = [nx.gnm_random_graph(40, 100, seed=seed) for seed in range(3)]
+    first, second = (metis_file(G, directory, max_bytes=None) for G in graphs[:2])
+    # The first file is the older one, until it is used again
+    os.utime(first, ns=(1, 1))
+    os.utime(second, ns=(2, 2))
+    metis_file(graphs[0], directory)
+
+    third = metis_file(graphs[2], directory, max_bytes=2.5 * os.path.getsize(first))
+
+    assert sorted(os.listdir(directory)) == sorted(os.path.basename(path) for path in (first, third))
+
+
+def test_metis_file_over_the_budget_is_kept(tmp_path):
+    path = metis_file(nx.complete_graph(20), str(tmp_path), max_bytes=1)
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+
+def test_runner_fingerprints_each_loaded_graph_once(monkeypatch):
+    monkeypatch.setattr(lib.benchmark_runner, "_loaded_graph", {"path": None, "graph": None, "metis_fingerprint": None})
+    calls = []
+    monkeypatch.setattr(lib.graph_cache, "metis_fingerprint", lambda G: calls.append(G) or metis_fingerprint(G))
+    graphs = [
+        {"path": f"GNM_{seed}", "generator": {"name": "gnm", "params": {"n": 20, "m": 40}, "seed": seed}}
+        for seed in range(2)
+    ]
+
+    fingerprints = [lib.benchmark_runner.load_job_metis_fingerprint(graph) for graph in graphs + graphs[1:]]
+
+    assert len(calls) == 2
+    assert fingerprints[1] == fingerprints[2] != fingerprints[0]
+    assert fingerprints[1] == metis_fingerprint(lib.benchmark_runner.load_job_graph(graphs[1]))
@@ -0,0 +1,132 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from lib.graph_generators import (
+    GENERATORS,
+    generate_graph,
+    gnm_random_graph,
+    pair_index_to_edges,
+    random_regular_graph,
+    rb_graph,
+    satlib_graph,
+)
+from lib.io import csr_to_edges, csr_to_networkx
+
+PARAMS = {
+    "er": {"n": 60, "p": 0.1},
+    "gnm": {"n": 60, "m": 200},
+    "rb": {"n": 8, "k": 4, "p": 0.3},
+    "regular": {"n": 60, "d": 5},
+    "satlib": {"n": 15},
+}
+
+
+def degrees(indptr):
+    return np.diff(indptr)
+
+
+def is_clique(indptr, indices, nodes):
+    nodes = set(nodes)
+    return all(nodes - {node} <= set(indices[indptr[node] : indptr[node + 1]]) for node in nodes)
+
+
+@pytest.mark.parametrize("name", GENERATORS)
+def test_seed_determines_the_graph(name):
+    first = generate_graph(name, PARAMS[name], seed=7)
+    again = generate_graph(name, PARAMS[name], seed=7)
+    other = generate_graph(name, PARAMS[name], seed=8)
+
+    assert all(np.array_equal(a, b) for a, b in zip(first, again))
+    assert not all(np.array_equal(a, b) for a, b in zip(first, other))
+
+
+@pytest.mark.parametrize("n, d", [(10, 0), (30, 3), (61, 4), (20, 9), (20, 10), (31, 28), (12, 11)])
+def test_random_regular_graph_is_simple_and_regular(n, d):
+    # d > (n - 1) / 2 takes the complement branch
+    indptr, indices = random_regular_graph(n, d, seed=d)
+    G = csr_to_networkx(indptr, indices)
+
+    assert G.number_of_nodes() == n
+    assert all(degree == d for _, degree in G.degree())
+    assert nx.number_of_selfloops(G) == 0
+    # A multi-edge would have been merged by the CSR construction, lowering a degree below d
+    assert len(indices) == n * d
+
+
+@pytest.mark.parametrize("n, d", [(7, 3), (5, 5)])
+def test_random_regular_graph_rejects_impossible_degrees(n, d):
+    with pytest.raises(ValueError):
+        random_regular_graph(n, d)
+
+
+@pytest.mark.parametrize("n, m", [(1, 0), (50, 0), (50, 300), (20, 190)])
+def test_gnm_random_graph_has_m_edges(n, m):
+    indptr, indices = gnm_random_graph(n, m, seed=1)
+    edges = csr_to_edges(indptr, indices)
+
+    assert len(indptr) == n + 1
+    assert len(edges) == m
+    assert (edges[:, 0] < edges[:, 1]).all()
+
+
+def test_gnm_random_graph_rejects_too_many_edges():
+    with pytest.raises(ValueError):
+        gnm_random_graph(5, 11)
+
+
+def test_pair_indices_enumerate_the_lower_triangle():
+    n = 40
+    u, v = np.triu_indices(n, 1)
+    pairs = sorted(zip(u, v), key=lambda pair: (pair[1], pair[0]))
+    np.testing.assert_array_equal(pair_index_to_edges(np.arange(n * (n - 1) // 2)), pairs)
+
+
+def test_pair_indices_round_trip_at_large_k():
+    rng = np.random.default_rng(2)
+    # Rows up to 3e9, so k reaches 4.5e18, where float64 no longer represents k exactly
+    v = rng.integers(2, 3 * 10**9, size=10000)
+    v = np.concatenate((v, [2, 3 * 10**9]))
+    u = rng.integers(0, v - 1)
+    # First and last pair of every row, where the rounded square root is most likely off by one
+    u = np.concatenate((u, np.zeros_like(v), v - 1))
+    v = np.concatenate((v, v, v))
+    k = v * (v - 1) // 2 + u
+
+    np.testing.assert_array_equal(pair_index_to_edges(k), np.stack((u, v), axis=1))
+
+
+@pytest.mark.parametrize("p", [0.3, 1.0])
+def test_rb_graph_is_made_of_variable_cliques(p):
+    n, k = 10, 5
+    indptr, indices = rb_graph(n, k, p, r=0.8, seed=3)
+
+    assert len(indptr) == n * k + 1
+    assert all(is_clique(indptr, indices, range(variable * k, (variable + 1) * k)) for variable in range(n))
+    # Constraints add value pairs between the cliques, at most s = int(p k^2) per constraint
+    constraints = int(0.8 * n * np.log(n) - 1)
+    between = len(indices) // 2 - n * k * (k - 1) // 2
+    assert 0 < between <= constraints * int(p * k * k)
+
+
+def test_satlib_graph_is_made_of_clause_cliques_and_conflicts():
+    n, clauses, k = 12, 40, 3
+    indptr, indices = satlib_graph(n, clauses, k, seed=4)
+
+    assert len(indptr) == clauses * k + 1
+    assert all(is_clique(indptr, indices, range(clause * k, (clause + 1) * k)) for clause in range(clauses))
+
+    # Without the clause edges, every variable is a complete bipartite graph between its positive and
+    # negative occurrences
+    G = csr_to_networkx(indptr, indices)
+    G.remove_edges_from([(u, v) for u, v in G.edges if u // k == v // k])
+    for component in nx.connected_components(G):
+        if len(component) > 1:
+            left, right = nx.bipartite.sets(G.subgraph(component))
+            assert G.subgraph(component).number_of_edges() == len(left) * len(right)
+    assert G.number_of_edges() > 0
+
+
+def test_satlib_graph_defaults_to_the_satlib_clause_ratio():
+    indptr, _ = satlib_graph(50, seed=0)
+    assert len(indptr) - 1 == 3 * 213
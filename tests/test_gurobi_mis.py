@@ -0,0 +1,78 @@
+import json
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from lib.cli import main
+from lib.io import networkx_to_csr, write_edge_list
+
+
+@pytest.fixture
+def graph():
+    return nx.gnm_random_graph(30, 60, seed=5)
+
+
+def is_independent(G, mask):
+    nodes = np.flatnonzero(mask)
+    return not any(G.has_edge(u, v) for u in nodes for v in nodes if u < v)
+
+
+@pytest.mark.parametrize("formulation", ["edge", "clique"])
+def test_start_is_set_from_the_hint(fake_gurobi_mis, graph, formulation):
+    hint = np.zeros(graph.number_of_nodes(), dtype=int)
+    hint[list(nx.maximal_independent_set(graph, seed=1))[:3]] = 1
+    solver = fake_gurobi_mis(graph, {"formulation": formulation, "hint_solution": hint.tolist()})
+    solver.solve()
+
+    assert np.array_equal(solver.model.variables.Start, hint)
+    # The first incumbent is the MIP start, which the final solution extends
+    assert solver.paths[0] == hint.sum()
+    mask = np.array(solver.solution["graph_mask"])
+    assert (mask[hint == 1] == 1).all()
+    assert is_independent(graph, mask)
+    assert solver.solution["size"] == mask.sum()
+
+
+def test_hint_of_the_wrong_length_is_rejected(fake_gurobi_mis, graph):
+    solver = fake_gurobi_mis(graph, {"hint_solution": [1, 0]})
+    with pytest.raises(ValueError):
+        solver.solve()
+
+
+def test_trajectory_is_monotone(fake_gurobi_mis, graph):
+    solver = fake_gurobi_mis(graph, {})
+    solver.solve()
+
+    assert solver.times == sorted(solver.times)
+    assert all(earlier < later for earlier, later in zip(solver.paths, solver.paths[1:]))
+    assert solver.paths[-1] == solver.solution["size"]
+    assert solver.solution["trajectory"] == [[t, size] for t, size in zip(solver.times, solver.paths)]
+    assert solver.timings["time_to_best"] == solver.times[-1]
+
+
+def test_build_and_solve_times_add_up(fake_gurobi_mis, graph):
+    solver = fake_gurobi_mis(graph, {"formulation": "clique"})
+    solver.solve()
+    timings = solver.timings
+
+    assert solver.solution["build_time"] == timings["setup_time"]
+    assert timings["setup_time"] + timings["solve_time"] == pytest.approx(timings["total_time"])
+    assert solver.solution_time == timings["total_time"]
+    assert solver.solution["runtime"] <= timings["solve_time"]
+    assert all(timings["setup_time"] <= t <= timings["total_time"] for t in solver.times)
+
+
+def test_cli_solves_with_the_fake(fake_gurobi_mis, graph, tmp_path, capsys):
+    graph_path = tmp_path / "graph.edges"
+    write_edge_list(graph_path, *networkx_to_csr(graph))
+    output_path = tmp_path / "solution.json"
+
+    main(["solve", str(graph_path), "--solver", "GurobiMIS", "--output", str(output_path)])
+
+    with open(output_path) as f:
+        result = json.load(f)
+    assert result["solver"] == "GurobiMIS"
+    assert result["solution"]["size"] == sum(result["solution"]["graph_mask"])
+    assert is_independent(graph, result["solution"]["graph_mask"])
+    assert "GurobiMIS" in capsys.readouterr().out
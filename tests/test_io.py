@@ -0,0 +1,82 @@
+import numpy as np
+import networkx as nx
+import pytest
+
+from lib.io import READERS, WRITERS, edges_to_csr, networkx_to_csr, csr_to_networkx, read_dimacs, read_metis, read_edge_list
+
+# Graphs given as (number_of_nodes, edges)
+GRAPHS = {
+    "edgeless": (5, []),
+    "empty": (0, []),
+    "path": (4, [(0, 1), (1, 2), (2, 3)]),
+    "trailing isolated nodes": (7, [(0, 1), (1, 2), (0, 2)]),
+    "leading isolated nodes": (6, [(3, 4), (4, 5)]),
+    "random": (60, list(nx.gnm_random_graph(60, 300, seed=3).edges)),
+}
+
+
+def csr(number_of_nodes, edges):
+    return edges_to_csr(number_of_nodes, np.asarray(edges, dtype=np.int64).reshape(-1, 2))
+
+
+@pytest.mark.parametrize("fmt", sorted(WRITERS))
+@pytest.mark.parametrize("name", sorted(GRAPHS))
+@pytest.mark.parametrize("chunk_bytes", [4, 1 << 20])
+def test_write_read_roundtrip(tmp_path, fmt, name, chunk_bytes):
+    number_of_nodes, edges = GRAPHS[name]
+    indptr, indices = csr(number_of_nodes, edges)
+    path = str(tmp_path / f"graph.{fmt}")
+    WRITERS[fmt](path, indptr, indices)
+
+    # Plain edge lists cannot record isolated nodes after the largest endpoint
+    if fmt == "edge_list":
+        read_indptr, read_indices = read_edge_list(path, number_of_nodes=number_of_nodes, chunk_bytes=chunk_bytes)
+    else:
+        read_indptr, read_indices = READERS[fmt](path, chunk_bytes=chunk_bytes)
+    np.testing.assert_array_equal(read_indptr, indptr)
+    np.testing.assert_array_equal(read_indices, indices)
+
+
+def test_edgeless_metis_file_written_by_hand(tmp_path):
+    path = tmp_path / "graph.metis"
+    path.write_bytes(b"3 0\n\n\n\n")
+    indptr, indices = read_metis(str(path))
+    np.testing.assert_array_equal(indptr, [0, 0, 0, 0])
+    assert len(indices) == 0
+
+
+def test_dimacs_with_blank_lines(tmp_path):
+    path = tmp_path / "graph.col"
+    path.write_bytes(b"c comment\np edge 3 0\n\n")
+    indptr, indices = read_dimacs(str(path))
+    np.testing.assert_array_equal(indptr, [0, 0, 0, 0])
+    assert len(indices) == 0
+
+    path.write_bytes(b"p edge 4 2\n\ne 1 2\n\n\ne 3 4\n\n")
+    indptr, indices = read_dimacs(str(path), chunk_bytes=2)
+    np.testing.assert_array_equal(indptr, [0, 1, 2, 3, 4])
+    np.testing.assert_array_equal(indices, [1, 0, 3, 2])
+
+
+def test_metis_with_comments_and_isolated_nodes(tmp_path):
+    path = tmp_path / "graph.metis"
+    path.write_bytes(b"% comment\n4 1\n2\n1\n% inner comment\n\n\n")
+    indptr, indices = read_metis(str(path))
+    np.testing.assert_array_equal(indptr, [0, 1, 2, 2, 2])
+    np.testing.assert_array_equal(indices, [1, 0])
+
+
+def test_edge_list_with_blank_lines(tmp_path):
+    path = tmp_path / "graph.txt"
+    path.write_bytes(b"# comment\n\n0 1\n\n1 2\n\n")
+    indptr, indices = read_edge_list(str(path), chunk_bytes=3)
+    np.testing.assert_array_equal(indptr, [0, 1, 3, 4])
+    np.testing.assert_array_equal(indices, [1, 0, 2, 1])
+
+
+def test_networkx_roundtrip_drops_self_loops():
+    G = nx.path_graph(5)
+    G.add_edge(2, 2)
+    H = csr_to_networkx(*networkx_to_csr(G))
+    assert sorted(H.nodes) == list(range(5))
+    assert sorted(map(sorted, H.edges)) == [[0, 1], [1, 2], [2, 3], [3, 4]]
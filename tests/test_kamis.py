@@ -0,0 +1,147 @@
+import os
+import re
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import lib.benchmark_runner
+import lib.graph_cache
+from lib.benchmark_runner import run_job
+import solvers.KaMIS
+from solvers.KaMIS import ReduMIS, ReduMISPortfolio, scratch_directory
+
+# The fake takes nodes 0, 2, 4, 6 and 8 of the path, one per step
+PATH = nx.path_graph(10)
+GREEDY_SIZE = 5
+
+
+@pytest.fixture
+def params(fake_redumis, tmp_path):
+    return {
+        "redumis_path": fake_redumis,
+        "working_directory": str(tmp_path),
+        "metis_directory": str(tmp_path / "metis"),
+        "grace_period": 0.5,
+    }
+
+
+def assert_independent_mask(G, mask, size):
+    mask = np.asarray(mask)
+    assert len(mask) == G.number_of_nodes()
+    assert mask.sum() == size
+    nodes = np.flatnonzero(mask)
+    assert not any(G.has_edge(u, v) for u in nodes for v in nodes if u < v)
+
+
+def logged_path(log, name):
+    return re.search(rf"^{name}: (.*)$", log, re.MULTILINE).group(1)
+
+
+@pytest.mark.parametrize("metis_directory", ["cached", None])
+def test_redumis_runs_in_a_private_directory_removed_afterwards(params, tmp_path, metis_directory):
+    working_directory = tmp_path / "work"
+    working_directory.mkdir()
+    params = {
+        **params,
+        "working_directory": str(working_directory),
+        "metis_directory": metis_directory and str(tmp_path / metis_directory),
+    }
+    solver = ReduMIS(PATH, {**params, "seed": 0, "time_limit": 0.2})
+    solver.solve()
+
+    # The log is kept in memory, and the output was written into a private directory, now removed
+    output = logged_path(solver.log, "Output")
+    private_directory = os.path.dirname(output)
+    assert os.path.dirname(private_directory) == str(working_directory)
+    assert os.path.basename(private_directory).startswith("redumis_")
+    assert os.listdir(working_directory) == []
+    if metis_directory is None:
+        assert logged_path(solver.log, "Graph") == os.path.join(private_directory, "graph.metis")
+    else:
+        assert os.path.dirname(logged_path(solver.log, "Graph")) == str(tmp_path / metis_directory)
+
+    assert solver.solution["size"] == GREEDY_SIZE
+    assert_independent_mask(PATH, solver.solution["graph_mask"], GREEDY_SIZE)
+    assert 0 < solver.solution_time <= solver.timings["total_time"]
+    assert solver.timings["time_to_best"] <= solver.timings["total_time"]
+
+
+def test_redumis_failure_raises_with_its_error_output(params, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_REDUMIS_EXIT", "3")
+    solver = ReduMIS(PATH, {**params, "time_limit": 1})
+
+    with pytest.raises(RuntimeError, match="status 3: fake redumis failure"):
+        solver.solve()
+    assert not any(name.startswith("redumis_") for name in os.listdir(tmp_path))
+
+
+def test_scratch_directory_prefers_the_first_writable_tmpfs(tmp_path, monkeypatch):
+    monkeypatch.setattr(solvers.KaMIS, "TMPFS_DIRECTORIES", (str(tmp_path / "missing"), str(tmp_path)))
+    assert scratch_directory() == str(tmp_path)
+    assert ReduMIS(PATH, {}).working_directory == str(tmp_path)
+
+    monkeypatch.setattr(solvers.KaMIS, "TMPFS_DIRECTORIES", (str(tmp_path / "missing"),))
+    assert scratch_directory() is None
+
+
+def test_portfolio_returns_the_best_solution_of_runs_reaching_their_time_limit(params):
+    solver = ReduMISPortfolio(PATH, {**params, "seeds": [0, 1], "time_limit": 0.5})
+    solver.solve()
+
+    assert solver.solution["stopped"] is None
+    assert solver.solution["size"] == GREEDY_SIZE
+    assert_independent_mask(PATH, solver.solution["graph_mask"], GREEDY_SIZE)
+    assert [run["size"] for run in solver.solution["runs"]] == [GREEDY_SIZE, GREEDY_SIZE]
+    assert solver.paths == list(range(1, GREEDY_SIZE + 1))
+    assert solver.times == sorted(solver.times)
+
+
+def test_target_stop_replays_the_winner_to_write_its_solution(params, monkeypatch):
+    monkeypatch.setenv("FAKE_REDUMIS_STEP", "0.05")
+    solver = ReduMISPortfolio(PATH, {**params, "seeds": [0, 3], "target_size": GREEDY_SIZE, "deadline": 60})
+    solver.solve()
+
+    assert solver.solution["stopped"] == "target"
+    assert solver.solution["size"] == GREEDY_SIZE
+    assert_independent_mask(PATH, solver.solution["graph_mask"], GREEDY_SIZE)
+    winner, loser = solver.solution["runs"]
+    assert winner["replayed"] and winner["size"] == GREEDY_SIZE
+    assert not loser["replayed"] and loser["size"] is None
+    # Stopped well before the 60 s deadline the runs were given as their time limit
+    assert solver.timings["total_time"] < 10
+    assert solver.timings["time_to_best"] <= solver.timings["total_time"]
+
+
+def test_deadline_stop_reports_the_best_logged_size(params, monkeypatch):
+    monkeypatch.setenv("FAKE_REDUMIS_IGNORE_TIME_LIMIT", "1")
+    solver = ReduMISPortfolio(PATH, {**params, "seeds": [0, 1], "deadline": 0.3})
+    solver.solve()
+
+    assert solver.solution["stopped"] == "deadline"
+    assert solver.solution["graph_mask"] is None
+    assert 0 < solver.solution["size"] <= GREEDY_SIZE
+    assert solver.solution["size"] == solver.paths[-1]
+
+
+def test_failing_run_raises(params, monkeypatch):
+    monkeypatch.setenv("FAKE_REDUMIS_EXIT", "3")
+    solver = ReduMISPortfolio(PATH, {**params, "seeds": [0, 1], "time_limit": 1})
+    with pytest.raises(RuntimeError, match="status 3"):
+        solver.solve()
+
+
+def test_jobs_on_the_same_graph_convert_it_once(params, monkeypatch):
+    monkeypatch.setattr(lib.benchmark_runner, "_loaded_graph", {"path": None, "graph": None, "metis_fingerprint": None})
+    conversions = []
+    networkx_to_csr = lib.graph_cache.networkx_to_csr
+    monkeypatch.setattr(lib.graph_cache, "networkx_to_csr", lambda G: conversions.append(G) or networkx_to_csr(G))
+    graph = {"name": "GNM", "path": "GNM", "generator": {"name": "gnm", "params": {"n": 20, "m": 30}, "seed": 0}}
+
+    for seed in range(3):
+        solver = {"name": "ReduMIS", "class": "ReduMIS", "params": {**params, "seed": seed, "time_limit": 0.1}}
+        [row] = run_job({"graph": graph, "solver": solver, "seed": seed})
+        assert row["data"]["size"] > 0
+
+    # Once for the fingerprint and once to write the file, by the first job only
+    assert len(conversions) == 2
@@ -0,0 +1,49 @@
+import networkx as nx
+import pytest
+import torch
+
+from solvers.pCQO_MIS import pCQOMIS_MGD
+
+PARAMS = {
+    "number_of_steps": 300,
+    "steps_per_batch": 50,
+    "batch_size": 8,
+    "seed": 3,
+    "gamma": 50,
+    "gamma_prime": 1,
+    "momentum": 0.9,
+}
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return nx.gnm_random_graph(40, 120, seed=1)
+
+
+def test_vectorized_configurations_match_separate_solves(graph):
+    solver = pCQOMIS_MGD(graph, {**PARAMS, "learning_rate": [0.001, 0.05], "gamma": [50, 20]})
+    solver.solve()
+
+    assert [configuration["params"] for configuration in solver.config_solutions] == [
+        {"learning_rate": 0.001, "momentum": 0.9, "gamma": 50, "gamma_prime": 1},
+        {"learning_rate": 0.05, "momentum": 0.9, "gamma": 20, "gamma_prime": 1},
+    ]
+    for configuration in solver.config_solutions:
+        separate = pCQOMIS_MGD(graph, {**PARAMS, **configuration["params"]})
+        separate.solve()
+        assert configuration["solution"]["size"] == separate.solution["size"]
+        assert torch.equal(configuration["solution"]["graph_mask"], separate.solution["graph_mask"])
+
+
+def test_solution_is_that_of_the_best_configuration(graph):
+    solver = pCQOMIS_MGD(graph, {**PARAMS, "learning_rate": [0.001, 0.05, 0.01], "gamma": [50, 20, 100]})
+    solver.solve()
+
+    sizes = [configuration["solution"]["size"] for configuration in solver.config_solutions]
+    assert len(sizes) == 3
+    assert solver.solution["size"] == max(sizes)
+
+
+def test_mismatched_vector_lengths_are_rejected(graph):
+    with pytest.raises(ValueError):
+        pCQOMIS_MGD(graph, {**PARAMS, "learning_rate": [0.001, 0.05], "gamma": [50, 20, 10]})
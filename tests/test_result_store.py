@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+import torch
+
+from lib.benchmark_spec import build_jobs
+from lib.result_store import ResultStore, job_key, summary_table, to_json
+
+
+def spec(solvers, seeds=(0, 1)):
+    return {
+        "datasets": [{"name": "ER", "generator": "er", "grid": {"n,p": [[20, 0.1], [30, 0.2]]}}],
+        "solvers": solvers,
+        "seeds": list(seeds),
+    }
+
+
+REDUMIS = {"name": "ReduMIS", "class": "ReduMIS", "params": {"time_limit": 1}}
+CPSAT = {"name": "CPSAT", "class": "CPSATMIS", "threads": 2, "params": {"time_limit": 1}}
+
+
+def rows_of(job):
+    return [{"solution_method": job["solver"]["name"], "dataset_name": job["graph"]["name"], "data": {"size": job["id"]}}]
+
+
+def test_job_key_is_stable_across_reordered_specs():
+    jobs = build_jobs(spec([REDUMIS, CPSAT]))
+    reordered = build_jobs(spec([CPSAT, REDUMIS], seeds=(1, 0)))
+    def order(job_list):
+        return [(job["graph"]["name"], job["solver"]["name"], job["seed"]) for job in job_list]
+
+    assert order(jobs) != order(reordered)
+    assert {job_key(job) for job in jobs} == {job_key(job) for job in reordered}
+    assert len({job_key(job) for job in jobs}) == len(jobs)
+
+
+def test_job_key_depends_on_params_and_seed():
+    job = build_jobs(spec([REDUMIS]))[0]
+    changed_params = json.loads(json.dumps(job))
+    changed_params["solver"]["params"]["time_limit"] = 2
+    changed_seed = dict(job, seed=5)
+    assert len({job_key(job), job_key(changed_params), job_key(changed_seed)}) == 3
+
+
+def test_store_resumes_and_discards_a_partial_last_line(tmp_path):
+    path = tmp_path / "results" / "results.jsonl"
+    jobs = build_jobs(spec([REDUMIS]))
+
+    store = ResultStore(str(path))
+    for job in jobs[:3]:
+        store.append(job, rows_of(job))
+    complete_size = path.stat().st_size
+
+    # A kill in the middle of a write leaves an unterminated line
+    with open(path, "a") as f:
+        f.write('{"key": "truncated", "rows": [')
+
+    resumed = ResultStore(str(path))
+    assert len(resumed) == 3
+    assert path.stat().st_size == complete_size
+    assert [job in resumed for job in jobs] == [True, True, True] + [False] * (len(jobs) - 3)
+
+    resumed.append(jobs[3], rows_of(jobs[3]))
+    reopened = ResultStore(str(path))
+    assert len(reopened) == 4
+    assert [row["data"]["size"] for row in reopened.rows(jobs)] == [0, 1, 2, 3]
+
+
+def test_to_json_converts_arrays_tensors_and_scalars():
+    value = {"mask": np.array([1, 0]), "tensor": torch.tensor([0.5]), "size": np.int64(3), 1: (np.float32(2.0),)}
+    assert to_json(value) == {"mask": [1, 0], "tensor": [0.5], "size": 3, "1": [2.0]}
+    json.dumps(to_json(value))
+
+
+def test_summary_table_averages_seeds():
+    rows = [
+        {"solution_method": "A", "dataset_name": "g", "data": {"size": 2}, "time_taken": 1.0},
+        {"solution_method": "A", "dataset_name": "g", "data": {"size": 4}, "time_taken": 3.0},
+    ]
+    table = summary_table(rows, [{"name": "g"}, {"name": "missing"}])
+    assert table.to_dict("records") == [{"Dataset Name": "g", "A Solution Size": 3.0, "A Solution Time": 2.0}]
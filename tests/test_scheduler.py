@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+
+import pytest
+
+from lib.scheduler import ProcessPoolScheduler, SerialScheduler, available_cores
+
+
+def report_cores(job):
+    # Module-level so that spawned workers can unpickle it
+    start = time.perf_counter()
+    time.sleep(job.get("sleep", 0.2))
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+    return {"id": job["id"], "cores": cores, "start": start, "end": time.perf_counter()}
+
+
+def report_threads(job):
+    torch_imported_before = "torch" in sys.modules
+    import torch
+
+    return {
+        "torch_imported_before": torch_imported_before,
+        "environment": {variable: os.environ.get(variable) for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS")},
+        "torch_threads": torch.get_num_threads(),
+    }
+
+
+def run(scheduler, jobs):
+    results = []
+    scheduler.run(jobs, report_cores, lambda job, result: results.append((job, result)))
+    return results
+
+
+def test_serial_scheduler_runs_jobs_in_order():
+    jobs = [{"id": i, "threads": 1, "sleep": 0} for i in range(4)]
+    scheduler = SerialScheduler()
+    results = run(scheduler, jobs)
+    assert [result["id"] for _, result in results] == [0, 1, 2, 3]
+    assert scheduler.makespan >= 0
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="needs core pinning")
+def test_process_pool_pins_concurrent_jobs_to_disjoint_cores():
+    cores = available_cores()[:4]
+    jobs = [{"id": i, "threads": 1 + i % 2} for i in range(6)] + [{"id": 6, "threads": 64}]
+    scheduler = ProcessPoolScheduler(cores=cores)
+    results = run(scheduler, jobs)
+
+    assert sorted(result["id"] for _, result in results) == list(range(7))
+    for job, result in results:
+        assert result["id"] == job["id"]
+        assert set(result["cores"]) <= set(cores)
+        assert len(result["cores"]) == min(job["threads"], len(cores))
+
+    for _, first in results:
+        for _, second in results:
+            overlap = first["start"] < second["end"] and second["start"] < first["end"]
+            if first["id"] != second["id"] and overlap:
+                assert not set(first["cores"]) & set(second["cores"])
+    assert scheduler.makespan > 0
+
+
+def test_process_pool_passes_thread_counts_without_importing_torch():
+    cores = available_cores()[:2]
+    scheduler = ProcessPoolScheduler(cores=cores)
+    results = []
+    scheduler.run([{"id": 0, "threads": len(cores)}], report_threads, lambda job, result: results.append(result))
+
+    (result,) = results
+    assert not result["torch_imported_before"]
+    assert result["environment"] == {"OMP_NUM_THREADS": str(len(cores)), "MKL_NUM_THREADS": str(len(cores))}
+    assert result["torch_threads"] == len(cores)
@@ -0,0 +1,48 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from lib.benchmark_runner import solve_hint
+from solvers.pCQO_MIS import pCQOMIS_MGD
+from solvers.pCQO_MIS_anneal import pCQOMIS_anneal
+
+SOLVERS = {
+    "pCQOMIS_MGD": (pCQOMIS_MGD, {"number_of_steps": 300, "steps_per_batch": 50, "batch_size": 8, "gamma": 50}),
+    "pCQOMIS_anneal": (
+        pCQOMIS_anneal, {"number_of_steps": 200, "steps_per_batch": 50, "batch_size": 4, "learning_rate": 0.05, "gamma": 50}
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return nx.gnm_random_graph(30, 60, seed=7)
+
+
+def assert_mask_of_independent_set(G, mask, size):
+    mask = np.asarray(mask).reshape(-1)
+    assert len(mask) == G.number_of_nodes()
+    assert set(np.unique(mask).tolist()) <= {0, 1}
+    assert mask.sum() == size
+    nodes = np.flatnonzero(mask)
+    assert not any(G.has_edge(u, v) for u in nodes for v in nodes if u < v)
+
+
+@pytest.mark.parametrize("name", SOLVERS)
+def test_pcqo_solvers_report_a_mask_over_the_nodes(graph, name):
+    solver_class, params = SOLVERS[name]
+    solver = solver_class(graph, {**params, "seed": 3})
+    solver.solve()
+
+    assert solver.solution["size"] > 0
+    assert_mask_of_independent_set(graph, solver.solution["graph_mask"].cpu().numpy(), solver.solution["size"])
+
+
+def test_pcqo_mask_hints_another_solver(graph):
+    hint_solver = {"class": "pCQOMIS_MGD", "params": SOLVERS["pCQOMIS_MGD"][1]}
+    job = {"seed": 3, "solver": {"class": "CPSATMIS", "params": {}}}
+
+    mask, size, solution_time = solve_hint(graph, hint_solver, job)
+
+    assert_mask_of_independent_set(graph, mask, size)
+    assert solution_time > 0
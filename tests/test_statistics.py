@@ -0,0 +1,129 @@
+import logging
+import math
+
+import numpy
+import pandas
+import pytest
+
+from lib.statistics import bootstrap_ci, memory_scaling, performance_profile, time_to_target
+
+BASE = 100e6
+
+
+def test_bootstrap_ci_of_a_constant_sample_has_zero_width():
+    assert bootstrap_ci([3.5] * 20) == (3.5, 3.5)
+    assert bootstrap_ci([3.5] * 20, statistic=numpy.median) == (3.5, 3.5)
+
+
+def test_bootstrap_ci_of_two_values():
+    # Resampled means of [0, 1] are 0, 0.5 and 1 with probabilities 1/4, 1/2 and 1/4
+    assert bootstrap_ci([0, 1]) == (0.0, 1.0)
+    assert bootstrap_ci([0, 1], confidence=0.4) == (0.5, 0.5)
+
+
+def test_bootstrap_ci_of_fewer_than_two_values():
+    assert bootstrap_ci([7]) == (7.0, 7.0)
+    assert all(math.isnan(bound) for bound in bootstrap_ci([]))
+
+
+def solution_row(graph_name, solver, seed, time_taken, size, trajectory=()):
+    return {
+        "dataset_name": graph_name,
+        "solution_method": solver,
+        "solver": solver,
+        "seed": seed,
+        "time_taken": time_taken,
+        "data": {"size": size, "trajectory": [list(point) for point in trajectory]},
+    }
+
+
+def test_time_to_target_is_infinite_when_never_reached():
+    rows = [
+        solution_row("g", "fast", 0, 5.0, 10, [(1.0, 8), (2.0, 10)]),
+        solution_row("g", "slow", 0, 6.0, 9, [(3.0, 9)]),
+        solution_row("g", "failed", 0, None, None),
+    ]
+    table = time_to_target(rows).set_index("Solver")["Time to Target"]
+
+    assert table["fast"] == 2.0
+    assert table["slow"] == math.inf
+    assert table["failed"] == math.inf
+
+    relaxed = time_to_target(rows, target_fraction=0.8).set_index("Solver")["Time to Target"]
+    assert relaxed["fast"] == 1.0
+    assert relaxed["slow"] == 3.0
+
+
+def test_performance_profile_of_two_solvers():
+    times = {
+        # graph: (times of A over three seeds, time of B)
+        "g1": ([1.0, 1.0, 100.0], 2.0),
+        "g2": ([4.0, 4.0, 4.0], 2.0),
+        "g3": ([math.inf] * 3, 3.0),
+        # Reached by neither solver, so left out
+        "g4": ([math.inf] * 3, math.inf),
+    }
+    table = pandas.DataFrame(
+        [
+            {"Dataset Name": graph_name, "Solver": "A", "Seed": seed, "Time to Target": time}
+            for graph_name, (a_times, _) in times.items()
+            for seed, time in enumerate(a_times)
+        ]
+        + [
+            {"Dataset Name": graph_name, "Solver": "B", "Seed": 0, "Time to Target": time}
+            for graph_name, (_, time) in times.items()
+        ]
+    )
+
+    profile = performance_profile(table)
+
+    # Ratios to the best median time: A is 1, 2 and inf, B is 2, 1 and 1
+    assert list(profile.index) == [1.0, 2.0]
+    assert profile["A"].tolist() == pytest.approx([1 / 3, 2 / 3])
+    assert profile["B"].tolist() == pytest.approx([2 / 3, 1])
+
+
+def memory_runs(solver, sizes, growth):
+    return pandas.DataFrame(
+        {
+            "Solver": solver,
+            "Nodes": sizes,
+            "Host Peak Bytes": [BASE + growth(n) for n in sizes],
+            "setup rss_before_bytes": BASE,
+        }
+    )
+
+
+def test_fits_the_exponent_and_predicts_the_largest_instance():
+    memory = memory_runs("dense", [100, 200, 400, 800], lambda n: 8.0 * n**2)
+
+    scaling = memory_scaling(memory, host_budget_bytes=BASE + 8.0 * 10_000**2)
+
+    row = scaling.iloc[0]
+    assert row["Exponent"] == pytest.approx(2)
+    assert row["Coefficient"] == pytest.approx(8)
+    assert row["Sizes"] == 4
+    assert row["Largest Feasible Nodes"] == pytest.approx(10_000, abs=1)
+
+
+def test_two_sizes_are_not_enough():
+    memory = pandas.concat(
+        [
+            memory_runs("two sizes", [100, 200, 200], lambda n: 8.0 * n**2),
+            memory_runs("three sizes", [100, 200, 300], lambda n: 8.0 * n**2),
+        ]
+    )
+
+    scaling = memory_scaling(memory, host_budget_bytes=1e12)
+
+    assert scaling["Solver"].tolist() == ["three sizes"]
+
+
+def test_fits_without_growth_are_dropped(caplog):
+    memory = memory_runs("shrinking", [100, 200, 400], lambda n: 1e9 / n)
+
+    with caplog.at_level(logging.WARNING, logger="lib.statistics"):
+        scaling = memory_scaling(memory, host_budget_bytes=1e12)
+
+    assert scaling.empty
+    assert "shrinking" in caplog.text
@@ -0,0 +1,70 @@
+import networkx as nx
+
+import lib.tuning
+from lib.tuning import configuration_grid, read_params_file, successive_halving, tune, write_params_file
+
+
+def toy_evaluations(quality, calls):
+    """
+    Returns a stand-in for evaluate_configurations whose MIS sizes depend only on the learning rate,
+    recording the learning rates evaluated on each graph in `calls`.
+    """
+
+    def evaluate_configurations(G, configurations, seeds, max_steps, check_interval=1, device="cpu"):
+        calls.append([configuration["learning_rate"] for configuration in configurations])
+        return [
+            {"steps": [10 * (k + 1)] * len(seeds), "sizes": [quality[configuration["learning_rate"]]] * len(seeds)}
+            for k, configuration in enumerate(configurations)
+        ]
+
+    return evaluate_configurations
+
+
+def test_successive_halving_keeps_the_best_configuration(monkeypatch):
+    quality = {0.1: 3, 0.2: 9, 0.3: 5, 0.4: 1, 0.5: 7, 0.6: 2, 0.7: 4, 0.8: 6}
+    calls = []
+    monkeypatch.setattr(lib.tuning, "evaluate_configurations", toy_evaluations(quality, calls))
+    configurations = configuration_grid(sorted(quality), [0.9], [1], gammas=[10])
+    graphs = [nx.path_graph(4) for _ in range(4)]
+
+    survivors, configurations, evaluations = successive_halving(graphs, configurations, [0, 1], max_steps=100)
+
+    assert configurations[survivors[0]]["learning_rate"] == 0.2
+    # Round 0 races all 8 on graph 0, round 1 the best 4 on graph 1, round 2 the best 2 on graphs 2 and 3
+    assert [len(learning_rates) for learning_rates in calls] == [8, 4, 2, 2]
+    assert sorted(calls[1]) == [0.2, 0.3, 0.5, 0.8]
+    assert sorted(calls[2]) == [0.2, 0.5]
+    assert len(evaluations[survivors[0]]) == len(graphs)
+
+
+def test_successive_halving_resolves_gamma_to_the_feasibility_bound(monkeypatch):
+    monkeypatch.setattr(lib.tuning, "evaluate_configurations", toy_evaluations({0.1: 1}, []))
+    graphs = [nx.path_graph(5), nx.star_graph(5)]
+
+    _, configurations, _ = successive_halving(graphs, configuration_grid([0.1], [0.9], [2]), [0], max_steps=10)
+
+    # The complements have maximum degree 3 (path on 5 nodes) and 4 (star on 6 nodes); the larger bound holds for both
+    assert configurations[0]["gamma"] == 2 + 2 * 4
+
+
+def test_successive_halving_keeps_explicit_gammas(monkeypatch):
+    monkeypatch.setattr(lib.tuning, "evaluate_configurations", toy_evaluations({0.1: 1}, []))
+
+    _, configurations, _ = successive_halving(
+        [nx.path_graph(5)], configuration_grid([0.1], [0.9], [2], gammas=[0, 7]), [0], max_steps=10
+    )
+
+    assert [configuration["gamma"] for configuration in configurations] == [0, 7]
+
+
+def test_tune_rejects_configurations_that_never_converge(tmp_path):
+    graphs = [nx.gnm_random_graph(12, 20, seed=seed) for seed in range(2)]
+    configurations = configuration_grid([0.0, 0.1], [0.0], [1])
+
+    params = tune(graphs, configurations, seeds=[0, 1, 2], max_steps=200)
+
+    assert params["learning_rate"] == 0.1
+    assert params["steps_per_batch"] >= 1
+    path = tmp_path / "params.json"
+    write_params_file(params, path)
+    assert read_params_file(path) == params
@@ -0,0 +1,69 @@
+import argparse
+import logging
+import time
+
+import torch
+
+from lib.dataset_generation import list_gpickle_files, load_gpickle
+from lib.tuning import configuration_grid, tune, write_params_file
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(filename='tune.log', level=logging.INFO, style="{")
+
+# Step sizes of the feasibility tuning procedure (see pcqo_mis_param_tuning_for_feasible_solutions_v01.py)
+DEFAULT_LEARNING_RATES = [0.000001, 0.000005, 0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5]
+
+
+def main():
+    """
+    Tunes pCQO-MIS hyperparameters on a sample of a dataset and writes them to a parameters file.
+
+    The file can be passed to pCQOMIS_MGD as its "params_file" parameter, or to the C++ engine as
+    its second argument.
+    """
+    parser = argparse.ArgumentParser(description="Tune pCQO-MIS hyperparameters by successive halving.")
+    parser.add_argument("graphs", nargs="+", help="Directories or glob patterns of .gpickle graphs.")
+    parser.add_argument("--output", default="params.json", help="Parameters file to write.")
+    parser.add_argument("--sample", type=int, default=8, help="Number of randomly chosen graphs to tune on.")
+    parser.add_argument("--learning-rates", type=float, nargs="+", default=DEFAULT_LEARNING_RATES)
+    parser.add_argument("--momentums", type=float, nargs="+", default=[0.8])
+    parser.add_argument("--gamma-primes", type=float, nargs="+", default=[1])
+    parser.add_argument(
+        "--gammas", type=float, nargs="+", help="Edge penalties to try. Defaults to the feasibility bound 2 + gamma' * Delta(G')."
+    )
+    parser.add_argument("--initializations", type=int, default=32, help="Batched initializations per graph and configuration.")
+    parser.add_argument("--max-steps", type=int, default=500, help="Step limit for an initialization to reach a maximal IS.")
+    parser.add_argument("--check-interval", type=int, default=1, help="Steps between convergence tests.")
+    parser.add_argument("--initial-graphs", type=int, default=1, help="Graphs in the first racing round.")
+    parser.add_argument("--eta", type=int, default=2, help="Elimination factor of successive halving.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the graph sample.")
+    args = parser.parse_args()
+
+    paths = list_gpickle_files(args.graphs, order="shuffled", seed=args.seed)[: args.sample]
+    if not paths:
+        raise SystemExit(f"No graphs found in {args.graphs}")
+    graphs = [load_gpickle(path)["data"] for path in paths]
+
+    configurations = configuration_grid(args.learning_rates, args.momentums, args.gamma_primes, args.gammas)
+    device = "cuda:0" if torch.cuda.is_available() else "cpu"
+
+    start = time.perf_counter()
+    params = tune(
+        graphs,
+        configurations,
+        seeds=list(range(args.initializations)),
+        max_steps=args.max_steps,
+        initial_graphs=args.initial_graphs,
+        eta=args.eta,
+        check_interval=args.check_interval,
+        device=device,
+    )
+    logger.info("Tuned %s configurations on %s graphs in %.1f s", len(configurations), len(graphs), time.perf_counter() - start)
+
+    write_params_file(params, args.output)
+    print(f"Tuned in {time.perf_counter() - start:.1f} s on {len(graphs)} graphs: {params}")
+    print(f"Parameters written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()